@@ -0,0 +1 @@
+"""Performance benchmarks for the backend (run as ``python -m backend.benchmarks.<name>``)."""
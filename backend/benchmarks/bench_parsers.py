@@ -0,0 +1,62 @@
+"""Parse throughput of every installed HTML parser backend on large provider pages.
+
+Usage::
+
+    python -m backend.benchmarks.bench_parsers --plans 2000 --repeat 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+from bs4 import BeautifulSoup
+
+from ..scrapers.parsers import SoupNode, available_backends
+from ..scrapers.runner import SCRAPER_REGISTRY
+from .synthetic import PAGE_RENDERERS, render_provider_page
+
+# What every scraper used before the parser abstraction existed.
+LEGACY = "bs4 (html.parser)"
+
+
+def make_scraper(slug: str, backend: str):
+    if backend == LEGACY:
+        scraper = SCRAPER_REGISTRY[slug]()
+        scraper.document = lambda html: SoupNode(BeautifulSoup(html, "html.parser"))
+        return scraper
+    return SCRAPER_REGISTRY[slug](parser_backend=backend)
+
+
+def best_of(scraper, page: str, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        scraper.parse(page)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--plans", type=int, default=2000, help="Plans per generated page.")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    backends = [LEGACY, *available_backends()]
+    for slug in PAGE_RENDERERS:
+        page = render_provider_page(slug, args.plans)
+        size_kb = len(page.encode("utf-8")) / 1024
+        print(f"{slug}: {args.plans} plans, {size_kb:.0f} KB")
+        legacy_seconds = None
+        for backend in backends:
+            seconds = best_of(make_scraper(slug, backend), page, args.repeat)
+            legacy_seconds = legacy_seconds or seconds
+            print(
+                f"  {backend:<18} {seconds * 1000:9.1f} ms  {size_kb / 1024 / seconds:6.2f} MB/s"
+                f"  {args.plans / seconds:9.0f} plans/s  ({legacy_seconds / seconds:.1f}x)"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""Compare the per-plan cost of the Pydantic and single-pass plan serializers.
+
+Usage::
+
+    python -m backend.benchmarks.bench_serialization --plans 5000 --repeat 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from collections import namedtuple
+from datetime import datetime
+from typing import Callable, List
+
+from pydantic import TypeAdapter
+
+from .. import models, schemas, serializers
+from ..routes.plans import _with_savings
+
+_PLAN_LIST = TypeAdapter(List[schemas.PlanRead])
+
+
+def make_plans(count: int, seed: int = 7) -> List[models.Plan]:
+    rng = random.Random(seed)
+    return [
+        models.Plan(
+            id=index,
+            provider_id=index % 50,
+            name=f"Plan {index}",
+            term_months=rng.choice([6, 12, 24, 36]),
+            rate_cents_kwh=round(rng.uniform(800, 2000), 1),
+            base_fee=rng.choice([0.0, 4.95, 9.95]),
+            cancellation_fee=rng.choice([0.0, 150.0, 295.0]),
+            renewable_percentage=rng.choice([0, 25, 50, 100]),
+            features="Fixed rate with autopay discount.",
+            url="https://example.com/plans",
+            last_scraped_at=datetime(2024, 1, 1, 12, 0, 0),
+        )
+        for index in range(count)
+    ]
+
+
+def pydantic_path(plans: List[models.Plan]) -> bytes:
+    enriched = [_with_savings(plan, "txu", 1000, 120.0) for plan in plans]
+    return _PLAN_LIST.dump_json(enriched)
+
+
+def fast_path(plans: List[models.Plan]) -> bytes:
+    return serializers.render_plans(plans, benchmark="txu", usage_kwh=1000, benchmark_cost=120.0)
+
+
+def time_per_plan(render: Callable[[List[models.Plan]], bytes], plans, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        render(plans)
+        best = min(best, time.perf_counter() - started)
+    return best / len(plans) * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--plans", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    plans = make_plans(args.plans)
+    # GET /plans feeds the serializer column rows rather than ORM instances.
+    Row = namedtuple("Row", serializers.PLAN_COLUMNS)
+    rows = [Row(*(getattr(plan, column) for column in Row._fields)) for plan in plans]
+
+    baseline = time_per_plan(pydantic_path, plans, args.repeat)
+    fast_orm = time_per_plan(fast_path, plans, args.repeat)
+    fast_rows = time_per_plan(fast_path, rows, args.repeat)
+    encoder = "orjson" if serializers.orjson is not None else "json"
+    print(f"plans={args.plans} encoder={encoder}")
+    print(f"pydantic validate+copy+dump   : {baseline:8.2f} us/plan")
+    print(f"single-pass from ORM objects  : {fast_orm:8.2f} us/plan ({baseline / fast_orm:.1f}x)")
+    print(f"single-pass from column rows  : {fast_rows:8.2f} us/plan ({baseline / fast_rows:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
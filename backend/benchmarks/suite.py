@@ -0,0 +1,282 @@
+"""Repeatable benchmarks for API startup, endpoints, CRUD functions and scraper parsers.
+
+Seeds a synthetic catalog, times every benchmark, and compares the medians
+with a baseline file. The exit status is non-zero when any benchmark is slower
+than its baseline by more than the threshold.
+
+Usage::
+
+    python -m backend.benchmarks.suite                      # compare with baseline.json
+    python -m backend.benchmarks.suite --update-baseline    # record a new baseline
+    python -m backend.benchmarks.suite --database-url postgresql+asyncpg://... --providers 500 --plans 200
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List, Tuple
+
+BASELINE_PATH = Path(__file__).with_name("baseline.json")
+DEFAULT_THRESHOLD = 0.25
+
+Benchmark = Tuple[str, Callable[[], Awaitable[object]]]
+
+
+async def measure(run: Callable[[], Awaitable[object]], repeat: int) -> Dict[str, float]:
+    await run()  # warm-up: imports, statement compilation, connection pool
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        await run()
+        timings.append((time.perf_counter() - started) * 1000)
+    return {
+        "median_ms": round(statistics.median(timings), 3),
+        "min_ms": round(min(timings), 3),
+    }
+
+
+def endpoint_benchmarks(client, first_plan_id: int) -> List[Benchmark]:
+    from ..cache import response_cache
+
+    def cold(path: str, **params):
+        async def run():
+            # Measure rendering rather than the in-process response cache.
+            response_cache.clear()
+            response = await client.get(path, params=params)
+            response.raise_for_status()
+
+        return run
+
+    async def warm_plans():
+        response = await client.get("/plans", params={"limit": 100})
+        response.raise_for_status()
+
+    def after_cursor(**params):
+        cursor = None
+
+        async def run():
+            nonlocal cursor
+            if cursor is None:
+                # Page from the middle of the catalog, past the first 1000 plans.
+                response = await client.get("/plans", params={**params, "limit": 1000})
+                response.raise_for_status()
+                cursor = response.headers["X-Next-Cursor"]
+            response_cache.clear()
+            response = await client.get("/plans", params={**params, "limit": 100, "cursor": cursor})
+            response.raise_for_status()
+
+        return run
+
+    return [
+        ("GET /providers", cold("/providers")),
+        ("GET /plans?limit=100", cold("/plans", limit=100)),
+        ("GET /plans?limit=1000&sort=term_months", cold("/plans", limit=1000, sort="term_months")),
+        ("GET /plans?limit=100 (cached)", warm_plans),
+        ("GET /plans?limit=100&cursor=...", after_cursor()),
+        ("GET /plans?limit=100&sort=-term_months&cursor=...", after_cursor(sort="-term_months")),
+        ("GET /plans/{id}", cold(f"/plans/{first_plan_id}")),
+        ("GET /plans/cost-curves?provider=txu", cold("/plans/cost-curves", provider="txu", step_kwh=250)),
+        ("GET /plans/export?format=ndjson", cold("/plans/export", format="ndjson")),
+    ]
+
+
+def crud_benchmarks(session_factory, plans_per_provider: int) -> List[Benchmark]:
+    from .. import crud, schemas
+
+    async def get_providers():
+        async with session_factory() as session:
+            await crud.get_providers(session)
+
+    async def list_plan_rows():
+        async with session_factory() as session:
+            await crud.list_plan_rows(session, limit=1000)
+
+    async def get_plan_pricing():
+        async with session_factory() as session:
+            await crud.get_plan_pricing(session)
+
+    async def get_benchmark_cost():
+        async with session_factory() as session:
+            await crud.get_benchmark_cost(session, "txu", 1000)
+
+    async def upsert_plans():
+        # Reprice every tenth plan of one provider, then roll the write back.
+        async with session_factory() as session:
+            provider = await crud.get_provider_by_slug(session, "txu")
+            plans = [
+                schemas.PlanCreate(
+                    provider_id=provider.id,
+                    name=plan.name,
+                    term_months=plan.term_months,
+                    rate_cents_kwh=plan.rate_cents_kwh + (0.1 if index % 10 == 0 else 0.0),
+                    base_fee=plan.base_fee,
+                    cancellation_fee=plan.cancellation_fee,
+                    renewable_percentage=plan.renewable_percentage,
+                    features=plan.features,
+                    url=plan.url,
+                )
+                for index, plan in enumerate(await crud.get_plans_by_provider_slug(session, "txu"))
+            ]
+            await crud.upsert_plans(session, provider, plans)
+            await session.rollback()
+
+    return [
+        ("crud.get_providers", get_providers),
+        ("crud.list_plan_rows(limit=1000)", list_plan_rows),
+        ("crud.get_plan_pricing", get_plan_pricing),
+        ("crud.get_benchmark_cost", get_benchmark_cost),
+        (f"crud.upsert_plans({plans_per_provider} plans)", upsert_plans),
+    ]
+
+
+def parser_benchmarks(plans_per_page: int) -> List[Benchmark]:
+    from ..scrapers.runner import SCRAPER_REGISTRY
+    from .synthetic import PAGE_RENDERERS, render_provider_page
+
+    benchmarks: List[Benchmark] = []
+    for slug in PAGE_RENDERERS:
+        page = render_provider_page(slug, plans_per_page)
+        scraper = SCRAPER_REGISTRY[slug]()
+
+        async def run(scraper=scraper, page=page):
+            result = scraper.parse(page)
+            assert len(result.plans) == plans_per_page
+
+        benchmarks.append((f"parse {slug} ({plans_per_page} plans)", run))
+    return benchmarks
+
+
+def startup_benchmarks(database_url: str) -> List[Benchmark]:
+    async def run_python(code: str) -> None:
+        # A fresh interpreter per run so module imports are measured cold.
+        process = await asyncio.create_subprocess_exec(
+            sys.executable,
+            "-c",
+            code,
+            env={**os.environ, "DATABASE_URL": database_url, "SCHEDULER_ENABLED": "false"},
+        )
+        if await process.wait() != 0:
+            raise RuntimeError(f"Startup benchmark failed: {code}")
+
+    async def import_app():
+        await run_python("import backend.main")
+
+    async def lifespan():
+        await run_python(
+            "import asyncio\n"
+            "from backend.main import app\n"
+            "async def main():\n"
+            "    async with app.router.lifespan_context(app):\n"
+            "        pass\n"
+            "asyncio.run(main())\n"
+        )
+
+    return [
+        ("startup: import backend.main", import_app),
+        ("startup: import + lifespan", lifespan),
+    ]
+
+
+async def run_suite(args: argparse.Namespace) -> Dict[str, Dict[str, float]]:
+    # The application reads DATABASE_URL when its modules are first imported.
+    os.environ["DATABASE_URL"] = args.database_url
+
+    import httpx
+    from sqlalchemy import select
+
+    from ..database import AsyncSessionLocal, engine
+    from ..main import app
+    from ..models import Plan
+    from .synthetic import seed_database
+
+    if not args.skip_seed:
+        await seed_database(args.database_url, args.providers, args.plans, args.seed)
+
+    async with AsyncSessionLocal() as session:
+        first_plan_id = await session.scalar(select(Plan.id).order_by(Plan.id).limit(1))
+
+    benchmarks: List[Benchmark] = []
+    results: Dict[str, Dict[str, float]] = {}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        benchmarks += startup_benchmarks(args.database_url)
+        benchmarks += endpoint_benchmarks(client, first_plan_id)
+        benchmarks += crud_benchmarks(AsyncSessionLocal, args.plans)
+        benchmarks += parser_benchmarks(args.plans)
+        for name, run in benchmarks:
+            if args.only and args.only not in name:
+                continue
+            results[name] = await measure(run, args.repeat)
+            print(f"{name:<48} median {results[name]['median_ms']:10.3f} ms")
+    await engine.dispose()
+    return results
+
+
+def compare(
+    results: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]], threshold: float
+) -> List[str]:
+    """Return a message for every benchmark whose median regressed beyond ``threshold``."""
+
+    regressions = []
+    for name, result in results.items():
+        reference = baseline.get(name)
+        if reference is None:
+            continue
+        limit = reference["median_ms"] * (1 + threshold)
+        if result["median_ms"] > limit:
+            regressions.append(
+                f"{name}: {result['median_ms']:.3f} ms vs baseline {reference['median_ms']:.3f} ms "
+                f"(+{result['median_ms'] / reference['median_ms'] - 1:.0%})"
+            )
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--database-url", default="sqlite+aiosqlite:///./benchmark.db")
+    parser.add_argument("--providers", type=int, default=500)
+    parser.add_argument("--plans", type=int, default=200, help="Plans per provider and per parsed page.")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--skip-seed", action="store_true", help="Reuse an already seeded database.")
+    parser.add_argument("--only", help="Run only benchmarks whose name contains this text.")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    parser.add_argument("--update-baseline", action="store_true")
+    args = parser.parse_args()
+
+    results = asyncio.run(run_suite(args))
+    scale = {"providers": args.providers, "plans_per_provider": args.plans}
+
+    if args.update_baseline:
+        args.baseline.write_text(
+            json.dumps({"scale": scale, "results": results}, indent=2, sort_keys=True) + "\n"
+        )
+        print(f"Baseline written to {args.baseline}")
+        return
+
+    if not args.baseline.exists():
+        print(f"No baseline at {args.baseline}; run with --update-baseline to create one.")
+        return
+    baseline = json.loads(args.baseline.read_text())
+    if baseline.get("scale") != scale:
+        print(f"Baseline was recorded at {baseline.get('scale')}, not {scale}; skipping comparison.")
+        return
+    regressions = compare(results, baseline["results"], args.threshold)
+    if regressions:
+        print(f"\nRegressions beyond {args.threshold:.0%}:")
+        for line in regressions:
+            print(f"  {line}")
+        sys.exit(1)
+    print(f"\nNo regressions beyond {args.threshold:.0%}.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,228 @@
+"""Deterministic synthetic catalogs for benchmarking at production scale.
+
+Seeds a database (SQLite or PostgreSQL) with many providers and plans, and
+renders provider pages in each scraper's markup so the parsers can be timed on
+large inputs.
+
+Usage::
+
+    python -m backend.benchmarks.synthetic --database-url sqlite+aiosqlite:///./benchmark.db \\
+        --providers 500 --plans 200
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import html
+import random
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Dict, List
+
+from sqlalchemy import func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from .. import crud, models
+from ..config import get_settings
+
+REAL_PROVIDER_SLUGS = ("txu", "reliant", "gexa", "direct_energy")
+TERMS = (None, 1, 6, 12, 18, 24, 36)
+FEATURES = (
+    "Fixed rate with autopay discount.",
+    "Free nights from 8pm to 6am.",
+    "Bill credit after 1000 kWh.",
+    "100% renewable energy.",
+    "Includes HVAC maintenance visits.",
+)
+INSERT_BATCH_SIZE = 5000
+
+
+@dataclass
+class SyntheticPlan:
+    name: str
+    term_months: int | None
+    rate_cents_kwh: float
+    base_fee: float
+    cancellation_fee: float
+    renewable_percentage: int
+    features: str
+
+
+def provider_slug(index: int) -> str:
+    """Slugs of the first providers match the real scrapers so benchmarks resolve."""
+
+    if index < len(REAL_PROVIDER_SLUGS):
+        return REAL_PROVIDER_SLUGS[index]
+    return f"synthetic-{index:05d}"
+
+
+def generate_plans(count: int, rng: random.Random) -> List[SyntheticPlan]:
+    return [
+        SyntheticPlan(
+            name=f"Plan {index:04d}",
+            term_months=rng.choice(TERMS),
+            rate_cents_kwh=round(rng.uniform(8.0, 20.0), 1),
+            base_fee=rng.choice((0.0, 4.95, 9.95)),
+            cancellation_fee=rng.choice((0.0, 150.0, 295.0)),
+            renewable_percentage=rng.choice((0, 15, 25, 50, 100)),
+            features=rng.choice(FEATURES),
+        )
+        for index in range(count)
+    ]
+
+
+async def seed_catalog(
+    session: AsyncSession, providers: int, plans_per_provider: int, seed: int = 7
+) -> None:
+    """Insert ``providers`` providers with ``plans_per_provider`` current plans each."""
+
+    rng = random.Random(seed)
+    scraped_at = datetime(2024, 1, 1, 12, 0, 0)
+    await session.execute(
+        insert(models.Provider),
+        [
+            {
+                "name": f"Provider {index:05d}",
+                "slug": provider_slug(index),
+                "website": f"https://provider-{index}.example.com",
+            }
+            for index in range(providers)
+        ],
+    )
+    provider_ids = (
+        await session.execute(select(models.Provider.id).order_by(models.Provider.id))
+    ).scalars().all()
+
+    batch: List[dict] = []
+    for provider_id in provider_ids:
+        for plan in generate_plans(plans_per_provider, rng):
+            batch.append(
+                {
+                    "provider_id": provider_id,
+                    **plan.__dict__,
+                    "url": "https://example.com/plans",
+                    "last_scraped_at": scraped_at,
+                    "valid_from_generation": 0,
+                }
+            )
+            if len(batch) >= INSERT_BATCH_SIZE:
+                await session.execute(insert(models.Plan), batch)
+                batch = []
+    if batch:
+        await session.execute(insert(models.Plan), batch)
+
+    for provider in (await session.execute(select(models.Provider))).scalars():
+        await crud.refresh_benchmarks(session, provider, get_settings().benchmark_usage_levels)
+
+    if await session.get(models.DataGeneration, crud.DATA_GENERATION_ID) is None:
+        session.add(models.DataGeneration(id=crud.DATA_GENERATION_ID, value=1))
+    await session.commit()
+
+
+async def seed_database(
+    database_url: str, providers: int, plans_per_provider: int, seed: int = 7
+) -> None:
+    """Recreate the schema at ``database_url`` and fill it with a synthetic catalog."""
+
+    engine = create_async_engine(database_url)
+    try:
+        async with engine.begin() as conn:
+            await conn.run_sync(models.Base.metadata.drop_all)
+            await conn.run_sync(models.Base.metadata.create_all)
+        factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+        async with factory() as session:
+            await seed_catalog(session, providers, plans_per_provider, seed)
+    finally:
+        await engine.dispose()
+
+
+async def count_plans(session: AsyncSession) -> int:
+    return (await session.execute(select(func.count()).select_from(models.Plan))).scalar_one()
+
+
+def _txu_page(plans: List[SyntheticPlan]) -> str:
+    articles = "".join(
+        f"""
+  <article class="plan">
+    <h2>{html.escape(plan.name)}</h2>
+    <span class="term">{plan.term_months or 1}</span>
+    <span class="rate">{plan.rate_cents_kwh}¢/kWh</span>
+    <span class="base">${plan.base_fee}</span>
+    <span class="cancel">${plan.cancellation_fee}</span>
+    <span class="renewable">{plan.renewable_percentage}%</span>
+    <p class="features">{html.escape(plan.features)}</p>
+  </article>"""
+        for plan in plans
+    )
+    return f'<section id="plans">{articles}\n</section>'
+
+
+def _reliant_page(plans: List[SyntheticPlan]) -> str:
+    items = "".join(
+        f"""
+  <li>
+    <h3>{html.escape(plan.name)}</h3>
+    <div class="details" data-term="{plan.term_months or 1}" data-rate="{plan.rate_cents_kwh / 100}" data-base="{plan.base_fee}" data-cancel="{plan.cancellation_fee}" data-renewable="{plan.renewable_percentage}">
+      <p>{html.escape(plan.features)}</p>
+    </div>
+  </li>"""
+        for plan in plans
+    )
+    return f'<ul class="plans">{items}\n</ul>'
+
+
+def _gexa_page(plans: List[SyntheticPlan]) -> str:
+    rows = "".join(
+        f"""
+  <tr>
+    <td>{html.escape(plan.name)}</td><td>{plan.term_months or 1}</td><td>{plan.rate_cents_kwh / 100}</td>
+    <td>{plan.base_fee}</td><td>{plan.cancellation_fee}</td><td>{plan.renewable_percentage}</td>
+    <td>{html.escape(plan.features)}</td>
+  </tr>"""
+        for plan in plans
+    )
+    header = "<tr><th>Plan</th><th>Term</th><th>Rate</th><th>Base Fee</th><th>Cancel Fee</th><th>Renewable</th><th>Features</th></tr>"
+    return f'<table id="gexa-plans">\n  {header}{rows}\n</table>'
+
+
+def _direct_energy_page(plans: List[SyntheticPlan]) -> str:
+    slides = "".join(
+        f"""
+  <div class="slide" data-plan="{html.escape(plan.name)}" data-term="{plan.term_months or 1}" data-rate="{plan.rate_cents_kwh / 100}" data-base="{plan.base_fee}" data-cancel="{plan.cancellation_fee}" data-renewable="{plan.renewable_percentage}">
+    <p>{html.escape(plan.features)}</p>
+  </div>"""
+        for plan in plans
+    )
+    return f'<div class="carousel">{slides}\n</div>'
+
+
+PAGE_RENDERERS: Dict[str, Callable[[List[SyntheticPlan]], str]] = {
+    "txu": _txu_page,
+    "reliant": _reliant_page,
+    "gexa": _gexa_page,
+    "direct_energy": _direct_energy_page,
+}
+
+
+def render_provider_page(slug: str, plan_count: int, seed: int = 7) -> str:
+    """Render a page with ``plan_count`` plans in the markup the ``slug`` scraper parses."""
+
+    return PAGE_RENDERERS[slug](generate_plans(plan_count, random.Random(seed)))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--database-url", default="sqlite+aiosqlite:///./benchmark.db")
+    parser.add_argument("--providers", type=int, default=500)
+    parser.add_argument("--plans", type=int, default=200, help="Plans per provider.")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    asyncio.run(seed_database(args.database_url, args.providers, args.plans, args.seed))
+    print(f"Seeded {args.providers} providers x {args.plans} plans into {args.database_url}")
+
+
+if __name__ == "__main__":
+    main()
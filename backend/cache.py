@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Dict, Hashable, Tuple
+
+from fastapi import Request, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from . import crud
+from .config import get_settings
+from .metrics import registry
+
+
+@dataclass
+class CachedResponse:
+    body: bytes
+    etag: str
+    headers: Dict[str, str] = field(default_factory=dict)
+
+
+Builder = Callable[[], Awaitable[Tuple[bytes, Dict[str, str]]]]
+
+
+class ResponseCache:
+    """Size-bounded LRU cache of rendered JSON responses.
+
+    Entries are keyed by ``(data generation, request key)``. Concurrent misses
+    for the same key share a single build, and entries from older generations
+    are dropped as soon as a newer generation is seen.
+    """
+
+    def __init__(self, max_entries: int, max_bytes: int) -> None:
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Tuple[int, Hashable], CachedResponse]" = OrderedDict()
+        self._pending: Dict[Tuple[int, Hashable], asyncio.Future] = {}
+        self._size = 0
+        self._generation = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._size = 0
+
+    def _observe_generation(self, generation: int) -> None:
+        if generation > self._generation:
+            self._generation = generation
+            self.clear()
+
+    def _store(self, key: Tuple[int, Hashable], entry: CachedResponse) -> None:
+        if len(entry.body) > self.max_bytes or key[0] < self._generation:
+            return
+        self._entries[key] = entry
+        self._size += len(entry.body)
+        while self._entries and (
+            len(self._entries) > self.max_entries or self._size > self.max_bytes
+        ):
+            _, evicted = self._entries.popitem(last=False)
+            self._size -= len(evicted.body)
+
+    async def get_or_build(
+        self, generation: int, key: Hashable, build: Builder
+    ) -> CachedResponse:
+        self._observe_generation(generation)
+        cache_key = (generation, key)
+        entry = self._entries.get(cache_key)
+        if entry is not None:
+            self._entries.move_to_end(cache_key)
+            self.hits += 1
+            return entry
+
+        pending = self._pending.get(cache_key)
+        if pending is not None:
+            self.hits += 1
+            return await asyncio.shield(pending)
+
+        self.misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self._pending[cache_key] = future
+        try:
+            body, headers = await build()
+            entry = CachedResponse(
+                body=body,
+                etag='"%s"' % hashlib.blake2b(body, digest_size=16).hexdigest(),
+                headers=headers,
+            )
+        except BaseException as exc:
+            future.set_exception(exc)
+            # Mark the exception as retrieved when nobody else was waiting on it.
+            future.exception()
+            raise
+        else:
+            future.set_result(entry)
+            self._store(cache_key, entry)
+            return entry
+        finally:
+            self._pending.pop(cache_key, None)
+
+
+_settings = get_settings()
+response_cache = ResponseCache(
+    max_entries=_settings.response_cache_max_entries,
+    max_bytes=_settings.response_cache_max_bytes,
+)
+registry.callback(
+    "response_cache_hits_total", "Responses served from the cache.", lambda: response_cache.hits, "counter"
+)
+registry.callback(
+    "response_cache_misses_total", "Responses that had to be rendered.", lambda: response_cache.misses, "counter"
+)
+registry.callback("response_cache_entries", "Responses currently cached.", lambda: len(response_cache))
+
+
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = {candidate.strip() for candidate in if_none_match.split(",")}
+    return "*" in candidates or etag in candidates
+
+
+async def cached_response(
+    request: Request, session: AsyncSession, build: Builder
+) -> Response:
+    """Serve ``build``'s JSON from the cache, answering ``If-None-Match`` with 304."""
+
+    generation = await crud.get_data_generation(session)
+    key = (request.url.path, tuple(sorted(request.query_params.multi_items())))
+    entry = await response_cache.get_or_build(generation, key, build)
+
+    headers = {**entry.headers, "ETag": entry.etag, "Cache-Control": "no-cache"}
+    if _etag_matches(request.headers.get("if-none-match"), entry.etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=entry.body, media_type="application/json", headers=headers)
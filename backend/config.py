@@ -1,6 +1,9 @@
+import os
+import socket
+import uuid
 from functools import lru_cache
 from pathlib import Path
-from typing import List
+from typing import Dict, List
 
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -30,6 +33,134 @@ class Settings(BaseSettings):
         360,
         description="Interval in minutes for scheduled scrapes.",
     )
+    scrape_provider_intervals: Dict[str, float] = Field(
+        default_factory=dict,
+        description="Starting scrape interval in minutes per provider slug, e.g. {\"txu\": 60}.",
+    )
+    scrape_source_urls: Dict[str, str] = Field(
+        default_factory=dict,
+        description="Page to download per provider slug; providers without one parse their bundled sample markup.",
+    )
+    scrape_min_interval_minutes: float = Field(
+        30,
+        description="Shortest adaptive interval, used right after a provider's plans changed.",
+    )
+    scrape_max_interval_minutes: float = Field(
+        1440,
+        description="Longest adaptive interval reached while a provider's plans stay unchanged.",
+    )
+    scrape_backoff_factor: float = Field(
+        2.0,
+        description="Multiplier applied to a provider's interval after each unchanged scrape.",
+    )
+    scrape_jitter_fraction: float = Field(
+        0.1,
+        description="Random spread applied to every scheduled run, as a fraction of the interval.",
+    )
+    scrape_concurrency: int = Field(
+        4,
+        description="Maximum number of provider scrapes that run at the same time.",
+    )
+    scrape_timeout_seconds: float = Field(
+        120.0,
+        description="Per-provider time limit for a single scrape run.",
+    )
+    http_timeout_seconds: float = Field(
+        30.0,
+        description="Timeout for a single HTTP request made by a scraper.",
+    )
+    http_max_connections_per_host: int = Field(
+        4,
+        description="Size of the keep-alive connection pool kept for each provider host.",
+    )
+    http_max_retries: int = Field(
+        2,
+        description="Retries of a fetch after a timeout, connection error, 5xx or 429.",
+    )
+    http_backoff_base_seconds: float = Field(
+        0.5,
+        description="Base delay of the jittered exponential backoff between fetch retries.",
+    )
+    http_backoff_max_seconds: float = Field(
+        10.0,
+        description="Upper bound on a single backoff delay between fetch retries.",
+    )
+    http_min_request_interval_seconds: float = Field(
+        0.5,
+        description="Minimum spacing between requests to the same provider host.",
+    )
+    http_breaker_failure_threshold: int = Field(
+        5,
+        description="Consecutive failed requests to a host that open its circuit breaker.",
+    )
+    http_breaker_cooldown_seconds: float = Field(
+        300.0,
+        description="How long an open circuit fails fast before a trial request is allowed.",
+    )
+    plan_generations_retained: int = Field(
+        5,
+        description="Number of superseded plan generations kept per provider for rollback.",
+    )
+    benchmark_usage_levels: List[int] = Field(
+        default_factory=lambda: [500, 1000, 2000],
+        description="Monthly usage levels (kWh) at which benchmark plans are precomputed.",
+    )
+    response_cache_max_entries: int = Field(
+        256,
+        description="Maximum number of rendered API responses kept in the in-process cache.",
+    )
+    response_cache_max_bytes: int = Field(
+        32 * 1024 * 1024,
+        description="Upper bound on the total size of cached API responses.",
+    )
+    database_pool_size: int = Field(
+        5,
+        description="Number of persistent connections kept in the database pool.",
+    )
+    database_max_overflow: int = Field(
+        10,
+        description="Extra connections the pool may open temporarily above its size.",
+    )
+    database_pool_timeout_seconds: float = Field(
+        30.0,
+        description="How long a request waits for a free pooled connection before failing.",
+    )
+    database_pool_recycle_seconds: int = Field(
+        1800,
+        description="Age after which pooled connections are replaced (-1 disables recycling).",
+    )
+    database_pool_pre_ping: bool = Field(
+        True,
+        description="Validate pooled connections before handing them out.",
+    )
+    health_cache_seconds: float = Field(
+        5.0,
+        description="How long a readiness probe result is reused before the database is checked again.",
+    )
+    html_parser: str = Field(
+        "auto",
+        description="HTML parser backend for scrapers: auto, selectolax, lxml or bs4.",
+    )
+    parse_executor: str = Field(
+        "process",
+        description="Where scraper HTML is parsed: process pool, thread pool, or inline on the event loop.",
+    )
+    parse_workers: int = Field(
+        0,
+        description="Number of parse workers; 0 uses one per CPU core.",
+    )
+    instance_id: str = Field(
+        default_factory=lambda: f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}",
+        description="Identity of this API replica when it holds scheduling leases.",
+    )
+    database_auto_create: bool = Field(
+        True,
+        description="Create missing tables at startup; disable when migrations are applied at deploy time.",
+    )
+    scrape_job_lease_seconds: float = Field(
+        60.0,
+        description="Lease on a running scrape job, renewed while it runs; other replicas resume it once expired and check for expired leases this often.",
+    )
     scheduler_enabled: bool = Field(
         True,
         description="Toggle background scheduler for recurring scrapes.",
@@ -0,0 +1,83 @@
+"""Array-based cost engine for evaluating many plans over a usage grid at once."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import List, Sequence
+
+import numpy as np
+
+
+@dataclass
+class PlanArrays:
+    """Plan pricing inputs laid out as contiguous arrays, one element per plan."""
+
+    plan_ids: np.ndarray
+    provider_ids: np.ndarray
+    rates_cents_kwh: np.ndarray
+    base_fees: np.ndarray
+
+    @classmethod
+    def from_rows(cls, rows: Sequence) -> "PlanArrays":
+        count = len(rows)
+        return cls(
+            plan_ids=np.fromiter((row.id for row in rows), dtype=np.int64, count=count),
+            provider_ids=np.fromiter((row.provider_id for row in rows), dtype=np.int64, count=count),
+            rates_cents_kwh=np.fromiter(
+                (row.rate_cents_kwh for row in rows), dtype=np.float64, count=count
+            ),
+            base_fees=np.fromiter(
+                (row.base_fee or 0.0 for row in rows), dtype=np.float64, count=count
+            ),
+        )
+
+    def __len__(self) -> int:
+        return len(self.plan_ids)
+
+
+def usage_grid(start: float, stop: float, step: float) -> np.ndarray:
+    """Return usage points from ``start`` to ``stop`` inclusive, ``step`` apart."""
+
+    count = int(np.floor((stop - start) / step + 1e-9)) + 1
+    return start + step * np.arange(count, dtype=np.float64)
+
+
+def cost_matrix(plans: PlanArrays, usage_kwh: np.ndarray) -> np.ndarray:
+    """Monthly cost of every plan at every usage point, shaped ``(plans, usage)``."""
+
+    return plans.base_fees[:, None] + (plans.rates_cents_kwh[:, None] / 100.0) * usage_kwh[None, :]
+
+
+def lower_envelope(costs: np.ndarray, mask: np.ndarray) -> np.ndarray | None:
+    """Cheapest cost at each usage point among the plans selected by ``mask``."""
+
+    if not mask.any():
+        return None
+    return costs[mask].min(axis=0)
+
+
+def crossover_points(
+    costs: np.ndarray, benchmark: np.ndarray, usage_kwh: np.ndarray
+) -> List[np.ndarray]:
+    """Usage levels at which each plan's cost curve crosses the benchmark curve.
+
+    Crossings are located on the grid by a sign change of ``cost - benchmark``
+    between neighbouring points and refined by linear interpolation.
+    """
+
+    if costs.shape[0] == 0:
+        return []
+
+    diff = costs - benchmark[None, :]
+    left, right = diff[:, :-1], diff[:, 1:]
+    crossing = ((left < 0) & (right >= 0)) | ((left > 0) & (right <= 0))
+    plan_index, segment = np.nonzero(crossing)
+
+    d0 = left[plan_index, segment]
+    d1 = right[plan_index, segment]
+    u0 = usage_kwh[segment]
+    u1 = usage_kwh[segment + 1]
+    points = u0 + (u1 - u0) * d0 / (d0 - d1)
+
+    counts = np.bincount(plan_index, minlength=costs.shape[0])
+    return np.split(points, np.cumsum(counts)[:-1])
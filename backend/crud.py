@@ -1,7 +1,10 @@
-from typing import Iterable, List, Sequence
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from decimal import Decimal
+from typing import Any, Dict, Iterable, List, Sequence, Tuple
 
-from sqlalchemy import select
-from sqlalchemy.orm import selectinload
+from sqlalchemy import and_, delete, func, insert, or_, select, tuple_, update
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
@@ -31,7 +34,7 @@ async def get_plans_by_provider_slug(
         select(models.Plan)
         .join(models.Provider)
         .options(selectinload(models.Plan.provider))
-        .where(models.Provider.slug == slug)
+        .where(models.Provider.slug == slug, models.current_plan_criteria())
     )
     return result.scalars().unique().all()
 
@@ -50,43 +53,636 @@ async def upsert_provider(session: AsyncSession, provider: schemas.ProviderCreat
     return db_provider
 
 
-async def list_plans(session: AsyncSession) -> Sequence[models.Plan]:
-    result = await session.execute(
-        select(models.Plan)
-        .options(selectinload(models.Plan.provider))
-        .order_by(models.Plan.rate_cents_kwh, models.Plan.term_months)
+# Sort keys accepted by list_plans; each maps to its nullable ordering columns.
+# The plan id is always the final, unique tiebreaker that makes keyset
+# pagination stable.
+PLAN_SORT_COLUMNS = {
+    "rate_cents_kwh": ("rate_cents_kwh", "term_months"),
+    "term_months": ("term_months", "rate_cents_kwh"),
+}
+
+
+@dataclass
+class PlanFilters:
+    provider_ids: Sequence[int] = ()
+    provider_slugs: Sequence[str] = ()
+    terms: Sequence[int] = ()
+    min_term: int | None = None
+    max_term: int | None = None
+    max_rate: float | None = None
+    min_renewable: int | None = None
+
+    def clauses(self) -> List[Any]:
+        """SQL criteria for the filters.
+
+        Term and rate filters keep plans whose term or rate is unknown, as the
+        dashboard's client-side filtering always did.
+        """
+
+        plan = models.Plan
+        clauses: List[Any] = []
+        if self.provider_ids:
+            clauses.append(plan.provider_id.in_(self.provider_ids))
+        if self.provider_slugs:
+            clauses.append(
+                plan.provider_id.in_(
+                    select(models.Provider.id).where(models.Provider.slug.in_(self.provider_slugs))
+                )
+            )
+        if self.terms:
+            clauses.append(or_(plan.term_months.in_(self.terms), plan.term_months.is_(None)))
+        if self.min_term is not None:
+            clauses.append(or_(plan.term_months >= self.min_term, plan.term_months.is_(None)))
+        if self.max_term is not None:
+            clauses.append(or_(plan.term_months <= self.max_term, plan.term_months.is_(None)))
+        if self.max_rate is not None:
+            clauses.append(or_(plan.rate_cents_kwh <= self.max_rate, plan.rate_cents_kwh.is_(None)))
+        if self.min_renewable is not None:
+            clauses.append(plan.renewable_percentage >= self.min_renewable)
+        return clauses
+
+
+def _keyset_after(sort: str, values: Sequence[Any], descending: bool):
+    """Build a predicate selecting rows that sort after the cursor ``values``.
+
+    The comparison is a single row-value range over the coalesced sort keys,
+    with NULL cursor values mapped to their sentinel. The redundant bound on
+    the leading key lets SQLite seek the index instead of scanning it.
+    """
+
+    names = PLAN_SORT_COLUMNS[sort]
+    keys = [models.plan_sort_key(name, descending) for name in names] + [models.Plan.id]
+    bounds = [
+        models.plan_sort_sentinel(name, descending) if value is None else value
+        for name, value in zip(names, values)
+    ] + [values[-1]]
+    if descending:
+        return and_(keys[0] <= bounds[0], tuple_(*keys) < tuple_(*bounds))
+    return and_(keys[0] >= bounds[0], tuple_(*keys) > tuple_(*bounds))
+
+
+def plan_sort_values(plan: Any, sort: str) -> List[Any]:
+    """Return the keyset cursor values of ``plan`` for the given sort key."""
+
+    return [getattr(plan, name) for name in PLAN_SORT_COLUMNS[sort]] + [plan.id]
+
+
+def _plan_listing(
+    stmt,
+    filters: PlanFilters | None,
+    sort: str,
+    descending: bool,
+    after: Sequence[Any] | None,
+    limit: int | None,
+):
+    keys = [models.plan_sort_key(name, descending) for name in PLAN_SORT_COLUMNS[sort]]
+    keys.append(models.Plan.id)
+    stmt = stmt.join(models.Provider).where(models.current_plan_criteria())
+    if filters is not None:
+        stmt = stmt.where(*filters.clauses())
+    if after is not None:
+        stmt = stmt.where(_keyset_after(sort, after, descending))
+    stmt = stmt.order_by(*(key.desc() if descending else key.asc() for key in keys))
+    if limit is not None:
+        stmt = stmt.limit(limit)
+    return stmt
+
+
+async def list_plans(
+    session: AsyncSession,
+    filters: PlanFilters | None = None,
+    *,
+    sort: str = "rate_cents_kwh",
+    descending: bool = False,
+    after: Sequence[Any] | None = None,
+    limit: int | None = None,
+) -> Sequence[models.Plan]:
+    """Return plans matching ``filters`` in sort order, starting after the ``after`` cursor."""
+
+    stmt = _plan_listing(
+        select(models.Plan).options(selectinload(models.Plan.provider)),
+        filters,
+        sort,
+        descending,
+        after,
+        limit,
     )
+    result = await session.execute(stmt)
     return result.scalars().unique().all()
 
 
-async def get_plan(session: AsyncSession, plan_id: int) -> models.Plan | None:
-    result = await session.execute(
+async def list_plan_rows(
+    session: AsyncSession,
+    filters: PlanFilters | None = None,
+    *,
+    sort: str = "rate_cents_kwh",
+    descending: bool = False,
+    after: Sequence[Any] | None = None,
+    limit: int | None = None,
+) -> Sequence[Any]:
+    """Like :func:`list_plans` but returns plain column rows instead of ORM objects."""
+
+    stmt = _plan_listing(
+        select(*models.Plan.__table__.c), filters, sort, descending, after, limit
+    )
+    result = await session.execute(stmt)
+    return result.all()
+
+
+async def stream_plan_rows(
+    session: AsyncSession,
+    filters: PlanFilters | None = None,
+    *,
+    batch_size: int = 1000,
+):
+    """Stream current plans as column rows through a server-side cursor."""
+
+    stmt = _plan_listing(
+        select(*models.Plan.__table__.c), filters, "rate_cents_kwh", False, None, None
+    ).execution_options(yield_per=batch_size)
+    return await session.stream(stmt)
+
+
+async def get_plan_pricing(
+    session: AsyncSession, filters: PlanFilters | None = None
+) -> Sequence[Any]:
+    """Return lightweight pricing rows (no ORM objects) for plans with a known rate."""
+
+    stmt = (
+        select(
+            models.Plan.id,
+            models.Plan.provider_id,
+            models.Plan.name,
+            models.Plan.rate_cents_kwh,
+            models.Plan.base_fee,
+            models.Provider.slug.label("provider_slug"),
+        )
+        .join(models.Provider)
+        .where(models.Plan.rate_cents_kwh.is_not(None), models.current_plan_criteria())
+        .order_by(models.Plan.id)
+    )
+    if filters is not None:
+        stmt = stmt.where(*filters.clauses())
+    result = await session.execute(stmt)
+    return result.all()
+
+
+async def get_plan(
+    session: AsyncSession, plan_id: int, *, current_only: bool = True
+) -> models.Plan | None:
+    """Return a plan by id; superseded versions are only returned with ``current_only=False``."""
+
+    stmt = (
         select(models.Plan)
             .options(selectinload(models.Plan.provider))
             .where(models.Plan.id == plan_id)
     )
+    if current_only:
+        stmt = stmt.join(models.Provider).where(models.current_plan_criteria())
+    result = await session.execute(stmt)
     return result.scalar_one_or_none()
 
 
+PLAN_KEY_FIELDS = ("name", "term_months")
+PLAN_VALUE_FIELDS = (
+    "rate_cents_kwh",
+    "base_fee",
+    "cancellation_fee",
+    "renewable_percentage",
+    "features",
+    "url",
+)
+
+PLAN_PRICE_FIELDS = ("rate_cents_kwh", "base_fee", "cancellation_fee")
+
+PlanKey = Tuple[str, int | None]
+
+
+@dataclass
+class PlanChanges:
+    """Summary of the rows touched by :func:`upsert_plans`."""
+
+    inserted: List[Dict[str, Any]] = field(default_factory=list)
+    updated: List[Dict[str, Any]] = field(default_factory=list)
+    deleted: List[int] = field(default_factory=list)
+    unchanged: int = 0
+    price_changes: int = 0
+    generation: int = 0
+
+    @property
+    def written(self) -> int:
+        return len(self.inserted) + len(self.updated) + len(self.deleted)
+
+
+def _comparable(value: Any) -> Any:
+    # NUMERIC columns come back as Decimal on Postgres; compare them as floats.
+    return float(value) if isinstance(value, Decimal) else value
+
+
 async def upsert_plans(
     session: AsyncSession,
     provider: models.Provider,
     plans: Iterable[schemas.PlanCreate],
-) -> List[models.Plan]:
-    """Replace provider plans with the supplied values."""
+    *,
+    retain_generations: int | None = None,
+) -> PlanChanges:
+    """Write the supplied plans as the provider's next generation and make it current.
+
+    Plans are matched on their natural key ``(name, term_months)`` against the
+    current generation. Unchanged plans are carried over as-is, so their IDs stay
+    stable; changed plans get a new version row and vanished plans are closed,
+    all with a constant number of statements. Readers keep seeing the previous
+    generation until ``Provider.current_generation`` is moved, and generations
+    older than ``retain_generations`` are garbage-collected. Plans whose price
+    fields changed also get a ``plan_price_history`` row.
+    """
 
-    existing_plans = await session.execute(
-        select(models.Plan).where(models.Plan.provider_id == provider.id)
+    table = models.Plan.__table__
+    current_generation = provider.current_generation
+    generation = current_generation + 1
+    owned = table.c.provider_id == provider.id
+
+    # Drop generations abandoned by a rollback so the new one builds on the current one.
+    await session.execute(
+        delete(table).where(owned, table.c.valid_from_generation > current_generation)
+    )
+    await session.execute(
+        update(table)
+        .where(owned, table.c.valid_to_generation > current_generation)
+        .values(valid_to_generation=None)
     )
-    for db_plan in existing_plans.scalars().all():
-        await session.delete(db_plan)
 
-    created: List[models.Plan] = []
+    existing_rows = await session.execute(
+        select(
+            table.c.id,
+            *(table.c[column] for column in PLAN_KEY_FIELDS + PLAN_VALUE_FIELDS),
+        ).where(owned, table.c.valid_to_generation.is_(None))
+    )
+    existing: Dict[PlanKey, Any] = {
+        (row.name, row.term_months): row for row in existing_rows
+    }
+
+    incoming: Dict[PlanKey, Dict[str, Any]] = {}
     for plan in plans:
-        plan_data = plan.model_dump(exclude={"provider_id"})
-        db_plan = models.Plan(provider_id=provider.id, **plan_data)
-        session.add(db_plan)
-        created.append(db_plan)
+        values = plan.model_dump(include=set(PLAN_KEY_FIELDS + PLAN_VALUE_FIELDS))
+        incoming[(values["name"], values["term_months"])] = values
+
+    now = datetime.utcnow()
+    changes = PlanChanges(generation=generation)
+    inserts: List[Dict[str, Any]] = []
+    closed: List[int] = []
+    history: List[Dict[str, Any]] = []
+    for key, values in incoming.items():
+        current = existing.get(key)
+        if current is not None and all(
+            _comparable(getattr(current, column)) == values[column]
+            for column in PLAN_VALUE_FIELDS
+        ):
+            changes.unchanged += 1
+            continue
+
+        row = {
+            "provider_id": provider.id,
+            "last_scraped_at": now,
+            "valid_from_generation": generation,
+            "valid_to_generation": None,
+            **values,
+        }
+        if current is None or any(
+            _comparable(getattr(current, column)) != values[column]
+            for column in PLAN_PRICE_FIELDS
+        ):
+            history.append(
+                {
+                    "provider_id": provider.id,
+                    "plan_name": values["name"],
+                    "term_months": values["term_months"],
+                    "observed_at": now,
+                    **{column: values[column] for column in PLAN_PRICE_FIELDS},
+                }
+            )
+        inserts.append(row)
+        if current is None:
+            changes.inserted.append(row)
+        else:
+            changes.updated.append(row)
+            closed.append(current.id)
 
+    changes.deleted = [row.id for key, row in existing.items() if key not in incoming]
+    closed.extend(changes.deleted)
+
+    if closed:
+        await session.execute(
+            update(table).where(table.c.id.in_(closed)).values(valid_to_generation=generation)
+        )
+    if inserts:
+        await session.execute(insert(table), inserts)
+    if history:
+        await session.execute(insert(models.PlanPriceHistory.__table__), history)
+        changes.price_changes = len(history)
+
+    provider.current_generation = generation
+    if retain_generations is not None:
+        await session.execute(
+            delete(table).where(
+                owned, table.c.valid_to_generation <= generation - retain_generations
+            )
+        )
+    await session.flush()
+    return changes
+
+
+async def get_latest_generation(session: AsyncSession, provider: models.Provider) -> int:
+    """Return the newest generation written for ``provider``, current or not."""
+
+    table = models.Plan.__table__
+    result = await session.execute(
+        select(
+            func.max(table.c.valid_from_generation), func.max(table.c.valid_to_generation)
+        ).where(table.c.provider_id == provider.id)
+    )
+    newest_from, newest_to = result.one()
+    return max(provider.current_generation, newest_from or 0, newest_to or 0)
+
+
+async def activate_generation(
+    session: AsyncSession,
+    provider: models.Provider,
+    generation: int,
+    *,
+    retain_generations: int,
+) -> None:
+    """Point ``provider`` at an earlier (or newer, not yet discarded) plan generation.
+
+    Raises ``ValueError`` when the generation was never written or has already
+    been garbage-collected.
+    """
+
+    latest = await get_latest_generation(session, provider)
+    oldest = max(0, latest - retain_generations)
+    if not oldest <= generation <= latest:
+        raise ValueError(
+            f"Generation {generation} is not available; choose between {oldest} and {latest}"
+        )
+
+    provider.current_generation = generation
+    # The stored fingerprint describes the generation being replaced.
+    provider.plans_fingerprint = None
     await session.flush()
-    return created
+
+
+async def stream_price_history(
+    session: AsyncSession,
+    plan: models.Plan,
+    start: datetime | None = None,
+    end: datetime | None = None,
+):
+    """Stream the price history of ``plan`` ordered by observation time."""
+
+    history = models.PlanPriceHistory
+    term_clause = (
+        history.term_months.is_(None)
+        if plan.term_months is None
+        else history.term_months == plan.term_months
+    )
+    stmt = (
+        select(history)
+        .where(
+            history.provider_id == plan.provider_id,
+            history.plan_name == plan.name,
+            term_clause,
+        )
+        .order_by(history.observed_at)
+        .execution_options(yield_per=500)
+    )
+    if start is not None:
+        stmt = stmt.where(history.observed_at >= start)
+    if end is not None:
+        stmt = stmt.where(history.observed_at < end)
+    return await session.stream_scalars(stmt)
+
+
+async def refresh_benchmarks(
+    session: AsyncSession, provider: models.Provider, usage_levels: Iterable[int]
+) -> None:
+    """Recompute the provider's cheapest plan at every benchmark usage level."""
+
+    rows = (
+        await session.execute(
+            select(models.Plan.id, models.Plan.rate_cents_kwh, models.Plan.base_fee).where(
+                models.Plan.provider_id == provider.id,
+                models.Plan.rate_cents_kwh.is_not(None),
+                models.plan_visible_in(provider.current_generation),
+            )
+        )
+    ).all()
+
+    entries = []
+    for usage_kwh in sorted(set(usage_levels)):
+        if not rows:
+            break
+        costs = [
+            (models.estimate_monthly_cost(row.rate_cents_kwh, row.base_fee, usage_kwh), row.id)
+            for row in rows
+        ]
+        monthly_cost, plan_id = min(costs)
+        entries.append(
+            {
+                "provider_id": provider.id,
+                "usage_kwh": usage_kwh,
+                "plan_id": plan_id,
+                "monthly_cost": monthly_cost,
+            }
+        )
+
+    await session.execute(
+        delete(models.PlanBenchmark).where(models.PlanBenchmark.provider_id == provider.id)
+    )
+    if entries:
+        await session.execute(insert(models.PlanBenchmark), entries)
+
+
+async def get_benchmark_cost(
+    session: AsyncSession, slug: str, usage_kwh: int
+) -> float | None:
+    """Return the cheapest monthly cost offered by ``slug`` at ``usage_kwh``.
+
+    Usage levels on the precomputed grid are a single-row lookup; other levels
+    fall back to an aggregate over the provider's plans.
+    """
+
+    benchmark = models.PlanBenchmark
+    result = await session.execute(
+        select(benchmark.monthly_cost)
+        .join(models.Provider, models.Provider.id == benchmark.provider_id)
+        .where(models.Provider.slug == slug, benchmark.usage_kwh == usage_kwh)
+    )
+    monthly_cost = result.scalar_one_or_none()
+    if monthly_cost is not None:
+        return monthly_cost
+
+    plan = models.Plan
+    result = await session.execute(
+        select(
+            func.min(
+                func.coalesce(plan.base_fee, 0.0) + plan.rate_cents_kwh / 100.0 * usage_kwh
+            )
+        )
+        .join(models.Provider)
+        .where(
+            models.Provider.slug == slug,
+            plan.rate_cents_kwh.is_not(None),
+            models.current_plan_criteria(),
+        )
+    )
+    return result.scalar_one_or_none()
+
+
+DATA_GENERATION_ID = 1
+
+
+async def get_data_generation(session: AsyncSession) -> int:
+    result = await session.execute(
+        select(models.DataGeneration.value).where(models.DataGeneration.id == DATA_GENERATION_ID)
+    )
+    return result.scalar_one_or_none() or 0
+
+
+async def bump_data_generation(session: AsyncSession) -> None:
+    """Advance the data generation; callers commit it together with their changes."""
+
+    generation = models.DataGeneration
+    result = await session.execute(
+        update(generation)
+        .where(generation.id == DATA_GENERATION_ID)
+        .values(value=generation.value + 1)
+    )
+    if result.rowcount == 0:
+        session.add(generation(id=DATA_GENERATION_ID, value=1))
+        await session.flush()
+
+
+JOB_ACTIVE_STATUSES = ("queued", "running")
+
+
+async def create_scrape_job(session: AsyncSession, job_id: str, slugs: Sequence[str]) -> models.ScrapeJob:
+    job = models.ScrapeJob(
+        id=job_id,
+        status="queued",
+        providers=[
+            models.ScrapeJobProvider(provider=slug, position=position, status="queued", plans=[])
+            for position, slug in enumerate(slugs)
+        ],
+    )
+    session.add(job)
+    await session.flush()
+    return job
+
+
+async def get_scrape_job(session: AsyncSession, job_id: str) -> models.ScrapeJob | None:
+    result = await session.execute(
+        select(models.ScrapeJob)
+        .options(selectinload(models.ScrapeJob.providers))
+        .where(models.ScrapeJob.id == job_id)
+    )
+    return result.scalar_one_or_none()
+
+
+async def get_unfinished_scrape_jobs(session: AsyncSession) -> Sequence[models.ScrapeJob]:
+    result = await session.execute(
+        select(models.ScrapeJob)
+        .options(selectinload(models.ScrapeJob.providers))
+        .where(models.ScrapeJob.status.in_(JOB_ACTIVE_STATUSES))
+        .order_by(models.ScrapeJob.created_at)
+    )
+    return result.scalars().all()
+
+
+async def set_scrape_job_status(session: AsyncSession, job_id: str, status: str) -> None:
+    values: Dict[str, Any] = {"status": status}
+    if status == "running":
+        values["started_at"] = datetime.utcnow()
+    elif status not in JOB_ACTIVE_STATUSES:
+        values["finished_at"] = datetime.utcnow()
+    await session.execute(
+        update(models.ScrapeJob).where(models.ScrapeJob.id == job_id).values(**values)
+    )
+
+
+async def update_scrape_job_provider(
+    session: AsyncSession, job_id: str, slug: str, **values: Any
+) -> None:
+    await session.execute(
+        update(models.ScrapeJobProvider)
+        .where(
+            models.ScrapeJobProvider.job_id == job_id,
+            models.ScrapeJobProvider.provider == slug,
+        )
+        .values(**values)
+    )
+
+
+def provider_lease_name(slug: str) -> str:
+    return f"scrape:{slug}"
+
+
+def job_lease_name(job_id: str) -> str:
+    return f"job:{job_id}"
+
+
+def provider_job_lease_name(slug: str) -> str:
+    """Lease held by the scrape job currently scraping ``slug`` (the holder is its id)."""
+
+    return f"scraping:{slug}"
+
+
+async def get_lease(session: AsyncSession, name: str) -> models.Lease | None:
+    return await session.get(models.Lease, name, populate_existing=True)
+
+
+async def acquire_lease(
+    session: AsyncSession,
+    name: str,
+    holder: str,
+    ttl_seconds: float,
+    *,
+    now: datetime | None = None,
+    interval_minutes: float | None = None,
+) -> bool:
+    """Claim ``name`` for ``holder`` until ``ttl_seconds`` from now.
+
+    Succeeds when the lease is free, expired or already held by ``holder``
+    (which renews it). ``interval_minutes``, when given, is stored on the
+    lease; otherwise the recorded interval is kept. A conditional UPDATE followed by an INSERT that loses
+    to any concurrent insert on the primary key makes this safe across
+    processes on both SQLite and PostgreSQL.
+    """
+
+    now = now or datetime.utcnow()
+    expires_at = now + timedelta(seconds=ttl_seconds)
+    values = {"holder": holder, "expires_at": expires_at}
+    if interval_minutes is not None:
+        values["interval_minutes"] = interval_minutes
+    lease = models.Lease
+    result = await session.execute(
+        update(lease)
+        .where(lease.name == name, or_(lease.expires_at <= now, lease.holder == holder))
+        .values(**values)
+    )
+    if result.rowcount:
+        return True
+    try:
+        async with session.begin_nested():
+            await session.execute(
+                insert(lease).values(name=name, **values)
+            )
+    except IntegrityError:
+        return False
+    return True
+
+
+async def release_lease(session: AsyncSession, name: str, holder: str) -> None:
+    await session.execute(
+        delete(models.Lease).where(models.Lease.name == name, models.Lease.holder == holder)
+    )
+
@@ -1,14 +1,112 @@
+from __future__ import annotations
+
+import time
+from dataclasses import asdict, dataclass
+
+from sqlalchemy import exc
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 from .config import get_settings
+from .metrics import registry
 
 settings = get_settings()
 
-engine = create_async_engine(settings.database_url, echo=False, future=True)
+
+@dataclass
+class PoolStats:
+    """Cumulative counters describing how long callers waited for a connection."""
+
+    checkouts: int = 0
+    wait_seconds_total: float = 0.0
+    wait_seconds_max: float = 0.0
+    timeouts: int = 0
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that records checkout wait times and pool timeouts."""
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.stats = PoolStats()
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            self.stats.timeouts += 1
+            raise
+        finally:
+            waited = time.perf_counter() - started
+            self.stats.checkouts += 1
+            self.stats.wait_seconds_total += waited
+            self.stats.wait_seconds_max = max(self.stats.wait_seconds_max, waited)
+
+    def recreate(self) -> "InstrumentedQueuePool":
+        pool = super().recreate()
+        pool.stats = self.stats
+        return pool
+
+
+def _engine_options(database_url: str) -> dict:
+    url = make_url(database_url)
+    if url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:"):
+        # In-memory SQLite lives in a single connection; keep SQLAlchemy's default pool.
+        return {}
+    return {
+        "poolclass": InstrumentedQueuePool,
+        "pool_size": settings.database_pool_size,
+        "max_overflow": settings.database_max_overflow,
+        "pool_timeout": settings.database_pool_timeout_seconds,
+        "pool_recycle": settings.database_pool_recycle_seconds,
+        "pool_pre_ping": settings.database_pool_pre_ping,
+    }
+
+
+engine = create_async_engine(
+    settings.database_url, echo=False, future=True, **_engine_options(settings.database_url)
+)
 AsyncSessionLocal = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 
 
+def pool_status() -> dict:
+    """Snapshot of the shared engine's connection pool for capacity planning."""
+
+    pool = engine.sync_engine.pool
+    if not isinstance(pool, InstrumentedQueuePool):
+        return {"pool": type(pool).__name__}
+    return {
+        "pool": type(pool).__name__,
+        "size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "idle": pool.checkedin(),
+        "overflow": max(pool.overflow(), 0),
+        "max_overflow": settings.database_max_overflow,
+        **pool.stats.to_dict(),
+    }
+
+
+def _pool_reading(key: str):
+    return lambda: pool_status().get(key)
+
+
+for _name, _key, _kind, _doc in (
+    ("db_pool_checked_out", "checked_out", "gauge", "Connections currently checked out of the pool."),
+    ("db_pool_overflow", "overflow", "gauge", "Connections open above the configured pool size."),
+    ("db_pool_checkouts_total", "checkouts", "counter", "Connection checkouts from the pool."),
+    ("db_pool_wait_seconds_total", "wait_seconds_total", "counter", "Total time spent waiting for a pooled connection."),
+    ("db_pool_wait_seconds_max", "wait_seconds_max", "gauge", "Longest wait for a pooled connection since startup."),
+    ("db_pool_timeouts_total", "timeouts", "counter", "Checkouts that failed because the pool was exhausted."),
+):
+    registry.callback(_name, _doc, _pool_reading(_key), _kind)
+
+
 async def get_session() -> AsyncSession:
     async with AsyncSessionLocal() as session:
         yield session
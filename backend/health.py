@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from dataclasses import dataclass
+
+from loguru import logger
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from .config import get_settings
+from .database import engine
+
+
+@dataclass
+class HealthResult:
+    ok: bool
+    checked_at: float
+    latency_seconds: float
+    error: str | None = None
+
+    def to_dict(self) -> dict:
+        return {
+            "status": "ok" if self.ok else "unavailable",
+            "database": {
+                "ok": self.ok,
+                "latency_ms": round(self.latency_seconds * 1000, 2),
+                "error": self.error,
+            },
+        }
+
+
+class DatabaseHealthCheck:
+    """Readiness probe that borrows a connection from the shared engine pool.
+
+    Results are reused for ``ttl`` seconds and concurrent probes share one
+    in-flight check, so frequent orchestrator polling costs at most one
+    ``SELECT 1`` per interval and never opens connections outside the pool.
+    """
+
+    def __init__(self, engine: AsyncEngine, ttl: float) -> None:
+        self.engine = engine
+        self.ttl = ttl
+        self._result: HealthResult | None = None
+        self._lock = asyncio.Lock()
+
+    def _fresh(self) -> bool:
+        return self._result is not None and time.monotonic() - self._result.checked_at < self.ttl
+
+    async def check(self) -> HealthResult:
+        if self._fresh():
+            return self._result
+        async with self._lock:
+            if self._fresh():
+                return self._result
+            started = time.monotonic()
+            try:
+                async with self.engine.connect() as connection:
+                    await connection.execute(text("SELECT 1"))
+            except Exception as exc:
+                logger.warning("Database readiness check failed: {error}", error=exc)
+                self._result = HealthResult(False, started, time.monotonic() - started, str(exc))
+            else:
+                self._result = HealthResult(True, started, time.monotonic() - started)
+            return self._result
+
+
+database_health = DatabaseHealthCheck(engine, ttl=get_settings().health_cache_seconds)
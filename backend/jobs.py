@@ -0,0 +1,274 @@
+from __future__ import annotations
+
+import asyncio
+import uuid
+from dataclasses import dataclass, field
+from typing import Dict, List, Sequence, Set
+
+from loguru import logger
+
+from . import crud, models
+from .config import get_settings
+from .database import AsyncSessionLocal
+from .scrapers.orchestrator import ProviderReport, run_scrapers
+
+
+@dataclass
+class SubmittedJob:
+    """Outcome of :meth:`ScrapeJobRunner.submit`."""
+
+    job_id: str
+    status: str
+    providers: List[str] = field(default_factory=list)
+    # Requested providers that were already being scraped, mapped to that job.
+    merged: Dict[str, str] = field(default_factory=dict)
+
+
+class ScrapeJobRunner:
+    """Runs scrape jobs as background tasks and persists their progress.
+
+    A provider is never scraped by two jobs at once, across all replicas: a
+    job claims each of its providers with a ``scraping:<slug>`` lease held in
+    its own name, and requesting a provider whose lease another active job
+    holds points the caller at that job instead. Jobs that were queued or
+    running when their process stopped are resumed by :meth:`resume`.
+
+    Every running job also holds a lease (``job:<id>``) for its replica. Both
+    are renewed while the job runs, so only jobs whose owner has gone away
+    (their lease expired) are picked up again. A replica that loses the lease
+    of one of its jobs stops running it, leaving the job to the new owner.
+    """
+
+    def __init__(self) -> None:
+        self._tasks: Dict[str, asyncio.Task] = {}
+        # Jobs cancelled here because another replica took over their lease.
+        self._taken_over: Set[str] = set()
+        self._lock = asyncio.Lock()
+
+    async def submit(self, slugs: Sequence[str]) -> SubmittedJob:
+        async with self._lock:
+            job_id = uuid.uuid4().hex
+            merged: Dict[str, models.ScrapeJob] = {}
+            new = []
+            async with AsyncSessionLocal() as session:
+                for slug in slugs:
+                    active = await self._claim_provider(session, slug, job_id)
+                    if active is None:
+                        new.append(slug)
+                    else:
+                        merged[slug] = active
+                if new:
+                    await crud.create_scrape_job(session, job_id, new)
+                    await self._acquire_lease(session, job_id)
+                await session.commit()
+            merged_ids = {slug: job.id for slug, job in merged.items()}
+            if not new:
+                covering = merged[slugs[0]]
+                return SubmittedJob(job_id=covering.id, status=covering.status, merged=merged_ids)
+            self._start(job_id, new)
+        return SubmittedJob(job_id=job_id, status="queued", providers=new, merged=merged_ids)
+
+    @staticmethod
+    async def _claim_provider(session, slug: str, job_id: str) -> models.ScrapeJob | None:
+        """Claim ``slug`` for ``job_id``, or return the active job that already holds it."""
+
+        name = crud.provider_job_lease_name(slug)
+        ttl = get_settings().scrape_job_lease_seconds
+        while not await crud.acquire_lease(session, name, job_id, ttl):
+            lease = await crud.get_lease(session, name)
+            if lease is None:
+                continue  # released in the meantime
+            job = await crud.get_scrape_job(session, lease.holder)
+            if job is not None and job.status in crud.JOB_ACTIVE_STATUSES:
+                return job
+            # The holding job finished or no longer exists; its lease is stale.
+            await crud.release_lease(session, name, lease.holder)
+        return None
+
+    def _start(self, job_id: str, slugs: Sequence[str]) -> None:
+        self._tasks[job_id] = asyncio.create_task(self._run(job_id, list(slugs)))
+
+    async def _run(self, job_id: str, slugs: List[str]) -> None:
+        # Providers still claimed by this job; reported ones are released right away.
+        remaining = set(slugs)
+
+        async def on_start(slug: str) -> None:
+            await self._update_provider(job_id, slug, status="running")
+
+        async def on_report(report: ProviderReport) -> None:
+            await self._update_provider(
+                job_id,
+                report.provider,
+                status=report.status,
+                plans=report.plans,
+                error=report.error,
+                duration_seconds=report.duration_seconds,
+                circuit=report.circuit,
+            )
+            # Later requests for this provider should start a fresh scrape.
+            remaining.discard(report.provider)
+            await self._release_providers(job_id, [report.provider])
+
+        heartbeat = asyncio.create_task(self._keep_lease(job_id, remaining))
+        status = "failed"
+        try:
+            await self._set_status(job_id, "running")
+            await run_scrapers(slugs, on_start=on_start, on_report=on_report)
+            status = "completed"
+        except asyncio.CancelledError:
+            # Shutting down or taken over: leave the job active for its next owner.
+            status = None
+            if job_id not in self._taken_over:
+                raise
+        except Exception:
+            logger.exception("Scrape job {job_id} failed", job_id=job_id)
+        finally:
+            self._tasks.pop(job_id, None)
+            heartbeat.cancel()
+            if status is not None:
+                await self._set_status(job_id, status)
+            if job_id in self._taken_over:
+                # The leases now belong to the replica that resumed the job.
+                self._taken_over.discard(job_id)
+            else:
+                # Also on shutdown, so another replica can resume the job right away.
+                await self._release_providers(job_id, remaining)
+                await self._release_lease(job_id)
+
+    @staticmethod
+    async def _acquire_lease(session, job_id: str) -> bool:
+        settings = get_settings()
+        return await crud.acquire_lease(
+            session, crud.job_lease_name(job_id), settings.instance_id, settings.scrape_job_lease_seconds
+        )
+
+    async def _keep_lease(self, job_id: str, providers: Set[str]) -> None:
+        settings = get_settings()
+        interval = settings.scrape_job_lease_seconds / 3
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                async with AsyncSessionLocal() as session:
+                    renewed = await self._acquire_lease(session, job_id)
+                    for slug in list(providers):
+                        await crud.acquire_lease(
+                            session,
+                            crud.provider_job_lease_name(slug),
+                            job_id,
+                            settings.scrape_job_lease_seconds,
+                        )
+                    await session.commit()
+            except Exception:
+                logger.exception("Could not renew the lease on scrape job {job_id}", job_id=job_id)
+                continue
+            if not renewed:
+                logger.warning(
+                    "Scrape job {job_id} was taken over by another replica; stopping it here",
+                    job_id=job_id,
+                )
+                task = self._tasks.get(job_id)
+                if task is not None:
+                    self._taken_over.add(job_id)
+                    task.cancel()
+                return
+
+    async def _release_providers(self, job_id: str, slugs) -> None:
+        try:
+            async with AsyncSessionLocal() as session:
+                for slug in list(slugs):
+                    await crud.release_lease(session, crud.provider_job_lease_name(slug), job_id)
+                await session.commit()
+        except Exception:
+            logger.exception("Could not release the providers of scrape job {job_id}", job_id=job_id)
+
+    async def _release_lease(self, job_id: str) -> None:
+        try:
+            async with AsyncSessionLocal() as session:
+                await crud.release_lease(session, crud.job_lease_name(job_id), get_settings().instance_id)
+                await session.commit()
+        except Exception:
+            logger.exception("Could not release the lease on scrape job {job_id}", job_id=job_id)
+
+    async def _set_status(self, job_id: str, status: str) -> None:
+        async with AsyncSessionLocal() as session:
+            await crud.set_scrape_job_status(session, job_id, status)
+            await session.commit()
+
+    async def _update_provider(self, job_id: str, slug: str, **values) -> None:
+        async with AsyncSessionLocal() as session:
+            await crud.update_scrape_job_provider(session, job_id, slug, **values)
+            await session.commit()
+
+    async def get(self, job_id: str) -> models.ScrapeJob | None:
+        async with AsyncSessionLocal() as session:
+            return await crud.get_scrape_job(session, job_id)
+
+    async def wait(self, job_id: str) -> models.ScrapeJob | None:
+        """Wait for a job started by this process to finish and return its final state."""
+
+        task = self._tasks.get(job_id)
+        if task is not None:
+            await asyncio.shield(task)
+        return await self.get(job_id)
+
+    async def resume(self) -> None:
+        """Restart unfinished jobs whose owner stopped (their lease has expired).
+
+        Runs at startup and then periodically from the scheduler, so jobs of a
+        replica that died are picked up without waiting for a restart.
+        """
+
+        # Holding the lock keeps a job that submit() has created but not yet
+        # started from looking orphaned.
+        async with self._lock:
+            await self._resume()
+
+    async def _resume(self) -> None:
+        resumable = []
+        async with AsyncSessionLocal() as session:
+            for job in await crud.get_unfinished_scrape_jobs(session):
+                if job.id in self._tasks:
+                    continue
+                if not await self._acquire_lease(session, job.id):
+                    logger.info("Scrape job {job_id} is still running on another replica", job_id=job.id)
+                    continue
+                pending = []
+                for entry in job.providers:
+                    if entry.status not in crud.JOB_ACTIVE_STATUSES:
+                        continue
+                    other = await self._claim_provider(session, entry.provider, job.id)
+                    if other is not None and other.id != job.id:
+                        # Requested again while this job was orphaned; that job scrapes it.
+                        await crud.update_scrape_job_provider(
+                            session,
+                            job.id,
+                            entry.provider,
+                            status="merged",
+                            error=f"Merged into job {other.id}",
+                        )
+                        continue
+                    pending.append(entry.provider)
+                    await crud.update_scrape_job_provider(
+                        session, job.id, entry.provider, status="queued"
+                    )
+                if pending:
+                    resumable.append((job.id, pending))
+                else:
+                    await crud.set_scrape_job_status(session, job.id, "completed")
+            await session.commit()
+
+        for job_id, pending in resumable:
+            logger.info("Resuming scrape job {job_id} for {slugs}", job_id=job_id, slugs=pending)
+            self._start(job_id, pending)
+
+    async def shutdown(self) -> None:
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._tasks.clear()
+        self._taken_over.clear()
+        self._lock = asyncio.Lock()
+
+
+job_runner = ScrapeJobRunner()
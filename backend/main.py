@@ -1,23 +1,33 @@
 from contextlib import asynccontextmanager
 
-from fastapi import Depends, FastAPI, HTTPException, status
+from fastapi import Depends, FastAPI, HTTPException, Response, status
 from fastapi.middleware.cors import CORSMiddleware
-from sqlalchemy.ext.asyncio import AsyncSession
 
+from . import schemas
 from .config import get_settings
-from .database import get_session
+from .database import pool_status
 from .deps import verify_api_key
+from .health import database_health
+from .jobs import job_runner
+from .metrics import CONTENT_TYPE, MetricsMiddleware, registry
 from .routes import plans, providers
 from .scheduler import schedule_jobs, shutdown_scheduler
-from .scrapers.runner import initialize_database, run_scraper
+from .scrapers.executor import shutdown_parse_executor
+from .scrapers.fetch import close_fetcher
+from .scrapers.orchestrator import validate_slugs
+from .scrapers.runner import initialize_database
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     await initialize_database()
+    await job_runner.resume()
     await schedule_jobs()
     yield
     await shutdown_scheduler()
+    await job_runner.shutdown()
+    await close_fetcher()
+    shutdown_parse_executor()
 
 
 app = FastAPI(title="Energy Plan Aggregator", lifespan=lifespan)
@@ -29,38 +39,80 @@ app.add_middleware(
     allow_methods=["*"]
     ,
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "Link"],
 )
 
+app.add_middleware(MetricsMiddleware)
+
 app.include_router(providers.router)
 app.include_router(plans.router)
 @app.post("/scrape", dependencies=[Depends(verify_api_key)], status_code=status.HTTP_202_ACCEPTED)
-async def trigger_scrape(
-    payload: dict | None = None,
-    session: AsyncSession = Depends(get_session),
-):
+async def trigger_scrape(response: Response, payload: dict | None = None):
+    """Queue a background scrape and return its job ID without waiting for it.
+
+    Providers that an active job is already scraping are not scraped twice;
+    they are listed under ``merged`` with the job that covers them.
+    """
+
     settings = get_settings()
     providers_to_scrape = payload.get("providers") if payload else settings.scrape_providers
     if not providers_to_scrape:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="No providers requested")
 
-    results = []
-    for slug in providers_to_scrape:
-        try:
-            result = await run_scraper(session, slug)
-        except ValueError as exc:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=str(exc),
-            ) from exc
+    try:
+        slugs = validate_slugs(providers_to_scrape)
+    except ValueError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(exc),
+        ) from exc
+
+    job = await job_runner.submit(slugs)
+    response.headers["Location"] = f"/scrape/jobs/{job.job_id}"
+    return {
+        "status": job.status,
+        "job_id": job.job_id,
+        "providers": job.providers,
+        "merged": job.merged,
+    }
 
-        results.append({
-            "provider": result.provider.slug,
-            "plans": [plan.name for plan in result.plans],
-        })
 
-    return {"status": "queued", "results": results}
+@app.get("/scrape/jobs/{job_id}", response_model=schemas.ScrapeJobRead)
+async def read_scrape_job(job_id: str):
+    job = await job_runner.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Scrape job not found")
+    return job
+
+
+@app.get("/")
+async def read_root() -> dict[str, str]:
+    return {"message": "Welcome to the Skywalker API"}
 
 
 @app.get("/health")
 async def health() -> dict[str, str]:
+    """Liveness: the process is up and serving requests. Never touches the database."""
+
     return {"status": "ok"}
+
+
+@app.get("/health/ready")
+@app.get("/healthz", include_in_schema=False)
+async def readiness(response: Response) -> dict:
+    """Readiness: the shared database pool can serve a query (result cached briefly)."""
+
+    result = await database_health.check()
+    if not result.ok:
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    return result.to_dict()
+
+
+@app.get("/health/pool", dependencies=[Depends(verify_api_key)])
+async def database_pool() -> dict:
+    return pool_status()
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics() -> Response:
+    return Response(content=registry.render(), media_type=CONTENT_TYPE)
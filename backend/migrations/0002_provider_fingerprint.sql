@@ -0,0 +1 @@
+ALTER TABLE providers ADD COLUMN IF NOT EXISTS plans_fingerprint VARCHAR(64);
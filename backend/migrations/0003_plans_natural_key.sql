@@ -0,0 +1,10 @@
+-- Keep only the newest row per natural key before enforcing uniqueness.
+DELETE FROM plans a
+USING plans b
+WHERE a.provider_id = b.provider_id
+  AND a.name = b.name
+  AND a.term_months IS NOT DISTINCT FROM b.term_months
+  AND a.id < b.id;
+
+CREATE UNIQUE INDEX IF NOT EXISTS uq_plans_provider_name_term
+    ON plans(provider_id, name, term_months);
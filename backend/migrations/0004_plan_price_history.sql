@@ -0,0 +1,12 @@
+CREATE TABLE IF NOT EXISTS plan_price_history (
+    id BIGSERIAL PRIMARY KEY,
+    provider_id INTEGER NOT NULL REFERENCES providers(id) ON DELETE CASCADE,
+    plan_name VARCHAR(255) NOT NULL,
+    term_months INTEGER,
+    rate_cents_kwh DOUBLE PRECISION,
+    base_fee DOUBLE PRECISION,
+    cancellation_fee DOUBLE PRECISION,
+    observed_at TIMESTAMP NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_plan_price_history_key_observed
+    ON plan_price_history(provider_id, plan_name, term_months, observed_at);
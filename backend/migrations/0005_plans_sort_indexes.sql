@@ -0,0 +1,2 @@
+CREATE INDEX IF NOT EXISTS ix_plans_rate_term_id ON plans(rate_cents_kwh, term_months, id);
+CREATE INDEX IF NOT EXISTS ix_plans_term_rate_id ON plans(term_months, rate_cents_kwh, id);
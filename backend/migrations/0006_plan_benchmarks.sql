@@ -0,0 +1,7 @@
+CREATE TABLE IF NOT EXISTS plan_benchmarks (
+    provider_id INTEGER NOT NULL REFERENCES providers(id) ON DELETE CASCADE,
+    usage_kwh INTEGER NOT NULL,
+    plan_id INTEGER NOT NULL,
+    monthly_cost DOUBLE PRECISION NOT NULL,
+    PRIMARY KEY (provider_id, usage_kwh)
+);
@@ -0,0 +1,5 @@
+CREATE TABLE IF NOT EXISTS data_generation (
+    id INTEGER PRIMARY KEY,
+    value INTEGER NOT NULL DEFAULT 0
+);
+INSERT INTO data_generation (id, value) VALUES (1, 0) ON CONFLICT (id) DO NOTHING;
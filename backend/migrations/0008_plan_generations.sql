@@ -0,0 +1,11 @@
+ALTER TABLE providers ADD COLUMN IF NOT EXISTS current_generation INTEGER NOT NULL DEFAULT 0;
+
+ALTER TABLE plans ADD COLUMN IF NOT EXISTS valid_from_generation INTEGER NOT NULL DEFAULT 0;
+ALTER TABLE plans ADD COLUMN IF NOT EXISTS valid_to_generation INTEGER;
+
+-- Plan versions of different generations share a natural key.
+DROP INDEX IF EXISTS uq_plans_provider_name_term;
+CREATE UNIQUE INDEX IF NOT EXISTS uq_plans_provider_key_generation
+    ON plans(provider_id, name, term_months, valid_from_generation);
+CREATE INDEX IF NOT EXISTS ix_plans_provider_generation
+    ON plans(provider_id, valid_to_generation, valid_from_generation);
@@ -0,0 +1,19 @@
+CREATE TABLE IF NOT EXISTS scrape_jobs (
+    id VARCHAR(32) PRIMARY KEY,
+    status VARCHAR(20) NOT NULL DEFAULT 'queued',
+    created_at TIMESTAMP NOT NULL DEFAULT NOW(),
+    started_at TIMESTAMP,
+    finished_at TIMESTAMP
+);
+CREATE INDEX IF NOT EXISTS ix_scrape_jobs_status ON scrape_jobs(status);
+
+CREATE TABLE IF NOT EXISTS scrape_job_providers (
+    job_id VARCHAR(32) NOT NULL REFERENCES scrape_jobs(id) ON DELETE CASCADE,
+    provider VARCHAR(100) NOT NULL,
+    position INTEGER NOT NULL DEFAULT 0,
+    status VARCHAR(20) NOT NULL DEFAULT 'queued',
+    plans JSON NOT NULL DEFAULT '[]',
+    error TEXT,
+    duration_seconds DOUBLE PRECISION NOT NULL DEFAULT 0,
+    PRIMARY KEY (job_id, provider)
+);
@@ -0,0 +1,5 @@
+CREATE TABLE IF NOT EXISTS leases (
+    name VARCHAR(200) PRIMARY KEY,
+    holder VARCHAR(200) NOT NULL,
+    expires_at TIMESTAMP NOT NULL
+);
@@ -0,0 +1 @@
+ALTER TABLE scrape_job_providers ADD COLUMN IF NOT EXISTS circuit VARCHAR(20);
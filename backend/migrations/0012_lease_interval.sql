@@ -0,0 +1 @@
+ALTER TABLE leases ADD COLUMN IF NOT EXISTS interval_minutes DOUBLE PRECISION;
@@ -0,0 +1,11 @@
+-- Plans sort on NOT NULL coalesced keys (NULLs last) so cursor pages are index range scans.
+DROP INDEX IF EXISTS ix_plans_rate_term_id;
+DROP INDEX IF EXISTS ix_plans_term_rate_id;
+CREATE INDEX IF NOT EXISTS ix_plans_rate_sort
+    ON plans ((COALESCE(rate_cents_kwh, 1e+308)), (COALESCE(term_months, 2147483647)), id);
+CREATE INDEX IF NOT EXISTS ix_plans_rate_sort_desc
+    ON plans ((COALESCE(rate_cents_kwh, -1e+308)), (COALESCE(term_months, -2147483647)), id);
+CREATE INDEX IF NOT EXISTS ix_plans_term_sort
+    ON plans ((COALESCE(term_months, 2147483647)), (COALESCE(rate_cents_kwh, 1e+308)), id);
+CREATE INDEX IF NOT EXISTS ix_plans_term_sort_desc
+    ON plans ((COALESCE(term_months, -2147483647)), (COALESCE(rate_cents_kwh, -1e+308)), id);
@@ -1,7 +1,21 @@
 from datetime import datetime
 from typing import List
 
-from sqlalchemy import Column, DateTime, Float, ForeignKey, Integer, String, Text
+from sqlalchemy import (
+    JSON,
+    Column,
+    DateTime,
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Text,
+    and_,
+    func,
+    literal_column,
+    or_,
+)
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
 
 
@@ -9,6 +23,14 @@ class Base(DeclarativeBase):
     pass
 
 
+def estimate_monthly_cost(
+    rate_cents_kwh: float | None, base_fee: float | None, usage_kwh: float
+) -> float:
+    """Estimate the monthly cost of a plan for a given energy usage."""
+
+    return (base_fee or 0.0) + ((rate_cents_kwh or 0.0) / 100.0) * usage_kwh
+
+
 class Provider(Base):
     __tablename__ = "providers"
 
@@ -16,18 +38,62 @@ class Provider(Base):
     name: Mapped[str] = mapped_column(String(255), unique=True, nullable=False)
     slug: Mapped[str] = mapped_column(String(100), unique=True, nullable=False)
     website: Mapped[str | None] = mapped_column(String(255))
+    plans_fingerprint: Mapped[str | None] = mapped_column(String(64))
+    current_generation: Mapped[int] = mapped_column(
+        Integer, default=0, server_default="0", nullable=False
+    )
     created_at: Mapped[datetime] = mapped_column(
         DateTime, default=datetime.utcnow, nullable=False
     )
 
-    plans: Mapped[List["Plan"]] = relationship(
+    # Every stored plan version, including superseded generations.
+    all_plans: Mapped[List["Plan"]] = relationship(
         back_populates="provider",
         cascade="all, delete-orphan",
     )
+    # Only the plans of the generation the provider currently points at.
+    plans: Mapped[List["Plan"]] = relationship(
+        primaryjoin=lambda: and_(Provider.id == Plan.provider_id, current_plan_criteria()),
+        viewonly=True,
+    )
+
+
+def plan_visible_in(generation):
+    """SQL criteria selecting plan rows that belong to ``generation``."""
+
+    return and_(
+        Plan.valid_from_generation <= generation,
+        or_(Plan.valid_to_generation.is_(None), Plan.valid_to_generation > generation),
+    )
+
+
+def current_plan_criteria():
+    """SQL criteria selecting plans of their provider's current generation.
+
+    The enclosing query must join ``providers``.
+    """
+
+    return plan_visible_in(Provider.current_generation)
 
 
 class Plan(Base):
     __tablename__ = "plans"
+    __table_args__ = (
+        Index(
+            "uq_plans_provider_key_generation",
+            "provider_id",
+            "name",
+            "term_months",
+            "valid_from_generation",
+            unique=True,
+        ),
+        Index(
+            "ix_plans_provider_generation",
+            "provider_id",
+            "valid_to_generation",
+            "valid_from_generation",
+        ),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     provider_id: Mapped[int] = mapped_column(ForeignKey("providers.id"), index=True)
@@ -42,12 +108,146 @@ class Plan(Base):
     last_scraped_at: Mapped[datetime] = mapped_column(
         DateTime, default=datetime.utcnow, onupdate=datetime.utcnow
     )
+    # A plan row belongs to every provider generation in [valid_from, valid_to).
+    valid_from_generation: Mapped[int] = mapped_column(
+        Integer, default=0, server_default="0", nullable=False
+    )
+    valid_to_generation: Mapped[int | None] = mapped_column(Integer)
 
-    provider: Mapped[Provider] = relationship(back_populates="plans")
+    provider: Mapped[Provider] = relationship(back_populates="all_plans")
 
     def cost_for_usage(self, usage_kwh: float) -> float:
         """Estimate the monthly cost for a given energy usage."""
 
-        rate_cents = self.rate_cents_kwh or 0.0
-        base_fee = self.base_fee or 0.0
-        return base_fee + (rate_cents / 100.0) * usage_kwh
+        return estimate_monthly_cost(self.rate_cents_kwh, self.base_fee, usage_kwh)
+
+
+# Plan listings put NULLs last in both directions. Sorting on COALESCE(column,
+# sentinel) keeps the sort key NOT NULL, so every keyset page is one range scan
+# of the matching index below.
+PLAN_SORT_NULL_SENTINELS = {"rate_cents_kwh": 1e308, "term_months": 2_147_483_647}
+
+
+def plan_sort_sentinel(name: str, descending: bool = False) -> float:
+    sentinel = PLAN_SORT_NULL_SENTINELS[name]
+    return -sentinel if descending else sentinel
+
+
+def plan_sort_key(name: str, descending: bool = False):
+    """NOT NULL sort expression for plan column ``name`` that places NULLs last.
+
+    The sentinel is rendered inline so the expression matches the index.
+    """
+
+    sentinel = literal_column(repr(plan_sort_sentinel(name, descending)))
+    return func.coalesce(getattr(Plan, name), sentinel)
+
+
+Index("ix_plans_rate_sort", plan_sort_key("rate_cents_kwh"), plan_sort_key("term_months"), Plan.id)
+Index(
+    "ix_plans_rate_sort_desc",
+    plan_sort_key("rate_cents_kwh", True),
+    plan_sort_key("term_months", True),
+    Plan.id,
+)
+Index("ix_plans_term_sort", plan_sort_key("term_months"), plan_sort_key("rate_cents_kwh"), Plan.id)
+Index(
+    "ix_plans_term_sort_desc",
+    plan_sort_key("term_months", True),
+    plan_sort_key("rate_cents_kwh", True),
+    Plan.id,
+)
+
+
+class PlanPriceHistory(Base):
+    """Append-only log of plan prices, written only when a price actually changes."""
+
+    __tablename__ = "plan_price_history"
+    __table_args__ = (
+        Index(
+            "ix_plan_price_history_key_observed",
+            "provider_id",
+            "plan_name",
+            "term_months",
+            "observed_at",
+        ),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    provider_id: Mapped[int] = mapped_column(ForeignKey("providers.id"), nullable=False)
+    plan_name: Mapped[str] = mapped_column(String(255), nullable=False)
+    term_months: Mapped[int | None] = mapped_column(Integer)
+    rate_cents_kwh: Mapped[float | None] = mapped_column(Float)
+    base_fee: Mapped[float | None] = mapped_column(Float)
+    cancellation_fee: Mapped[float | None] = mapped_column(Float)
+    observed_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+
+
+class PlanBenchmark(Base):
+    """Cheapest plan of a provider at one usage level, refreshed on every scrape commit."""
+
+    __tablename__ = "plan_benchmarks"
+
+    provider_id: Mapped[int] = mapped_column(ForeignKey("providers.id"), primary_key=True)
+    usage_kwh: Mapped[int] = mapped_column(Integer, primary_key=True)
+    plan_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    monthly_cost: Mapped[float] = mapped_column(Float, nullable=False)
+
+
+class DataGeneration(Base):
+    """Single-row counter bumped whenever a scrape commits new plan data."""
+
+    __tablename__ = "data_generation"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    value: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+
+class ScrapeJob(Base):
+    """A background scrape requested through ``POST /scrape`` or the scheduler."""
+
+    __tablename__ = "scrape_jobs"
+
+    id: Mapped[str] = mapped_column(String(32), primary_key=True)
+    status: Mapped[str] = mapped_column(String(20), nullable=False, default="queued", index=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, default=datetime.utcnow)
+    started_at: Mapped[datetime | None] = mapped_column(DateTime)
+    finished_at: Mapped[datetime | None] = mapped_column(DateTime)
+
+    providers: Mapped[List["ScrapeJobProvider"]] = relationship(
+        back_populates="job",
+        cascade="all, delete-orphan",
+        order_by="ScrapeJobProvider.position",
+    )
+
+
+class ScrapeJobProvider(Base):
+    """Progress of one provider within a scrape job."""
+
+    __tablename__ = "scrape_job_providers"
+
+    job_id: Mapped[str] = mapped_column(ForeignKey("scrape_jobs.id"), primary_key=True)
+    provider: Mapped[str] = mapped_column(String(100), primary_key=True)
+    position: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    status: Mapped[str] = mapped_column(String(20), nullable=False, default="queued")
+    plans: Mapped[List[str]] = mapped_column(JSON, nullable=False, default=list)
+    error: Mapped[str | None] = mapped_column(Text)
+    duration_seconds: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+    circuit: Mapped[str | None] = mapped_column(String(20))
+
+    job: Mapped[ScrapeJob] = relationship(back_populates="providers")
+
+
+class Lease(Base):
+    """A named, expiring claim on shared work held by one API replica.
+
+    Scheduling leases also record the provider's current adaptive interval, so
+    any replica picking up the schedule continues from it.
+    """
+
+    __tablename__ = "leases"
+
+    name: Mapped[str] = mapped_column(String(200), primary_key=True)
+    holder: Mapped[str] = mapped_column(String(200), nullable=False)
+    expires_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    interval_minutes: Mapped[float | None] = mapped_column(Float)
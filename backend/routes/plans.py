@@ -1,66 +1,302 @@
-from typing import Sequence
+import base64
+import csv
+import io
+import json
+from datetime import datetime
+from typing import AsyncIterator, List, Sequence
 
-from fastapi import APIRouter, Depends, HTTPException, status
+import numpy as np
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from .. import crud, models, schemas
-from ..database import get_session
+from .. import costs, crud, models, schemas, serializers
+from ..cache import cached_response
+from ..database import AsyncSessionLocal, get_session
 
 router = APIRouter(prefix="/plans", tags=["plans"])
 
 
 BENCHMARK_PROVIDER_SLUG = "txu"
 BENCHMARK_USAGE_KWH = 1000
+BENCHMARK_DESCRIPTION = "Provider slug whose cheapest plan is used as the savings benchmark."
+MAX_USAGE_KWH = 100_000
+MAX_USAGE_POINTS = 2_001
+EXPORT_BATCH_SIZE = 1000
 
-
-def _select_benchmark_plan(
-    plans: Sequence[models.Plan], usage_kwh: float
-) -> models.Plan | None:
-    eligible = [plan for plan in plans if plan.rate_cents_kwh is not None]
-    if not eligible:
-        return None
-    return min(eligible, key=lambda candidate: candidate.cost_for_usage(usage_kwh))
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
 
 
-def _benchmark_against_txu(
-    plan: models.Plan, txu_plan: models.Plan, usage_kwh: float
+def _savings_against_benchmark(
+    plan: models.Plan, benchmark_cost: float | None, usage_kwh: float
 ) -> float | None:
-    if plan.rate_cents_kwh is None or txu_plan.rate_cents_kwh is None:
+    if plan.rate_cents_kwh is None or benchmark_cost is None:
         return None
-    return txu_plan.cost_for_usage(usage_kwh) - plan.cost_for_usage(usage_kwh)
+    return benchmark_cost - plan.cost_for_usage(usage_kwh)
+
+
+def _with_savings(
+    plan: models.Plan, benchmark: str, usage_kwh: int, benchmark_cost: float | None
+) -> schemas.PlanRead:
+    savings = _savings_against_benchmark(plan, benchmark_cost, usage_kwh)
+    update = {
+        "benchmark_provider": benchmark,
+        "benchmark_usage_kwh": usage_kwh,
+        "estimated_savings": savings,
+    }
+    if benchmark == BENCHMARK_PROVIDER_SLUG:
+        update["estimated_savings_vs_txu"] = savings
+    plan_read = schemas.PlanRead.model_validate(plan, from_attributes=True)
+    return plan_read.model_copy(update=update)
+
+
+def _encode_cursor(sort: str, values: Sequence[object]) -> str:
+    payload = json.dumps({"sort": sort, "values": list(values)}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def _decode_cursor(cursor: str, sort: str) -> list:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        values = payload["values"]
+    except (ValueError, KeyError, TypeError) as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor") from exc
+    expected = len(crud.PLAN_SORT_COLUMNS[sort.lstrip("-")]) + 1
+    if payload.get("sort") != sort or not isinstance(values, list) or len(values) != expected:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cursor does not match the requested sort order",
+        )
+    return values
 
 
 @router.get("", response_model=Sequence[schemas.PlanRead])
-async def list_plans(session: AsyncSession = Depends(get_session)):
-    plans = await crud.list_plans(session)
-    txu_plans = [
-        plan
-        for plan in plans
-        if plan.provider and plan.provider.slug == BENCHMARK_PROVIDER_SLUG
-    ]
-    benchmark = _select_benchmark_plan(txu_plans, BENCHMARK_USAGE_KWH)
-
-    enriched: list[schemas.PlanRead] = []
-    for plan in plans:
-        savings = (
-            _benchmark_against_txu(plan, benchmark, BENCHMARK_USAGE_KWH)
-            if benchmark
-            else None
+async def list_plans(
+    request: Request,
+    provider: List[str] = Query([], description="Provider slug; repeat to match several."),
+    provider_id: List[int] = Query([], description="Provider id; repeat to match several."),
+    term: List[int] = Query([], description="Exact term in months; repeat to match several."),
+    min_term: int | None = Query(None, ge=0),
+    max_term: int | None = Query(None, ge=0),
+    max_rate: float | None = Query(None, ge=0, description="Maximum rate in cents per kWh"),
+    min_renewable: int | None = Query(None, ge=0, le=100),
+    sort: str = Query(
+        "rate_cents_kwh",
+        pattern="^-?(rate_cents_kwh|term_months)$",
+        description="Sort key; prefix with '-' for descending order.",
+    ),
+    limit: int | None = Query(
+        None,
+        ge=1,
+        le=MAX_PAGE_SIZE,
+        description=f"Page size; without limit or cursor every matching plan is returned. "
+        f"Defaults to {DEFAULT_PAGE_SIZE} when following a cursor.",
+    ),
+    cursor: str | None = Query(None, description="Opaque cursor from the X-Next-Cursor header."),
+    benchmark: str = Query(BENCHMARK_PROVIDER_SLUG, description=BENCHMARK_DESCRIPTION),
+    usage_kwh: int = Query(BENCHMARK_USAGE_KWH, ge=0, le=MAX_USAGE_KWH),
+    session: AsyncSession = Depends(get_session),
+):
+    # Clients that predate pagination send neither parameter and expect the whole list.
+    if limit is None and cursor is not None:
+        limit = DEFAULT_PAGE_SIZE
+    filters = crud.PlanFilters(
+        provider_ids=provider_id,
+        provider_slugs=provider,
+        terms=term,
+        min_term=min_term,
+        max_term=max_term,
+        max_rate=max_rate,
+        min_renewable=min_renewable,
+    )
+    descending = sort.startswith("-")
+    sort_key = sort.lstrip("-")
+    after = _decode_cursor(cursor, sort) if cursor else None
+
+    async def build():
+        rows = await crud.list_plan_rows(
+            session,
+            filters,
+            sort=sort_key,
+            descending=descending,
+            after=after,
+            limit=None if limit is None else limit + 1,
+        )
+        plans = rows[:limit]
+        headers = {}
+        if limit is not None and len(rows) > limit:
+            next_cursor = _encode_cursor(sort, crud.plan_sort_values(plans[-1], sort_key))
+            next_url = request.url.include_query_params(cursor=next_cursor)
+            headers = {"X-Next-Cursor": next_cursor, "Link": f'<{next_url}>; rel="next"'}
+
+        benchmark_cost = await crud.get_benchmark_cost(session, benchmark, usage_kwh)
+        body = serializers.render_plans(
+            plans,
+            benchmark=benchmark,
+            usage_kwh=usage_kwh,
+            benchmark_cost=benchmark_cost,
+            txu_slug=BENCHMARK_PROVIDER_SLUG,
+        )
+        return body, headers
+
+    return await cached_response(request, session, build)
+
+
+@router.get("/cost-curves", response_model=schemas.CostCurvesRead)
+async def plan_cost_curves(
+    request: Request,
+    provider: List[str] = Query([], description="Provider slug; repeat to match several."),
+    start_kwh: float = Query(0, ge=0),
+    stop_kwh: float = Query(5000, gt=0, le=MAX_USAGE_KWH),
+    step_kwh: float = Query(50, gt=0),
+    benchmark: str = Query(BENCHMARK_PROVIDER_SLUG, description=BENCHMARK_DESCRIPTION),
+    session: AsyncSession = Depends(get_session),
+):
+    if stop_kwh < start_kwh:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="stop_kwh must be >= start_kwh"
+        )
+    if (stop_kwh - start_kwh) / step_kwh + 1 > MAX_USAGE_POINTS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Usage grid is limited to {MAX_USAGE_POINTS} points",
         )
-        plan_read = schemas.PlanRead.model_validate(plan, from_attributes=True)
-        enriched.append(plan_read.model_copy(update={"estimated_savings_vs_txu": savings}))
-    return enriched
+
+    async def build():
+        rows = await crud.get_plan_pricing(session)
+        arrays = costs.PlanArrays.from_rows(rows)
+        usage = costs.usage_grid(start_kwh, stop_kwh, step_kwh)
+        matrix = costs.cost_matrix(arrays, usage)
+
+        benchmark_mask = np.fromiter(
+            (row.provider_slug == benchmark for row in rows), dtype=bool, count=len(rows)
+        )
+        benchmark_curve = costs.lower_envelope(matrix, benchmark_mask)
+
+        selected = np.arange(len(rows))
+        if provider:
+            wanted = set(provider)
+            selected = selected[
+                np.fromiter((row.provider_slug in wanted for row in rows), dtype=bool, count=len(rows))
+            ]
+        crossovers = (
+            costs.crossover_points(matrix[selected], benchmark_curve, usage)
+            if benchmark_curve is not None
+            else [[] for _ in selected]
+        )
+
+        rounded = np.round(matrix[selected], 2).tolist()
+        payload = {
+            "usage_kwh": usage.tolist(),
+            "benchmark_provider": benchmark,
+            "benchmark_costs": (
+                np.round(benchmark_curve, 2).tolist() if benchmark_curve is not None else None
+            ),
+            "plans": [
+                {
+                    "plan_id": rows[index].id,
+                    "provider_id": rows[index].provider_id,
+                    "name": rows[index].name,
+                    "costs": plan_costs,
+                    "crossovers_kwh": np.round(points, 1).tolist(),
+                }
+                for index, plan_costs, points in zip(selected.tolist(), rounded, crossovers)
+            ],
+        }
+        return json.dumps(payload, separators=(",", ":")).encode("utf-8"), {}
+
+    return await cached_response(request, session, build)
+
+
+@router.get("/export")
+async def export_plans(
+    export_format: str = Query("ndjson", alias="format", pattern="^(ndjson|csv)$"),
+    provider: List[str] = Query([], description="Provider slug; repeat to match several."),
+    benchmark: str = Query(BENCHMARK_PROVIDER_SLUG, description=BENCHMARK_DESCRIPTION),
+    usage_kwh: int = Query(BENCHMARK_USAGE_KWH, ge=0, le=MAX_USAGE_KWH),
+):
+    """Stream the full current catalog as NDJSON or CSV without buffering it."""
+
+    filters = crud.PlanFilters(provider_slugs=provider)
+
+    async def stream_rows() -> AsyncIterator[bytes]:
+        async with AsyncSessionLocal() as session:
+            benchmark_cost = await crud.get_benchmark_cost(session, benchmark, usage_kwh)
+            result = await crud.stream_plan_rows(session, filters, batch_size=EXPORT_BATCH_SIZE)
+
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            if export_format == "csv":
+                writer.writerow(serializers.PLAN_EXPORT_FIELDS)
+                yield buffer.getvalue().encode("utf-8")
+
+            async for batch in result.partitions():
+                records = serializers.plan_records(
+                    batch,
+                    benchmark=benchmark,
+                    usage_kwh=usage_kwh,
+                    benchmark_cost=benchmark_cost,
+                    txu_slug=BENCHMARK_PROVIDER_SLUG,
+                )
+                if export_format == "csv":
+                    buffer.seek(0)
+                    buffer.truncate()
+                    serializers.write_csv_rows(writer, records)
+                    yield buffer.getvalue().encode("utf-8")
+                else:
+                    yield b"".join(serializers.dumps(record) + b"\n" for record in records)
+
+    media_type = "text/csv" if export_format == "csv" else "application/x-ndjson"
+    return StreamingResponse(
+        stream_rows(),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="plans.{export_format}"'},
+    )
 
 
 @router.get("/{plan_id}", response_model=schemas.PlanRead)
-async def read_plan(plan_id: int, session: AsyncSession = Depends(get_session)):
-    plan = await crud.get_plan(session, plan_id)
+async def read_plan(
+    request: Request,
+    plan_id: int,
+    benchmark: str = Query(BENCHMARK_PROVIDER_SLUG, description=BENCHMARK_DESCRIPTION),
+    usage_kwh: int = Query(BENCHMARK_USAGE_KWH, ge=0, le=MAX_USAGE_KWH),
+    session: AsyncSession = Depends(get_session),
+):
+    async def build():
+        plan = await crud.get_plan(session, plan_id)
+        if not plan:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Plan not found")
+        benchmark_cost = await crud.get_benchmark_cost(session, benchmark, usage_kwh)
+        return _with_savings(plan, benchmark, usage_kwh, benchmark_cost).model_dump_json().encode(), {}
+
+    return await cached_response(request, session, build)
+
+
+@router.get("/{plan_id}/history", response_model=Sequence[schemas.PlanPriceHistoryRead])
+async def read_plan_history(
+    plan_id: int,
+    start: datetime | None = Query(None, alias="from"),
+    end: datetime | None = Query(None, alias="to"),
+    session: AsyncSession = Depends(get_session),
+):
+    # Superseded plan versions share their history with the current version.
+    plan = await crud.get_plan(session, plan_id, current_only=False)
     if not plan:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Plan not found")
-    txu_plans = await crud.get_plans_by_provider_slug(session, BENCHMARK_PROVIDER_SLUG)
-    benchmark = _select_benchmark_plan(txu_plans, BENCHMARK_USAGE_KWH)
-    savings = (
-        _benchmark_against_txu(plan, benchmark, BENCHMARK_USAGE_KWH) if benchmark else None
-    )
-    plan_read = schemas.PlanRead.model_validate(plan, from_attributes=True)
-    return plan_read.model_copy(update={"estimated_savings_vs_txu": savings})
+
+    async def stream_rows() -> AsyncIterator[str]:
+        # The request-scoped session is closed before the body is sent, so the
+        # stream runs on its own session.
+        async with AsyncSessionLocal() as stream_session:
+            rows = await crud.stream_price_history(stream_session, plan, start, end)
+            yield "["
+            separator = ""
+            async for row in rows:
+                entry = schemas.PlanPriceHistoryRead.model_validate(row)
+                yield separator + entry.model_dump_json()
+                separator = ","
+            yield "]"
+
+    return StreamingResponse(stream_rows(), media_type="application/json")
@@ -1,15 +1,55 @@
-from typing import Sequence
+from typing import List, Sequence
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from pydantic import TypeAdapter
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from .. import crud, schemas
+from ..cache import cached_response
+from ..config import get_settings
 from ..database import get_session
+from ..deps import verify_api_key
 
 router = APIRouter(prefix="/providers", tags=["providers"])
 
+_PROVIDER_LIST = TypeAdapter(List[schemas.ProviderRead])
+
 
 @router.get("", response_model=Sequence[schemas.ProviderRead])
-async def list_providers(session: AsyncSession = Depends(get_session)):
-    providers = await crud.get_providers(session)
-    return providers
+async def list_providers(request: Request, session: AsyncSession = Depends(get_session)):
+    async def build():
+        providers = await crud.get_providers(session)
+        validated = _PROVIDER_LIST.validate_python(providers, from_attributes=True)
+        return _PROVIDER_LIST.dump_json(validated), {}
+
+    return await cached_response(request, session, build)
+
+
+@router.post(
+    "/{slug}/generations/{generation}/activate",
+    dependencies=[Depends(verify_api_key)],
+)
+async def activate_provider_generation(
+    slug: str, generation: int, session: AsyncSession = Depends(get_session)
+):
+    """Switch a provider's live plans to another retained generation (e.g. roll back)."""
+
+    settings = get_settings()
+    provider = await crud.get_provider_by_slug(session, slug)
+    if not provider:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Provider not found")
+
+    try:
+        await crud.activate_generation(
+            session,
+            provider,
+            generation,
+            retain_generations=settings.plan_generations_retained,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+
+    await crud.refresh_benchmarks(session, provider, settings.benchmark_usage_levels)
+    await crud.bump_data_generation(session)
+    await session.commit()
+    return {"provider": provider.slug, "current_generation": provider.current_generation}
@@ -1,23 +1,169 @@
 from __future__ import annotations
 
+import random
+from dataclasses import dataclass
+from datetime import datetime, timedelta
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
+from apscheduler.triggers.date import DateTrigger
 from apscheduler.triggers.interval import IntervalTrigger
 from loguru import logger
-from sqlalchemy.ext.asyncio import AsyncSession
 
+from . import crud, models
 from .config import get_settings
 from .database import AsyncSessionLocal
-from .scrapers.runner import initialize_database, run_scraper
+from .jobs import job_runner
 
 scheduler: AsyncIOScheduler | None = None
 
 
-async def run_all_scrapers() -> None:
+@dataclass
+class ProviderSchedule:
+    """Adaptive polling interval of one provider.
+
+    A scrape that finds new plan data drops the interval to the minimum so
+    follow-up changes are caught quickly; every unchanged scrape multiplies it
+    by ``backoff_factor`` up to the maximum. Failures keep the current interval.
+    """
+
+    slug: str
+    interval_minutes: float
+    min_interval_minutes: float
+    max_interval_minutes: float
+    backoff_factor: float = 2.0
+
+    def record(self, status: str | None) -> float:
+        if status == "ok":
+            self.interval_minutes = self.min_interval_minutes
+        elif status == "unchanged":
+            self.interval_minutes = min(
+                self.interval_minutes * self.backoff_factor, self.max_interval_minutes
+            )
+        self.interval_minutes = max(
+            self.min_interval_minutes, min(self.interval_minutes, self.max_interval_minutes)
+        )
+        return self.interval_minutes
+
+
+def jittered_seconds(minutes: float, jitter_fraction: float, rng: random.Random = random) -> float:
+    """``minutes`` in seconds, spread by up to ``jitter_fraction`` either way."""
+
+    return minutes * 60 * (1 + rng.uniform(-jitter_fraction, jitter_fraction))
+
+
+def provider_schedule(slug: str, lease: models.Lease | None = None) -> ProviderSchedule:
+    """Schedule of ``slug``, continuing from the interval recorded on its lease."""
+
+    settings = get_settings()
+    interval = settings.scrape_provider_intervals.get(slug, settings.scrape_interval_minutes)
+    if lease is not None and lease.interval_minutes is not None:
+        interval = lease.interval_minutes
+    schedule = ProviderSchedule(
+        slug=slug,
+        interval_minutes=interval,
+        min_interval_minutes=settings.scrape_min_interval_minutes,
+        max_interval_minutes=settings.scrape_max_interval_minutes,
+        backoff_factor=settings.scrape_backoff_factor,
+    )
+    schedule.record(None)  # clamp the interval into the configured bounds
+    return schedule
+
+
+def _until_expiry(lease: models.Lease) -> float:
+    """Seconds until ``lease`` runs out, plus jitter so replicas do not race for it."""
+
+    settings = get_settings()
+    remaining = (lease.expires_at - datetime.utcnow()).total_seconds()
+    return max(remaining, 0.0) + random.uniform(
+        0, settings.scrape_jitter_fraction * settings.scrape_min_interval_minutes * 60
+    )
+
+
+async def scrape_provider_on_schedule(slug: str) -> float:
+    """Run one scheduled scrape of ``slug`` and return the delay until the next one.
+
+    The provider's lease doubles as the cluster-wide schedule. The replica that
+    claims it scrapes and then extends the lease by the provider's new interval,
+    which is stored on the lease so the schedule survives restarts and
+    failover. Replicas that find it held wait until it expires. Leases of a
+    replica that dies simply run out.
+    """
+
     settings = get_settings()
+    lease_name = crud.provider_lease_name(slug)
+
+    async with AsyncSessionLocal() as session:
+        schedule = provider_schedule(slug, await crud.get_lease(session, lease_name))
+        claimed = await crud.acquire_lease(
+            session,
+            lease_name,
+            settings.instance_id,
+            schedule.interval_minutes * 60,
+            interval_minutes=schedule.interval_minutes,
+        )
+        lease = None if claimed else await crud.get_lease(session, lease_name)
+        await session.commit()
+    if lease is not None:
+        logger.info("Provider {slug} is scheduled by {holder}", slug=slug, holder=lease.holder)
+        return _until_expiry(lease)
+
+    status = None
+    # Going through the job runner lets scheduled and manual scrapes share de-duplication.
+    submitted = await job_runner.submit([slug])
+    if submitted.providers:
+        job = await job_runner.wait(submitted.job_id)
+        status = job.providers[0].status
+        logger.info(
+            "Scraper for {slug} finished with status {status} in {duration:.2f}s",
+            slug=slug,
+            status=status,
+            duration=job.providers[0].duration_seconds,
+        )
+    else:
+        logger.info(
+            "Scraper for {slug} already running in job {job_id}", slug=slug, job_id=submitted.job_id
+        )
+
+    interval = schedule.record(status)
     async with AsyncSessionLocal() as session:
-        for slug in settings.scrape_providers:
-            logger.info("Running scraper for {slug}", slug=slug)
-            await run_scraper(session, slug)
+        await crud.acquire_lease(
+            session, lease_name, settings.instance_id, interval * 60, interval_minutes=interval
+        )
+        await session.commit()
+    logger.info("Next scrape of {slug} in about {minutes:.0f} minutes", slug=slug, minutes=interval)
+    return jittered_seconds(interval, settings.scrape_jitter_fraction)
+
+
+def _schedule_provider(slug: str, delay_seconds: float) -> None:
+    if scheduler is None:
+        return
+    scheduler.add_job(
+        _run_scheduled_scrape,
+        trigger=DateTrigger(run_date=datetime.now() + timedelta(seconds=delay_seconds)),
+        args=[slug],
+        id=f"scrape:{slug}",
+        replace_existing=True,
+    )
+
+
+async def _run_scheduled_scrape(slug: str) -> None:
+    delay = None
+    try:
+        delay = await scrape_provider_on_schedule(slug)
+    except Exception:
+        logger.exception("Scheduled scrape of {slug} failed", slug=slug)
+    finally:
+        if delay is None:
+            delay = jittered_seconds(
+                provider_schedule(slug).interval_minutes, get_settings().scrape_jitter_fraction
+            )
+        _schedule_provider(slug, delay)
+
+
+async def _resume_scrape_jobs() -> None:
+    try:
+        await job_runner.resume()
+    except Exception:
+        logger.exception("Resuming orphaned scrape jobs failed")
 
 
 async def schedule_jobs() -> None:
@@ -26,16 +172,28 @@ async def schedule_jobs() -> None:
     if not settings.scheduler_enabled:
         return
 
-    await initialize_database()
-
     scheduler = AsyncIOScheduler()
+    scheduler.start()
+    # Pick up jobs of replicas that died once their lease has had time to expire.
     scheduler.add_job(
-        run_all_scrapers,
-        trigger=IntervalTrigger(minutes=settings.scrape_interval_minutes),
-        id="scrape-job",
+        _resume_scrape_jobs,
+        trigger=IntervalTrigger(seconds=settings.scrape_job_lease_seconds),
+        id="resume-scrape-jobs",
         replace_existing=True,
     )
-    scheduler.start()
+    async with AsyncSessionLocal() as session:
+        leases = {
+            slug: await crud.get_lease(session, crud.provider_lease_name(slug))
+            for slug in settings.scrape_providers
+        }
+    for slug, lease in leases.items():
+        if lease is not None:
+            # Pick the schedule up where the cluster left it.
+            _schedule_provider(slug, _until_expiry(lease))
+            continue
+        # Jitter spreads the first runs so providers are not all fetched at once.
+        interval = provider_schedule(slug).interval_minutes
+        _schedule_provider(slug, jittered_seconds(interval, settings.scrape_jitter_fraction))
 
 
 async def shutdown_scheduler() -> None:
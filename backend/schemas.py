@@ -35,10 +35,49 @@ class PlanRead(PlanBase):
     estimated_savings_vs_txu: Optional[float] = Field(
         default=None, description="Estimated monthly savings compared to TXU"
     )
+    benchmark_provider: Optional[str] = Field(
+        default=None, description="Provider slug the savings estimate is compared against"
+    )
+    benchmark_usage_kwh: Optional[int] = Field(
+        default=None, description="Monthly usage (kWh) used for the savings estimate"
+    )
+    estimated_savings: Optional[float] = Field(
+        default=None,
+        description="Estimated monthly savings versus the benchmark provider's cheapest plan",
+    )
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class PlanPriceHistoryRead(BaseModel):
+    observed_at: datetime
+    rate_cents_kwh: Optional[float] = None
+    base_fee: Optional[float] = None
+    cancellation_fee: Optional[float] = None
 
     model_config = ConfigDict(from_attributes=True)
 
 
+class PlanCostCurve(BaseModel):
+    plan_id: int
+    provider_id: int
+    name: str
+    costs: List[float] = Field(description="Monthly cost at each usage point")
+    crossovers_kwh: List[float] = Field(
+        default_factory=list,
+        description="Usage levels where this plan's cost crosses the benchmark curve",
+    )
+
+
+class CostCurvesRead(BaseModel):
+    usage_kwh: List[float]
+    benchmark_provider: str
+    benchmark_costs: Optional[List[float]] = Field(
+        default=None, description="Cheapest benchmark-provider cost at each usage point"
+    )
+    plans: List[PlanCostCurve] = Field(default_factory=list)
+
+
 class ProviderBase(BaseModel):
     name: str
     slug: str
@@ -55,3 +94,29 @@ class ProviderRead(ProviderBase):
     plans: List[PlanRead] = Field(default_factory=list)
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class ScrapeJobProviderRead(BaseModel):
+    provider: str
+    status: str
+    plans: List[str] = Field(default_factory=list)
+    error: Optional[str] = None
+    duration_seconds: float = 0.0
+    circuit: Optional[str] = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class ScrapeJobRead(BaseModel):
+    id: str
+    status: str
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    results: List[ScrapeJobProviderRead] = Field(
+        default_factory=list,
+        validation_alias="providers",
+        description="Per-provider progress in the order the providers were requested",
+    )
+
+    model_config = ConfigDict(from_attributes=True)
@@ -3,10 +3,12 @@ from __future__ import annotations
 from dataclasses import dataclass
 from typing import Iterable, List
 
-import requests
-from bs4 import BeautifulSoup
-
 from .. import schemas
+from ..config import get_settings
+from ..metrics import SCRAPE_FETCH_SECONDS, SCRAPE_PARSE_SECONDS
+from .executor import parse_off_loop
+from .fetch import FetchResponse, HttpFetcher, get_fetcher
+from .parsers import Node, parse_html
 
 
 @dataclass
@@ -14,18 +16,79 @@ class ScrapeResult:
     provider: schemas.ProviderCreate
     plans: List[schemas.PlanCreate]
 
+    @classmethod
+    def from_records(cls, records: dict) -> "ScrapeResult":
+        # Records were validated by the parser that produced them.
+        return cls(
+            provider=schemas.ProviderCreate.model_construct(**records["provider"]),
+            plans=[schemas.PlanCreate.model_construct(**plan) for plan in records["plans"]],
+        )
+
 
 class BaseScraper:
-    """Common scraper utilities."""
+    """Common scraper utilities.
+
+    Scrapers with a page URL (the ``SCRAPE_SOURCE_URLS`` entry for their slug,
+    else ``source_url``) download it through the shared :class:`HttpFetcher`;
+    the others parse their bundled sample markup.
+    ``parser_backend`` selects the HTML parser (see
+    :mod:`backend.scrapers.parsers`); ``None`` uses the ``HTML_PARSER`` setting.
+    """
 
     provider_slug: str
+    source_url: str | None = None
+    parser_backend: str | None = None
+
+    def __init__(
+        self, fetcher: HttpFetcher | None = None, parser_backend: str | None = None
+    ) -> None:
+        self.fetcher = fetcher
+        if parser_backend is not None:
+            self.parser_backend = parser_backend
+
+    @classmethod
+    def page_url(cls) -> str | None:
+        return get_settings().scrape_source_urls.get(cls.provider_slug, cls.source_url)
+
+    def document(self, html: str) -> Node:
+        return parse_html(html, self.parser_backend or get_settings().html_parser)
+
+    async def fetch_html(self, url: str) -> FetchResponse:
+        return await (self.fetcher or get_fetcher()).fetch(url)
+
+    async def scrape(self) -> ScrapeResult | None:
+        """Fetch and parse the provider page, or return ``None`` if it is unchanged."""
+
+        url = self.page_url()
+        if url is None:
+            with SCRAPE_PARSE_SECONDS.time(self.provider_slug):
+                return await self.parse_off_loop(None)
+
+        with SCRAPE_FETCH_SECONDS.time(self.provider_slug):
+            response = await self.fetch_html(url)
+        if response.not_modified:
+            return None
+        # The page's validators stay pending until confirm_fetch(), so a parse or
+        # persist failure makes the next run download the page again.
+        with SCRAPE_PARSE_SECONDS.time(self.provider_slug):
+            return await self.parse_off_loop(response.text)
+
+    def confirm_fetch(self) -> None:
+        """Mark the last downloaded page as stored so later fetches may be conditional."""
+
+        url = self.page_url()
+        if url is not None:
+            (self.fetcher or get_fetcher()).confirm(url)
+
+    async def parse_off_loop(self, html: str | None) -> ScrapeResult:
+        """Parse on the shared parse executor instead of the event loop."""
 
-    def fetch_html(self, url: str) -> BeautifulSoup:
-        response = requests.get(url, timeout=30)
-        response.raise_for_status()
-        return BeautifulSoup(response.text, "html.parser")
+        records = await parse_off_loop(
+            type(self), html, self.parser_backend or get_settings().html_parser
+        )
+        return ScrapeResult.from_records(records)
 
-    def parse(self) -> ScrapeResult:  # pragma: no cover - to be implemented by subclasses
+    def parse(self, html: str | None = None) -> ScrapeResult:  # pragma: no cover - to be implemented by subclasses
         raise NotImplementedError
 
 
@@ -39,8 +102,8 @@ def normalize_rate(value: str) -> float | None:
         return None
 
 
-def text_or_none(element) -> str | None:
+def text_or_none(element: Node | None) -> str | None:
     if element is None:
         return None
-    text = element.get_text(strip=True)
+    text = element.text()
     return text or None
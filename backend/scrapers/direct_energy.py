@@ -1,7 +1,5 @@
 from __future__ import annotations
 
-from bs4 import BeautifulSoup
-
 from .. import schemas
 from .base import BaseScraper, ScrapeResult
 
@@ -20,10 +18,10 @@ _SAMPLE_HTML = """
 class DirectEnergyScraper(BaseScraper):
     provider_slug = "direct_energy"
 
-    def parse(self) -> ScrapeResult:
-        soup = BeautifulSoup(_SAMPLE_HTML, "html.parser")
+    def parse(self, html: str | None = None) -> ScrapeResult:
+        document = self.document(html if html is not None else _SAMPLE_HTML)
         plans = []
-        for slide in soup.select(".carousel .slide"):
+        for slide in document.select(".carousel .slide"):
             plans.append(
                 schemas.PlanCreate(
                     provider_id=0,
@@ -33,7 +31,7 @@ class DirectEnergyScraper(BaseScraper):
                     base_fee=float(slide["data-base"]),
                     cancellation_fee=float(slide["data-cancel"]),
                     renewable_percentage=int(slide["data-renewable"]),
-                    features=slide.get_text(strip=True),
+                    features=slide.text(),
                     url="https://www.directenergy.com/texas"
                 )
             )
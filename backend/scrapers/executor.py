@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import asyncio
+import multiprocessing
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import TYPE_CHECKING, Type
+
+from ..config import get_settings
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .base import BaseScraper
+
+PARSE_EXECUTORS = ("process", "thread", "inline")
+
+_executor: Executor | None = None
+
+
+def _create_executor() -> Executor | None:
+    settings = get_settings()
+    kind = settings.parse_executor
+    if kind not in PARSE_EXECUTORS:
+        raise ValueError(f"Unknown parse executor {kind!r}; expected one of {', '.join(PARSE_EXECUTORS)}")
+    workers = settings.parse_workers or None
+    if kind == "process":
+        # Spawned workers do not inherit the event loop, database engine or open sockets.
+        return ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+    if kind == "thread":
+        return ThreadPoolExecutor(max_workers=workers, thread_name_prefix="scraper-parse")
+    return None
+
+
+def get_parse_executor() -> Executor | None:
+    """Return the shared parse executor, or ``None`` when parsing runs inline."""
+
+    global _executor
+    if _executor is None:
+        _executor = _create_executor()
+    return _executor
+
+
+def shutdown_parse_executor() -> None:
+    global _executor
+    executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def parse_to_records(
+    scraper_cls: Type["BaseScraper"], html: str | None, parser_backend: str | None
+) -> dict:
+    """Parse ``html`` and return the result as plain dicts (runs inside the pool)."""
+
+    scraper = scraper_cls(parser_backend=parser_backend)
+    result = scraper.parse() if html is None else scraper.parse(html)
+    return {
+        "provider": result.provider.model_dump(),
+        "plans": [plan.model_dump() for plan in result.plans],
+    }
+
+
+async def parse_off_loop(
+    scraper_cls: Type["BaseScraper"], html: str | None, parser_backend: str | None = None
+) -> dict:
+    """Run ``scraper_cls.parse`` on the parse executor and return its plain records.
+
+    Scrapers are rebuilt from their class in the worker, so ``parse`` may only
+    depend on the HTML and class attributes, and with the process executor the
+    class must be importable by module and qualified name.
+    """
+
+    executor = get_parse_executor()
+    loop = asyncio.get_running_loop()
+    if executor is None:
+        return parse_to_records(scraper_cls, html, parser_backend)
+    try:
+        return await loop.run_in_executor(executor, parse_to_records, scraper_cls, html, parser_backend)
+    except BrokenProcessPool:
+        # A crashed worker poisons the pool; start a fresh one for the next scrape.
+        if _executor is executor:
+            shutdown_parse_executor()
+        raise
@@ -0,0 +1,219 @@
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+from typing import Dict, Tuple
+from urllib.parse import urlsplit
+
+import httpx
+
+from ..config import get_settings
+from .policy import CLOSED, CircuitBreaker, HostPolicy, backoff_delay, is_retryable
+
+DEFAULT_HEADERS = {
+    "User-Agent": "SkywalkerEnergyBot/1.0 (+https://github.com/MarceloPreissler/Skywalker)",
+    "Accept": "text/html,application/xhtml+xml;q=0.9,*/*;q=0.8",
+    "Accept-Encoding": "gzip, deflate",
+}
+
+
+@dataclass
+class FetchResponse:
+    url: str
+    status_code: int
+    text: str | None = None
+    etag: str | None = None
+    last_modified: str | None = None
+
+    @property
+    def not_modified(self) -> bool:
+        return self.status_code == httpx.codes.NOT_MODIFIED
+
+
+class HttpFetcher:
+    """Async HTTP client shared by all scrapers.
+
+    Keeps one keep-alive connection pool per host and remembers the ``ETag`` /
+    ``Last-Modified`` validators of every page so repeat fetches are sent as
+    conditional requests and unchanged pages come back as bodiless 304s.
+    Validators of a freshly downloaded page stay pending until :meth:`confirm`
+    is called once its content has been stored; until then the page is
+    fetched unconditionally, so a failed save cannot turn into a 304 later.
+
+    Every host also gets a :class:`~backend.scrapers.policy.HostPolicy`: a cap
+    on concurrent requests, a minimum spacing between them, retries with
+    jittered exponential backoff on timeouts, transport errors, 5xx and 429, and
+    a circuit breaker that fails fast while the host is cooling off.
+    """
+
+    def __init__(
+        self,
+        *,
+        timeout: float | None = None,
+        max_connections_per_host: int | None = None,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ) -> None:
+        settings = get_settings()
+        self.timeout = timeout if timeout is not None else settings.http_timeout_seconds
+        self.max_connections_per_host = (
+            max_connections_per_host or settings.http_max_connections_per_host
+        )
+        self.max_retries = settings.http_max_retries
+        self.backoff_base_seconds = settings.http_backoff_base_seconds
+        self.backoff_max_seconds = settings.http_backoff_max_seconds
+        self.transport = transport
+        self._clients: Dict[str, httpx.AsyncClient] = {}
+        self._policies: Dict[str, HostPolicy] = {}
+        self._validators: Dict[str, Tuple[str | None, str | None]] = {}
+        self._pending: Dict[str, Tuple[str | None, str | None]] = {}
+
+    @staticmethod
+    def _origin(url: str) -> str:
+        parts = urlsplit(url)
+        return f"{parts.scheme}://{parts.netloc}"
+
+    def _client_for(self, origin: str) -> httpx.AsyncClient:
+        client = self._clients.get(origin)
+        if client is None:
+            client = httpx.AsyncClient(
+                headers=DEFAULT_HEADERS,
+                timeout=self.timeout,
+                follow_redirects=True,
+                limits=httpx.Limits(
+                    max_connections=self.max_connections_per_host,
+                    max_keepalive_connections=self.max_connections_per_host,
+                    keepalive_expiry=60.0,
+                ),
+                transport=self.transport,
+            )
+            self._clients[origin] = client
+        return client
+
+    def _policy_for(self, origin: str) -> HostPolicy:
+        policy = self._policies.get(origin)
+        if policy is None:
+            settings = get_settings()
+            policy = self._policies[origin] = HostPolicy(
+                max_concurrency=self.max_connections_per_host,
+                min_interval_seconds=settings.http_min_request_interval_seconds,
+                breaker=CircuitBreaker(
+                    failure_threshold=settings.http_breaker_failure_threshold,
+                    cooldown_seconds=settings.http_breaker_cooldown_seconds,
+                ),
+            )
+        return policy
+
+    def breaker_state(self, url: str) -> str | None:
+        """Circuit state of ``url``'s host, or ``None`` if it was never fetched."""
+
+        policy = self._policies.get(self._origin(url))
+        return policy.breaker.state if policy is not None else None
+
+    async def _send(self, url: str, headers: Dict[str, str]) -> httpx.Response:
+        origin = self._origin(url)
+        client = self._client_for(origin)
+        policy = self._policy_for(origin)
+        attempt = 0
+        while True:
+            policy.breaker.before_request(origin)
+            recorded = False
+            try:
+                try:
+                    async with policy:
+                        response = await client.get(url, headers=headers)
+                    if response.status_code >= 500 or response.status_code == httpx.codes.TOO_MANY_REQUESTS:
+                        response.raise_for_status()
+                except Exception as exc:
+                    if not is_retryable(exc):
+                        raise
+                    policy.breaker.record_failure()
+                    recorded = True
+                    if attempt >= self.max_retries or policy.breaker.state != CLOSED:
+                        raise
+                    await asyncio.sleep(
+                        backoff_delay(attempt, self.backoff_base_seconds, self.backoff_max_seconds)
+                    )
+                    attempt += 1
+                    continue
+                # Any non-5xx answer shows the host is up, even a 404.
+                policy.breaker.record_success()
+                recorded = True
+                return response
+            finally:
+                if not recorded:
+                    # Cancelled (e.g. by a scrape timeout) or failed unexpectedly: without an
+                    # outcome a half-open trial would otherwise block the host for good.
+                    policy.breaker.record_failure()
+
+    async def fetch(self, url: str, *, conditional: bool = True) -> FetchResponse:
+        headers: Dict[str, str] = {}
+        if conditional and url in self._validators:
+            etag, last_modified = self._validators[url]
+            if etag:
+                headers["If-None-Match"] = etag
+            if last_modified:
+                headers["If-Modified-Since"] = last_modified
+
+        response = await self._send(url, headers)
+        if response.status_code == httpx.codes.NOT_MODIFIED:
+            etag, last_modified = self._validators.get(url, (None, None))
+            return FetchResponse(
+                url=url,
+                status_code=response.status_code,
+                etag=response.headers.get("ETag", etag),
+                last_modified=response.headers.get("Last-Modified", last_modified),
+            )
+
+        response.raise_for_status()
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        self._pending[url] = (etag, last_modified)
+        return FetchResponse(
+            url=url,
+            status_code=response.status_code,
+            text=response.text,
+            etag=etag,
+            last_modified=last_modified,
+        )
+
+    def confirm(self, url: str) -> None:
+        """Start sending the last downloaded validators of ``url`` with future fetches."""
+
+        if url not in self._pending:
+            return
+        etag, last_modified = self._pending.pop(url)
+        if etag or last_modified:
+            self._validators[url] = (etag, last_modified)
+        else:
+            self._validators.pop(url, None)
+
+    def forget(self, url: str) -> None:
+        """Drop stored validators so the next fetch of ``url`` is unconditional."""
+
+        self._validators.pop(url, None)
+        self._pending.pop(url, None)
+
+    async def aclose(self) -> None:
+        clients, self._clients = self._clients, {}
+        self._policies.clear()
+        for client in clients.values():
+            await client.aclose()
+
+
+_fetcher: HttpFetcher | None = None
+
+
+def get_fetcher() -> HttpFetcher:
+    """Return the process-wide fetcher, creating it on first use."""
+
+    global _fetcher
+    if _fetcher is None:
+        _fetcher = HttpFetcher()
+    return _fetcher
+
+
+async def close_fetcher() -> None:
+    global _fetcher
+    if _fetcher is not None:
+        await _fetcher.aclose()
+        _fetcher = None
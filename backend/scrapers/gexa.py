@@ -1,7 +1,5 @@
 from __future__ import annotations
 
-from bs4 import BeautifulSoup
-
 from .. import schemas
 from .base import BaseScraper, ScrapeResult
 
@@ -35,11 +33,11 @@ _SAMPLE_HTML = """
 class GexaScraper(BaseScraper):
     provider_slug = "gexa"
 
-    def parse(self) -> ScrapeResult:
-        soup = BeautifulSoup(_SAMPLE_HTML, "html.parser")
+    def parse(self, html: str | None = None) -> ScrapeResult:
+        document = self.document(html if html is not None else _SAMPLE_HTML)
         plans = []
-        for row in soup.select("#gexa-plans tr")[1:]:
-            cells = [col.get_text(strip=True) for col in row.find_all("td")]
+        for row in document.select("#gexa-plans tr")[1:]:
+            cells = [cell.text() for cell in row.select("td")]
             plans.append(
                 schemas.PlanCreate(
                     provider_id=0,
@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Awaitable, Callable, Iterable, List
+
+from loguru import logger
+
+from ..config import get_settings
+from ..database import AsyncSessionLocal
+from ..metrics import SCRAPE_RUNS
+from .fetch import get_fetcher
+from .policy import CircuitOpenError
+from .runner import SCRAPER_REGISTRY, run_scraper
+
+
+@dataclass
+class ProviderReport:
+    """Outcome of a single provider scrape within an orchestrated run."""
+
+    provider: str
+    status: str
+    plans: List[str] = field(default_factory=list)
+    error: str | None = None
+    duration_seconds: float = 0.0
+    # Circuit breaker state of the provider's host after the scrape, if it is fetched.
+    circuit: str | None = None
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+def validate_slugs(slugs: Iterable[str]) -> List[str]:
+    """Return the requested slugs, raising ``ValueError`` for unknown providers."""
+
+    requested = list(dict.fromkeys(slugs))
+    for slug in requested:
+        if slug not in SCRAPER_REGISTRY:
+            raise ValueError(f"Unknown provider slug: {slug}")
+    return requested
+
+
+def _circuit_state(slug: str) -> str | None:
+    url = SCRAPER_REGISTRY[slug].page_url()
+    return get_fetcher().breaker_state(url) if url else None
+
+
+async def _run_provider(
+    slug: str,
+    semaphore: asyncio.Semaphore,
+    timeout: float | None,
+    on_start: Callable[[str], Awaitable[None]] | None = None,
+) -> ProviderReport:
+    async with semaphore:
+        if on_start is not None:
+            await on_start(slug)
+        started = time.perf_counter()
+        # Each provider gets its own session so a failure only rolls back its own work.
+        async with AsyncSessionLocal() as session:
+            try:
+                result = await asyncio.wait_for(run_scraper(session, slug), timeout)
+            except asyncio.TimeoutError:
+                await session.rollback()
+                logger.warning("Scraper for {slug} timed out after {timeout}s", slug=slug, timeout=timeout)
+                return ProviderReport(
+                    provider=slug,
+                    status="timeout",
+                    error=f"Timed out after {timeout} seconds",
+                    duration_seconds=time.perf_counter() - started,
+                )
+            except CircuitOpenError as exc:
+                await session.rollback()
+                logger.warning("Skipping {slug}: {error}", slug=slug, error=exc)
+                return ProviderReport(
+                    provider=slug,
+                    status="circuit_open",
+                    error=str(exc),
+                    duration_seconds=time.perf_counter() - started,
+                )
+            except Exception as exc:
+                await session.rollback()
+                logger.exception("Scraper for {slug} failed", slug=slug)
+                return ProviderReport(
+                    provider=slug,
+                    status="error",
+                    error=str(exc),
+                    duration_seconds=time.perf_counter() - started,
+                )
+
+        if result is None:
+            return ProviderReport(
+                provider=slug,
+                status="unchanged",
+                duration_seconds=time.perf_counter() - started,
+            )
+        return ProviderReport(
+            provider=slug,
+            status="ok",
+            plans=[plan.name for plan in result.plans],
+            duration_seconds=time.perf_counter() - started,
+        )
+
+
+async def _scrape_provider(
+    slug: str,
+    semaphore: asyncio.Semaphore,
+    timeout: float | None,
+    on_start: Callable[[str], Awaitable[None]] | None = None,
+    on_report: Callable[[ProviderReport], Awaitable[None]] | None = None,
+) -> ProviderReport:
+    report = await _run_provider(slug, semaphore, timeout, on_start)
+    report.circuit = _circuit_state(slug)
+    SCRAPE_RUNS.inc(slug, report.status)
+    if on_report is not None:
+        await on_report(report)
+    return report
+
+
+async def run_scrapers(
+    slugs: Iterable[str] | None = None,
+    *,
+    concurrency: int | None = None,
+    timeout: float | None = None,
+    on_start: Callable[[str], Awaitable[None]] | None = None,
+    on_report: Callable[[ProviderReport], Awaitable[None]] | None = None,
+) -> List[ProviderReport]:
+    """Scrape providers concurrently and return one report per provider.
+
+    Failures and timeouts are captured in the report instead of being raised so
+    that one misbehaving provider cannot hold up or abort the others.
+    ``on_start`` and ``on_report`` are awaited as each provider starts and
+    finishes, which lets callers publish progress while the run is going.
+    """
+
+    settings = get_settings()
+    requested = validate_slugs(settings.scrape_providers if slugs is None else slugs)
+    limit = max(1, concurrency or settings.scrape_concurrency)
+    per_provider_timeout = timeout if timeout is not None else settings.scrape_timeout_seconds
+
+    semaphore = asyncio.Semaphore(limit)
+    return list(
+        await asyncio.gather(
+            *(
+                _scrape_provider(slug, semaphore, per_provider_timeout, on_start, on_report)
+                for slug in requested
+            )
+        )
+    )
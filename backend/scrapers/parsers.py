@@ -0,0 +1,187 @@
+"""Interchangeable HTML parser backends for the scrapers.
+
+Every backend exposes the same small node API (``select``, ``select_one``,
+``text``, ``attr``, ``parent``) so a scraper can switch between the C-backed
+parsers and BeautifulSoup without changing its extraction code:
+
+* ``selectolax`` - Lexbor HTML parser and CSS engine (fastest). selectolax
+  has no compiled selector objects, so Lexbor parses the selector string on
+  every ``select`` call.
+* ``lxml`` - libxml2 parser with selectors precompiled to XPath by ``cssselect``.
+* ``bs4`` - BeautifulSoup with selectors precompiled by ``soupsieve``; always
+  available and used as the fallback.
+
+``"auto"`` picks the fastest backend that is installed.
+"""
+
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional
+
+from bs4 import BeautifulSoup
+import soupsieve
+
+try:  # pragma: no cover - exercised implicitly depending on the environment
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:  # pragma: no cover
+    LexborHTMLParser = None
+
+try:  # pragma: no cover - exercised implicitly depending on the environment
+    import lxml.html
+    from lxml.cssselect import CSSSelector
+except ImportError:  # pragma: no cover
+    CSSSelector = None
+
+
+class Node:
+    """A parsed element. Subclasses adapt one parser library's element type."""
+
+    __slots__ = ("_element",)
+
+    def __init__(self, element) -> None:
+        self._element = element
+
+    def select(self, selector: str) -> List["Node"]:
+        raise NotImplementedError
+
+    def select_one(self, selector: str) -> Optional["Node"]:
+        matches = self.select(selector)
+        return matches[0] if matches else None
+
+    def text(self, strip: bool = True) -> str:
+        """Concatenated text of the element; ``strip`` trims every text fragment."""
+
+        raise NotImplementedError
+
+    def attr(self, name: str, default: str | None = None) -> str | None:
+        raise NotImplementedError
+
+    @property
+    def parent(self) -> Optional["Node"]:
+        raise NotImplementedError
+
+    def __getitem__(self, name: str) -> str:
+        value = self.attr(name)
+        if value is None:
+            raise KeyError(name)
+        return value
+
+
+class SoupNode(Node):
+    __slots__ = ()
+
+    def select(self, selector: str) -> List[Node]:
+        return [SoupNode(element) for element in _soup_selector(selector).select(self._element)]
+
+    def select_one(self, selector: str) -> Optional[Node]:
+        element = _soup_selector(selector).select_one(self._element)
+        return SoupNode(element) if element is not None else None
+
+    def text(self, strip: bool = True) -> str:
+        return self._element.get_text(strip=strip)
+
+    def attr(self, name: str, default: str | None = None) -> str | None:
+        return self._element.get(name, default)
+
+    @property
+    def parent(self) -> Optional[Node]:
+        element = self._element.parent
+        return SoupNode(element) if element is not None else None
+
+
+class LexborNode(Node):
+    __slots__ = ()
+
+    def select(self, selector: str) -> List[Node]:
+        return [LexborNode(element) for element in self._element.css(selector)]
+
+    def select_one(self, selector: str) -> Optional[Node]:
+        element = self._element.css_first(selector)
+        return LexborNode(element) if element is not None else None
+
+    def text(self, strip: bool = True) -> str:
+        return self._element.text(deep=True, separator="", strip=strip)
+
+    def attr(self, name: str, default: str | None = None) -> str | None:
+        value = self._element.attributes.get(name, default)
+        return default if value is None else value
+
+    @property
+    def parent(self) -> Optional[Node]:
+        element = self._element.parent
+        return LexborNode(element) if element is not None else None
+
+
+class LxmlNode(Node):
+    __slots__ = ()
+
+    def select(self, selector: str) -> List[Node]:
+        return [LxmlNode(element) for element in _lxml_selector(selector)(self._element)]
+
+    def text(self, strip: bool = True) -> str:
+        if strip:
+            return "".join(fragment.strip() for fragment in self._element.itertext())
+        return "".join(self._element.itertext())
+
+    def attr(self, name: str, default: str | None = None) -> str | None:
+        return self._element.get(name, default)
+
+    @property
+    def parent(self) -> Optional[Node]:
+        element = self._element.getparent()
+        return LxmlNode(element) if element is not None else None
+
+
+@lru_cache(maxsize=256)
+def _soup_selector(selector: str):
+    return soupsieve.compile(selector)
+
+
+@lru_cache(maxsize=256)
+def _lxml_selector(selector: str):
+    return CSSSelector(selector)
+
+
+def _parse_soup(html: str) -> Node:
+    builder = "lxml" if CSSSelector is not None else "html.parser"
+    return SoupNode(BeautifulSoup(html, builder))
+
+
+def _parse_lexbor(html: str) -> Node:
+    return LexborNode(LexborHTMLParser(html).root)
+
+
+def _parse_lxml(html: str) -> Node:
+    return LxmlNode(lxml.html.document_fromstring(html))
+
+
+PARSER_BACKENDS: Dict[str, Callable[[str], Node]] = {"bs4": _parse_soup}
+if CSSSelector is not None:
+    PARSER_BACKENDS["lxml"] = _parse_lxml
+if LexborHTMLParser is not None:
+    PARSER_BACKENDS["selectolax"] = _parse_lexbor
+
+_PREFERENCE = ("selectolax", "lxml", "bs4")
+
+
+def available_backends() -> List[str]:
+    return [name for name in _PREFERENCE if name in PARSER_BACKENDS]
+
+
+def resolve_backend(name: str | None) -> str:
+    """Map ``"auto"``/``None`` to the fastest installed backend and validate the rest."""
+
+    if name in (None, "auto"):
+        return available_backends()[0]
+    if name not in PARSER_BACKENDS:
+        raise ValueError(
+            f"HTML parser backend {name!r} is not available; installed: {', '.join(available_backends())}"
+        )
+    return name
+
+
+def parse_html(html: str, backend: str | None = None) -> Node:
+    """Parse ``html`` with the requested backend and return the document root."""
+
+    return PARSER_BACKENDS[resolve_backend(backend)](html)
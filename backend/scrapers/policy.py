@@ -0,0 +1,106 @@
+"""Per-host fetch policy: politeness limits, retry backoff and circuit breaking."""
+
+from __future__ import annotations
+
+import asyncio
+import random
+import time
+from dataclasses import dataclass, field
+
+import httpx
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(httpx.HTTPError):
+    """Raised without touching the network while a host's circuit is open."""
+
+    def __init__(self, host: str, retry_in: float) -> None:
+        super().__init__(f"Circuit open for {host}; retrying in {retry_in:.0f}s")
+        self.host = host
+        self.retry_in = retry_in
+
+
+@dataclass
+class CircuitBreaker:
+    """Opens after ``failure_threshold`` consecutive failed fetches.
+
+    While open, fetches fail immediately. After ``cooldown_seconds`` a single
+    trial fetch is let through (half-open); its outcome closes or re-opens it.
+    """
+
+    failure_threshold: int
+    cooldown_seconds: float
+    failures: int = 0
+    opened_at: float | None = None
+    trial_in_flight: bool = False
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return CLOSED
+        if time.monotonic() - self.opened_at >= self.cooldown_seconds:
+            return HALF_OPEN
+        return OPEN
+
+    def before_request(self, host: str) -> None:
+        state = self.state
+        if state == OPEN or (state == HALF_OPEN and self.trial_in_flight):
+            retry_in = max(self.cooldown_seconds - (time.monotonic() - (self.opened_at or 0.0)), 0.0)
+            raise CircuitOpenError(host, retry_in)
+        if state == HALF_OPEN:
+            self.trial_in_flight = True
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self.opened_at = None
+        self.trial_in_flight = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        self.trial_in_flight = False
+        if self.opened_at is not None or self.failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+
+
+@dataclass
+class HostPolicy:
+    """Concurrency cap, request spacing and circuit breaker for one host."""
+
+    max_concurrency: int
+    min_interval_seconds: float
+    breaker: CircuitBreaker
+    _semaphore: asyncio.Semaphore | None = field(default=None, repr=False)
+    _next_slot: float = 0.0
+
+    async def __aenter__(self) -> "HostPolicy":
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        await self._semaphore.acquire()
+        # Reserve the next request slot before sleeping so concurrent callers queue up.
+        now = time.monotonic()
+        slot = max(now, self._next_slot)
+        self._next_slot = slot + self.min_interval_seconds
+        if slot > now:
+            await asyncio.sleep(slot - now)
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        self._semaphore.release()
+
+
+def backoff_delay(attempt: int, base_seconds: float, max_seconds: float) -> float:
+    """Full-jitter exponential backoff for retry ``attempt`` (starting at 0)."""
+
+    return random.uniform(0, min(max_seconds, base_seconds * 2**attempt))
+
+
+def is_retryable(exc: Exception) -> bool:
+    if isinstance(exc, CircuitOpenError):
+        return False
+    if isinstance(exc, httpx.HTTPStatusError):
+        status = exc.response.status_code
+        return status >= 500 or status == httpx.codes.TOO_MANY_REQUESTS
+    return isinstance(exc, (httpx.TimeoutException, httpx.TransportError))
@@ -0,0 +1,81 @@
+"""Lazy registry of provider scrapers.
+
+Scrapers are registered as ``"module:Class"`` references and imported the first
+time they are looked up, so starting the API does not pay for every scraper
+module and the HTML parser libraries behind them. Packages can add providers
+through the ``energy_plans.scrapers`` entry point group::
+
+    [project.entry-points."energy_plans.scrapers"]
+    acme = "acme_scraper:AcmeScraper"
+"""
+
+from __future__ import annotations
+
+from importlib import import_module
+from importlib.metadata import entry_points
+from typing import TYPE_CHECKING, Dict, Iterator, MutableMapping, Type, Union
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .base import BaseScraper
+
+ENTRY_POINT_GROUP = "energy_plans.scrapers"
+
+BUILTIN_SCRAPERS: Dict[str, str] = {
+    "txu": "backend.scrapers.txu:TXUScraper",
+    "reliant": "backend.scrapers.reliant:ReliantScraper",
+    "gexa": "backend.scrapers.gexa:GexaScraper",
+    "direct_energy": "backend.scrapers.direct_energy:DirectEnergyScraper",
+}
+
+
+def _load(reference: str) -> Type["BaseScraper"]:
+    module_name, _, attribute = reference.partition(":")
+    return getattr(import_module(module_name), attribute)
+
+
+class ScraperRegistry(MutableMapping[str, Type["BaseScraper"]]):
+    """Maps provider slugs to scraper classes, importing each class on first use.
+
+    Membership checks and iteration only look at the registered names, so
+    validating slugs never imports a scraper module.
+    """
+
+    def __init__(self, builtins: Dict[str, str], group: str | None = ENTRY_POINT_GROUP) -> None:
+        self._builtins = dict(builtins)
+        self._group = group
+        self._entries: Dict[str, Union[str, Type["BaseScraper"]]] | None = None
+
+    def _discover(self) -> Dict[str, Union[str, Type["BaseScraper"]]]:
+        if self._entries is None:
+            entries: Dict[str, Union[str, Type["BaseScraper"]]] = dict(self._builtins)
+            if self._group is not None:
+                for entry_point in entry_points(group=self._group):
+                    # Built-in providers win over plugins registering the same slug.
+                    entries.setdefault(entry_point.name, entry_point.value)
+            self._entries = entries
+        return self._entries
+
+    def __getitem__(self, slug: str) -> Type["BaseScraper"]:
+        entries = self._discover()
+        scraper = entries[slug]
+        if isinstance(scraper, str):
+            scraper = entries[slug] = _load(scraper)
+        return scraper
+
+    def __setitem__(self, slug: str, scraper: Union[str, Type["BaseScraper"]]) -> None:
+        self._discover()[slug] = scraper
+
+    def __delitem__(self, slug: str) -> None:
+        del self._discover()[slug]
+
+    def __contains__(self, slug: object) -> bool:
+        return slug in self._discover()
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._discover())
+
+    def __len__(self) -> int:
+        return len(self._discover())
+
+    def is_loaded(self, slug: str) -> bool:
+        return not isinstance(self._discover().get(slug, ""), str)
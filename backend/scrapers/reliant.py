@@ -1,7 +1,5 @@
 from __future__ import annotations
 
-from bs4 import BeautifulSoup
-
 from .. import schemas
 from .base import BaseScraper, ScrapeResult, normalize_rate
 
@@ -26,21 +24,21 @@ _SAMPLE_HTML = """
 class ReliantScraper(BaseScraper):
     provider_slug = "reliant"
 
-    def parse(self) -> ScrapeResult:
-        soup = BeautifulSoup(_SAMPLE_HTML, "html.parser")
+    def parse(self, html: str | None = None) -> ScrapeResult:
+        document = self.document(html if html is not None else _SAMPLE_HTML)
         plans = []
-        for details in soup.select(".plans .details"):
+        for details in document.select(".plans .details"):
             rate = float(details["data-rate"]) * 100
             plans.append(
                 schemas.PlanCreate(
                     provider_id=0,
-                    name=details.parent.select_one("h3").get_text(strip=True),
+                    name=details.parent.select_one("h3").text(),
                     term_months=int(details["data-term"]),
                     rate_cents_kwh=rate,
                     base_fee=float(details["data-base"]),
                     cancellation_fee=float(details["data-cancel"]),
                     renewable_percentage=int(details["data-renewable"]),
-                    features=details.get_text(strip=True),
+                    features=details.text(),
                     url="https://www.reliant.com/en/plans"
                 )
             )
@@ -1,34 +1,68 @@
 from __future__ import annotations
 
-from typing import Dict, Iterable, List
+import hashlib
+import json
+from typing import TYPE_CHECKING, Iterable, List
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from .. import crud, schemas
-from ..models import Base
-from ..database import engine
-from .base import ScrapeResult
-from .direct_energy import DirectEnergyScraper
-from .gexa import GexaScraper
-from .reliant import ReliantScraper
-from .txu import TXUScraper
-
-SCRAPER_REGISTRY = {
-    "txu": TXUScraper,
-    "reliant": ReliantScraper,
-    "gexa": GexaScraper,
-    "direct_energy": DirectEnergyScraper,
-}
-
-
-async def run_scraper(session: AsyncSession, slug: str) -> ScrapeResult:
+from ..config import get_settings
+from ..models import Base, DataGeneration
+from ..database import AsyncSessionLocal, engine
+from ..metrics import PLANS_WRITTEN, SCRAPE_PERSIST_SECONDS
+from .registry import BUILTIN_SCRAPERS, ScraperRegistry
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .base import ScrapeResult
+
+# Scraper modules (and the parser libraries they pull in) are imported on first lookup.
+SCRAPER_REGISTRY = ScraperRegistry(BUILTIN_SCRAPERS)
+
+_database_initialized = False
+
+
+def fingerprint_plans(
+    provider: schemas.ProviderCreate, plans: Iterable[schemas.PlanBase]
+) -> str:
+    """Return a stable hash of a provider and its plan set, independent of plan order."""
+
+    plan_rows = sorted(
+        json.dumps(plan.model_dump(exclude={"provider_id"}), sort_keys=True)
+        for plan in plans
+    )
+    payload = json.dumps(
+        {"provider": provider.model_dump(), "plans": plan_rows},
+        sort_keys=True,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+async def run_scraper(session: AsyncSession, slug: str) -> ScrapeResult | None:
+    """Scrape ``slug`` and persist its plans.
+
+    Returns ``None`` when the provider page or the parsed plan set is unchanged
+    since the last run; nothing is written to the database in that case.
+    """
+
     scraper_cls = SCRAPER_REGISTRY.get(slug)
     if not scraper_cls:
         raise ValueError(f"Unknown provider slug: {slug}")
 
     scraper = scraper_cls()
-    result = scraper.parse()
+    result = await scraper.scrape()
+    if result is None:
+        return None
+
+    fingerprint = fingerprint_plans(result.provider, result.plans)
+    existing = await crud.get_provider_by_slug(session, result.provider.slug)
+    if existing is not None and existing.plans_fingerprint == fingerprint:
+        scraper.confirm_fetch()
+        return None
+
     provider = await crud.upsert_provider(session, result.provider)
+    provider.plans_fingerprint = fingerprint
 
     normalized_plans: List[schemas.PlanCreate] = []
     for plan in result.plans:
@@ -46,11 +80,36 @@ async def run_scraper(session: AsyncSession, slug: str) -> ScrapeResult:
             )
         )
 
-    await crud.upsert_plans(session, provider, normalized_plans)
-    await session.commit()
+    settings = get_settings()
+    with SCRAPE_PERSIST_SECONDS.time(slug):
+        changes = await crud.upsert_plans(
+            session,
+            provider,
+            normalized_plans,
+            retain_generations=settings.plan_generations_retained,
+        )
+        await crud.refresh_benchmarks(session, provider, settings.benchmark_usage_levels)
+        await crud.bump_data_generation(session)
+        await session.commit()
+    scraper.confirm_fetch()
+    PLANS_WRITTEN.inc(slug, amount=changes.written)
     return result
 
 
 async def initialize_database() -> None:
+    """Create missing tables once per process.
+
+    With ``DATABASE_AUTO_CREATE`` disabled the schema is expected to come from
+    the SQL migrations applied at deploy time and startup skips the round trip.
+    """
+
+    global _database_initialized
+    if _database_initialized or not get_settings().database_auto_create:
+        return
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+    async with AsyncSessionLocal() as session:
+        if await session.get(DataGeneration, crud.DATA_GENERATION_ID) is None:
+            session.add(DataGeneration(id=crud.DATA_GENERATION_ID, value=0))
+            await session.commit()
+    _database_initialized = True
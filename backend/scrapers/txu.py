@@ -1,7 +1,5 @@
 from __future__ import annotations
 
-from bs4 import BeautifulSoup
-
 from .. import schemas
 from .base import BaseScraper, ScrapeResult, normalize_rate
 
@@ -32,24 +30,24 @@ _SAMPLE_HTML = """
 class TXUScraper(BaseScraper):
     provider_slug = "txu"
 
-    def parse(self) -> ScrapeResult:
-        soup = BeautifulSoup(_SAMPLE_HTML, "html.parser")
+    def parse(self, html: str | None = None) -> ScrapeResult:
+        document = self.document(html if html is not None else _SAMPLE_HTML)
         plans = []
-        for article in soup.select("section#plans article.plan"):
+        for article in document.select("section#plans article.plan"):
             plans.append(
                 schemas.PlanCreate(
                     provider_id=0,
-                    name=article.select_one("h2").get_text(strip=True),
-                    term_months=int(article.select_one(".term").get_text(strip=True)),
-                    rate_cents_kwh=normalize_rate(article.select_one(".rate").get_text()),
-                    base_fee=float(article.select_one(".base").get_text(strip=True).replace("$", "")),
+                    name=article.select_one("h2").text(),
+                    term_months=int(article.select_one(".term").text()),
+                    rate_cents_kwh=normalize_rate(article.select_one(".rate").text(strip=False)),
+                    base_fee=float(article.select_one(".base").text().replace("$", "")),
                     cancellation_fee=float(
-                        article.select_one(".cancel").get_text(strip=True).replace("$", "")
+                        article.select_one(".cancel").text().replace("$", "")
                     ),
                     renewable_percentage=int(
-                        article.select_one(".renewable").get_text(strip=True).replace("%", "")
+                        article.select_one(".renewable").text().replace("%", "")
                     ),
-                    features=article.select_one(".features").get_text(strip=True),
+                    features=article.select_one(".features").text(),
                     url="https://www.txu.com/en/rates"
                 )
             )
@@ -0,0 +1,115 @@
+"""Single-pass JSON rendering for large plan listings.
+
+Builds the ``PlanRead`` wire format straight from ORM rows or column
+projections without instantiating Pydantic models, and encodes it with
+``orjson`` when available.
+"""
+
+from __future__ import annotations
+
+import json
+from datetime import datetime
+from operator import attrgetter, itemgetter
+from typing import Any, Iterable, List
+
+from . import schemas
+
+try:  # pragma: no cover - exercised implicitly depending on the environment
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(payload: Any) -> bytes:
+    """Encode ``payload`` as compact JSON bytes."""
+
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(
+        payload, separators=(",", ":"), ensure_ascii=False, default=_default
+    ).encode("utf-8")
+
+
+PLAN_COLUMNS = (
+    "id",
+    "provider_id",
+    "name",
+    "term_months",
+    "rate_cents_kwh",
+    "base_fee",
+    "cancellation_fee",
+    "renewable_percentage",
+    "features",
+    "url",
+    "last_scraped_at",
+)
+_get_columns = attrgetter(*PLAN_COLUMNS)
+_RATE = PLAN_COLUMNS.index("rate_cents_kwh")
+_BASE_FEE = PLAN_COLUMNS.index("base_fee")
+
+
+# PlanRead fields that are not table columns, appended to the column values in this order.
+_COMPUTED_FIELDS = (
+    "estimated_savings",
+    "estimated_savings_vs_txu",
+    "benchmark_provider",
+    "benchmark_usage_kwh",
+)
+_RECORD_KEYS = tuple(schemas.PlanRead.model_fields)
+# Picks the PlanRead values, in field order, out of column values + computed values.
+_pick_record_values = itemgetter(
+    *((PLAN_COLUMNS + _COMPUTED_FIELDS).index(name) for name in _RECORD_KEYS)
+)
+
+
+def plan_records(
+    plans: Iterable[Any],
+    *,
+    benchmark: str,
+    usage_kwh: int,
+    benchmark_cost: float | None,
+    txu_slug: str = "txu",
+) -> List[dict]:
+    """Build ``PlanRead``-shaped dicts, computing savings inline."""
+
+    is_txu = benchmark == txu_slug
+    records = []
+    append = records.append
+    for plan in plans:
+        values = _get_columns(plan)
+        rate = values[_RATE]
+        if rate is None or benchmark_cost is None:
+            savings = None
+        else:
+            # Same arithmetic as models.estimate_monthly_cost so results match exactly.
+            savings = benchmark_cost - ((values[_BASE_FEE] or 0.0) + (rate / 100.0) * usage_kwh)
+        computed = (savings, savings if is_txu else None, benchmark, usage_kwh)
+        append(dict(zip(_RECORD_KEYS, _pick_record_values(values + computed))))
+    return records
+
+
+def render_plans(plans: Iterable[Any], **kwargs: Any) -> bytes:
+    """Render a JSON array of plans in the ``PlanRead`` schema."""
+
+    return dumps(plan_records(plans, **kwargs))
+
+
+PLAN_EXPORT_FIELDS = tuple(schemas.PlanRead.model_fields)
+
+
+def write_csv_rows(writer, records: Iterable[dict]) -> None:
+    """Write PlanRead-shaped records as CSV rows in ``PLAN_EXPORT_FIELDS`` order."""
+
+    for record in records:
+        writer.writerow(
+            [
+                value.isoformat() if isinstance(value, datetime) else value
+                for value in (record[name] for name in PLAN_EXPORT_FIELDS)
+            ]
+        )
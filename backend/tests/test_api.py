@@ -1,5 +1,6 @@
 import asyncio
 import os
+import time
 from pathlib import Path
 
 import pytest
@@ -17,6 +18,9 @@ def configure_env():
     os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{TEST_DB_PATH}"
     os.environ["SCHEDULER_ENABLED"] = "false"
     os.environ["API_KEY"] = "test-key"
+    # Spawning a process pool per TestClient lifespan is slow, and the stub scrapers
+    # defined inside tests cannot be imported by a worker; the pool has its own test.
+    os.environ["PARSE_EXECUTOR"] = "thread"
     # reset cached settings
     get_settings.cache_clear()  # type: ignore[attr-defined]
     yield
@@ -35,11 +39,24 @@ def client():
         yield client
 
 
+def wait_for_job(client: TestClient, job_id: str, timeout: float = 10.0) -> dict:
+    deadline = time.monotonic() + timeout
+    while True:
+        job = client.get(f"/scrape/jobs/{job_id}").json()
+        if job["status"] not in {"queued", "running"}:
+            return job
+        assert time.monotonic() < deadline, f"scrape job {job_id} did not finish"
+        time.sleep(0.01)
+
+
 def trigger_scrape(client: TestClient, *, providers: list[str] | None = None) -> dict:
+    """Queue a scrape and return the finished job."""
+
     payload = {"providers": providers} if providers is not None else None
     response = client.post("/scrape", headers={"x-api-key": "test-key"}, json=payload)
     assert response.status_code == 202
-    return response.json()
+    assert response.headers["location"] == f"/scrape/jobs/{response.json()['job_id']}"
+    return wait_for_job(client, response.json()["job_id"])
 
 
 def test_health_endpoint(client):
@@ -48,6 +65,36 @@ def test_health_endpoint(client):
     assert response.json()["status"] == "ok"
 
 
+def test_readiness_uses_shared_pool_and_caches_result(client):
+    from backend.health import database_health
+
+    database_health._result = None
+    first = client.get("/health/ready")
+    assert first.status_code == 200
+    assert first.json()["database"]["ok"] is True
+
+    checkouts = client.get("/health/pool", headers={"x-api-key": "test-key"}).json()["checkouts"]
+    client.get("/health/ready")
+    pool = client.get("/health/pool", headers={"x-api-key": "test-key"}).json()
+    assert pool["checkouts"] == checkouts
+    assert pool["pool"] == "InstrumentedQueuePool"
+    assert {"size", "checked_out", "overflow", "wait_seconds_max", "timeouts"} <= set(pool)
+    assert pool["max_overflow"] == get_settings().database_max_overflow
+    assert client.get("/health/pool").status_code == 422
+    assert client.get("/health/pool", headers={"x-api-key": "wrong"}).status_code == 401
+
+
+def test_legacy_healthz_is_the_pooled_readiness_check(client):
+    from backend.health import database_health
+
+    checkouts = client.get("/health/pool", headers={"x-api-key": "test-key"}).json()["checkouts"]
+    database_health._result = None
+    response = client.get("/healthz")
+    assert response.status_code == 200
+    assert response.json()["database"]["ok"] is True
+    assert client.get("/health/pool", headers={"x-api-key": "test-key"}).json()["checkouts"] == checkouts + 1
+
+
 def test_scrape_endpoint_requires_api_key(client):
     response = client.post("/scrape")
     assert response.status_code == 422  # missing header
@@ -58,7 +105,7 @@ def test_scrape_endpoint_requires_api_key(client):
 
 def test_scrape_and_fetch_plans(client):
     scrape_result = trigger_scrape(client)
-    assert scrape_result["status"] == "queued"
+    assert scrape_result["status"] == "completed"
     assert scrape_result["results"]
 
     providers_response = client.get("/providers")
@@ -71,6 +118,13 @@ def test_scrape_and_fetch_plans(client):
     plans = plans_response.json()
     assert plans
     assert {plan["provider_id"] for plan in plans}
+    assert any("estimated_savings_vs_txu" in plan for plan in plans)
+
+    txu_provider_id = next(
+        (provider_id for provider_id, slug in provider_lookup.items() if slug == "txu"),
+        None,
+    )
+    assert txu_provider_id is not None
 
 
 def test_plan_detail_endpoint(client):
@@ -119,14 +173,44 @@ def test_scrape_rejects_unknown_provider(client):
     )
     assert response.status_code == 400
     assert "Unknown provider slug" in response.json()["detail"]
-    assert any("estimated_savings_vs_txu" in plan for plan in plans)
 
-    txu_provider_id = next(
-        (provider_id for provider_id, slug in provider_lookup.items() if slug == "txu"),
-        None,
-    )
-    assert txu_provider_id is not None
 
+def test_scrape_isolates_failing_provider(client, monkeypatch):
+    from backend.scrapers.base import BaseScraper
+    from backend.scrapers.runner import SCRAPER_REGISTRY
+
+    class BrokenScraper(BaseScraper):
+        provider_slug = "broken"
+
+        def parse(self):
+            raise RuntimeError("layout changed")
+
+    monkeypatch.setitem(SCRAPER_REGISTRY, "broken", BrokenScraper)
+
+    results = trigger_scrape(client, providers=["broken", "txu"])["results"]
+    by_provider = {result["provider"]: result for result in results}
+    assert by_provider["broken"]["status"] == "error"
+    assert "layout changed" in by_provider["broken"]["error"]
+    assert by_provider["txu"]["status"] in {"ok", "unchanged"}
+
+
+def test_repeat_scrape_of_unchanged_provider_is_a_no_op(client):
+    trigger_scrape(client, providers=["gexa"])
+    before = {plan["id"]: plan["last_scraped_at"] for plan in client.get("/plans").json()}
+
+    results = trigger_scrape(client, providers=["gexa"])["results"]
+    assert results == [
+        {
+            "provider": "gexa",
+            "status": "unchanged",
+            "plans": [],
+            "error": None,
+            "duration_seconds": results[0]["duration_seconds"],
+            "circuit": None,
+        }
+    ]
+    after = {plan["id"]: plan["last_scraped_at"] for plan in client.get("/plans").json()}
+    assert after == before
 
 
 def test_benchmark_against_txu_positive_for_cheaper_plan():
@@ -149,6 +233,446 @@ def test_benchmark_against_txu_positive_for_cheaper_plan():
         base_fee=5.0,
     )
 
-    savings = plan_routes._benchmark_against_txu(competitor, txu_plan, usage)
+    savings = plan_routes._savings_against_benchmark(
+        competitor, txu_plan.cost_for_usage(usage), usage
+    )
     assert savings is not None
     assert savings > 0
+
+
+def test_plans_report_savings_against_selected_benchmark(client):
+    trigger_scrape(client)
+    plans = client.get("/plans", params={"benchmark": "gexa", "usage_kwh": 2000}).json()
+
+    gexa_costs = [
+        plan["base_fee"] + plan["rate_cents_kwh"] / 100 * 2000
+        for plan in plans
+        if plan["name"].startswith("Gexa")
+    ]
+    cheapest = min(gexa_costs)
+    for plan in plans:
+        assert plan["benchmark_provider"] == "gexa"
+        assert plan["benchmark_usage_kwh"] == 2000
+        expected = cheapest - (plan["base_fee"] + plan["rate_cents_kwh"] / 100 * 2000)
+        assert plan["estimated_savings"] == pytest.approx(expected)
+        assert plan["estimated_savings_vs_txu"] is None
+
+    detail = client.get(f"/plans/{plans[0]['id']}", params={"usage_kwh": 750}).json()
+    assert detail["benchmark_provider"] == "txu"
+    assert detail["estimated_savings"] == detail["estimated_savings_vs_txu"]
+    assert detail["estimated_savings"] is not None
+
+
+def test_plan_history_endpoint_returns_price_observations(client):
+    trigger_scrape(client, providers=["reliant"])
+    plan = next(
+        plan for plan in client.get("/plans").json() if plan["name"].startswith("Reliant")
+    )
+
+    history = client.get(f"/plans/{plan['id']}/history")
+    assert history.status_code == 200
+    entries = history.json()
+    assert entries
+    assert entries[-1]["rate_cents_kwh"] == plan["rate_cents_kwh"]
+
+    empty = client.get(f"/plans/{plan['id']}/history", params={"to": "2000-01-01T00:00:00"})
+    assert empty.status_code == 200
+    assert empty.json() == []
+
+    assert client.get("/plans/999999/history").status_code == 404
+
+
+def test_plans_support_filters_and_keyset_pagination(client):
+    trigger_scrape(client)
+    everything = client.get("/plans").json()
+
+    pages = []
+    response = client.get("/plans", params={"limit": 3})
+    while True:
+        assert response.status_code == 200
+        pages.append(response.json())
+        cursor = response.headers.get("x-next-cursor")
+        if not cursor:
+            break
+        response = client.get("/plans", params={"limit": 3, "cursor": cursor})
+    assert [plan["id"] for page in pages for plan in page] == [plan["id"] for plan in everything]
+    assert all(len(page) <= 3 for page in pages)
+
+    filtered = client.get(
+        "/plans",
+        params={"provider": "gexa", "min_term": 24, "min_renewable": 50, "sort": "-term_months"},
+    ).json()
+    assert filtered
+    assert all(plan["term_months"] >= 24 for plan in filtered)
+    assert all(plan["renewable_percentage"] >= 50 for plan in filtered)
+    terms = [plan["term_months"] for plan in filtered]
+    assert terms == sorted(terms, reverse=True)
+
+    cheap = client.get("/plans", params={"max_rate": 1000}).json()
+    assert all(plan["rate_cents_kwh"] <= 1000 for plan in cheap)
+
+    assert client.get("/plans", params={"cursor": "not-a-cursor"}).status_code == 400
+
+
+def test_plans_without_limit_are_unpaginated_and_keep_unknown_terms_and_rates(client, monkeypatch):
+    from backend import schemas
+    from backend.routes import plans as plans_routes
+    from backend.scrapers.gexa import GexaScraper
+    from backend.scrapers.runner import SCRAPER_REGISTRY
+
+    class UnpricedGexaScraper(GexaScraper):
+        def parse(self, html=None):
+            result = super().parse(html)
+            provider_id = result.plans[0].provider_id
+            result.plans.append(schemas.PlanCreate(name="Gexa Call Us", provider_id=provider_id))
+            return result
+
+    monkeypatch.setitem(SCRAPER_REGISTRY, "gexa", UnpricedGexaScraper)
+    monkeypatch.setattr(plans_routes, "DEFAULT_PAGE_SIZE", 2)
+    trigger_scrape(client)
+
+    response = client.get("/plans")
+    assert "x-next-cursor" not in response.headers
+    assert len(response.json()) > 2
+    assert "x-next-cursor" in client.get("/plans", params={"limit": 2}).headers
+
+    for params in ({"term": 12}, {"min_term": 1, "max_term": 60}, {"max_rate": 1}):
+        names = [plan["name"] for plan in client.get("/plans", params=params).json()]
+        assert "Gexa Call Us" in names, params
+
+
+def test_read_endpoints_support_conditional_requests(client, monkeypatch):
+    from backend.scrapers.runner import SCRAPER_REGISTRY
+    from backend.scrapers.txu import TXUScraper
+
+    trigger_scrape(client)
+    for path in ("/plans", "/providers"):
+        first = client.get(path)
+        etag = first.headers["etag"]
+        repeat = client.get(path, headers={"If-None-Match": etag})
+        assert repeat.status_code == 304
+        assert repeat.headers["etag"] == etag
+
+    etag = client.get("/plans").headers["etag"]
+
+    class RepricedTXUScraper(TXUScraper):
+        def parse(self, html=None):
+            result = super().parse(html)
+            result.plans[0].rate_cents_kwh += 1
+            return result
+
+    monkeypatch.setitem(SCRAPER_REGISTRY, "txu", RepricedTXUScraper)
+    trigger_scrape(client, providers=["txu"])
+
+    refreshed = client.get("/plans", headers={"If-None-Match": etag})
+    assert refreshed.status_code == 200
+    assert refreshed.headers["etag"] != etag
+
+
+def test_cost_curves_match_scalar_cost_model(client):
+    from backend import models
+
+    trigger_scrape(client)
+    plans = {plan["id"]: plan for plan in client.get("/plans").json()}
+
+    response = client.get("/plans/cost-curves", params={"stop_kwh": 3000, "step_kwh": 100})
+    assert response.status_code == 200
+    curves = response.json()
+    assert curves["usage_kwh"][0] == 0 and curves["usage_kwh"][-1] == 3000
+    assert len(curves["benchmark_costs"]) == len(curves["usage_kwh"])
+
+    for curve in curves["plans"]:
+        plan = plans[curve["plan_id"]]
+        model = models.Plan(rate_cents_kwh=plan["rate_cents_kwh"], base_fee=plan["base_fee"])
+        for usage, cost in zip(curves["usage_kwh"], curve["costs"]):
+            assert cost == pytest.approx(model.cost_for_usage(usage), abs=0.01)
+        for point in curve["crossovers_kwh"]:
+            assert 0 <= point <= 3000
+
+    gexa_only = client.get("/plans/cost-curves", params={"provider": "gexa"}).json()
+    assert {plans[curve["plan_id"]]["name"][:4] for curve in gexa_only["plans"]} == {"Gexa"}
+
+
+def test_plan_export_streams_ndjson_and_csv(client):
+    import csv
+    import io
+    import json
+
+    trigger_scrape(client)
+    listed = client.get("/plans").json()
+
+    ndjson = client.get("/plans/export", params={"format": "ndjson"})
+    assert ndjson.status_code == 200
+    assert ndjson.headers["content-type"].startswith("application/x-ndjson")
+    exported = [json.loads(line) for line in ndjson.text.splitlines()]
+    assert exported == listed
+
+    as_csv = client.get("/plans/export", params={"format": "csv", "provider": "txu"})
+    assert as_csv.status_code == 200
+    rows = list(csv.DictReader(io.StringIO(as_csv.text)))
+    assert rows
+    txu_ids = {str(plan["id"]) for plan in client.get("/plans", params={"provider": "txu"}).json()}
+    assert {row["id"] for row in rows} == txu_ids
+    assert list(rows[0]) == list(listed[0])
+
+    assert client.get("/plans/export", params={"format": "xml"}).status_code == 422
+
+
+def test_metrics_endpoint_exposes_scraper_and_route_histograms(client):
+    trigger_scrape(client)
+    client.get("/plans")
+    client.get("/plans")
+
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    body = response.text
+    assert 'scraper_parse_seconds_count{provider="txu"}' in body
+    assert 'scraper_persist_seconds_bucket{provider="txu",le="+Inf"}' in body
+    assert 'scraper_runs_total{provider="txu",status=' in body
+    assert 'scraper_plans_written_total{provider="txu"}' in body
+    assert 'http_request_duration_seconds_count{method="GET",route="/plans",status="200"}' in body
+    assert "response_cache_hits_total" in body
+    assert "db_pool_checkouts_total" in body
+
+
+def test_concurrent_scrape_requests_merge_into_running_job(client, monkeypatch):
+    from backend.scrapers.runner import SCRAPER_REGISTRY
+    from backend.scrapers.txu import TXUScraper
+
+    class SlowTXUScraper(TXUScraper):
+        async def scrape(self):
+            await asyncio.sleep(0.3)
+            return await super().scrape()
+
+    monkeypatch.setitem(SCRAPER_REGISTRY, "txu", SlowTXUScraper)
+    headers = {"x-api-key": "test-key"}
+
+    first = client.post("/scrape", headers=headers, json={"providers": ["txu"]}).json()
+    repeat = client.post("/scrape", headers=headers, json={"providers": ["txu"]}).json()
+    mixed = client.post("/scrape", headers=headers, json={"providers": ["txu", "gexa"]}).json()
+
+    assert first["providers"] == ["txu"]
+    assert repeat["job_id"] == first["job_id"]
+    assert repeat["providers"] == [] and repeat["merged"] == {"txu": first["job_id"]}
+    assert mixed["job_id"] != first["job_id"]
+    assert mixed["providers"] == ["gexa"] and mixed["merged"] == {"txu": first["job_id"]}
+
+    progress = client.get(f"/scrape/jobs/{first['job_id']}").json()
+    assert progress["results"][0]["status"] in {"queued", "running"}
+
+    finished = wait_for_job(client, first["job_id"])
+    assert finished["status"] == "completed"
+    assert finished["finished_at"] is not None
+    assert [result["provider"] for result in finished["results"]] == ["txu"]
+    assert wait_for_job(client, mixed["job_id"])["results"][0]["provider"] == "gexa"
+
+    assert client.get("/scrape/jobs/does-not-exist").status_code == 404
+
+
+def test_unfinished_scrape_jobs_resume_on_startup():
+    from backend import crud
+    from backend.database import AsyncSessionLocal
+
+    async def interrupted_job():
+        async with AsyncSessionLocal() as session:
+            await crud.create_scrape_job(session, "interrupted", ["gexa", "reliant"])
+            await crud.set_scrape_job_status(session, "interrupted", "running")
+            await crud.update_scrape_job_provider(
+                session, "interrupted", "gexa", status="ok", plans=["Gexa Saver Deluxe 12"]
+            )
+            await crud.update_scrape_job_provider(session, "interrupted", "reliant", status="running")
+            await session.commit()
+
+    asyncio.get_event_loop().run_until_complete(interrupted_job())
+
+    with TestClient(app) as client:
+        job = wait_for_job(client, "interrupted")
+
+    assert job["status"] == "completed"
+    by_provider = {result["provider"]: result for result in job["results"]}
+    assert by_provider["gexa"]["plans"] == ["Gexa Saver Deluxe 12"]
+    assert by_provider["reliant"]["status"] in {"ok", "unchanged"}
+
+
+def test_scrape_jobs_owned_by_a_live_replica_are_not_resumed():
+    from backend import crud
+    from backend.database import AsyncSessionLocal
+
+    async def interrupted_jobs():
+        async with AsyncSessionLocal() as session:
+            for job_id, expires_in in (("live-owner", 3600), ("dead-owner", -60)):
+                await crud.create_scrape_job(session, job_id, ["gexa"])
+                await crud.set_scrape_job_status(session, job_id, "running")
+                await crud.acquire_lease(
+                    session, crud.job_lease_name(job_id), "other-replica", expires_in
+                )
+            await session.commit()
+
+    asyncio.get_event_loop().run_until_complete(interrupted_jobs())
+
+    with TestClient(app) as client:
+        resumed = wait_for_job(client, "dead-owner")
+        untouched = client.get("/scrape/jobs/live-owner").json()
+
+    assert resumed["status"] == "completed"
+    assert untouched["status"] == "running"
+
+
+def test_scrape_requests_merge_into_jobs_running_on_other_replicas(client):
+    from backend import crud
+    from backend.database import AsyncSessionLocal
+
+    async def claim(job_id, slug, status):
+        async with AsyncSessionLocal() as session:
+            if status is not None:
+                await crud.create_scrape_job(session, job_id, [slug])
+                await crud.set_scrape_job_status(session, job_id, status)
+                await crud.acquire_lease(
+                    session, crud.job_lease_name(job_id), "other-replica", 3600
+                )
+            await crud.acquire_lease(
+                session, crud.provider_job_lease_name(slug), job_id, 3600
+            )
+            await session.commit()
+
+    loop = asyncio.get_event_loop()
+    loop.run_until_complete(claim("elsewhere", "reliant", "running"))
+    loop.run_until_complete(claim("finished-elsewhere", "gexa", "completed"))
+    loop.run_until_complete(claim("deleted-job", "txu", None))
+    headers = {"x-api-key": "test-key"}
+
+    repeat = client.post("/scrape", headers=headers, json={"providers": ["reliant"]}).json()
+    mixed = client.post(
+        "/scrape", headers=headers, json={"providers": ["reliant", "gexa", "txu"]}
+    ).json()
+
+    assert repeat["job_id"] == "elsewhere" and repeat["status"] == "running"
+    assert repeat["merged"] == {"reliant": "elsewhere"}
+    assert mixed["providers"] == ["gexa", "txu"]
+    assert mixed["merged"] == {"reliant": "elsewhere"}
+    assert wait_for_job(client, mixed["job_id"])["status"] == "completed"
+
+    async def finish_elsewhere():
+        async with AsyncSessionLocal() as session:
+            leases = [
+                await crud.get_lease(session, crud.provider_job_lease_name(slug))
+                for slug in ("gexa", "txu")
+            ]
+            await crud.set_scrape_job_status(session, "elsewhere", "completed")
+            await crud.release_lease(session, crud.provider_job_lease_name("reliant"), "elsewhere")
+            await session.commit()
+        return leases
+
+    # Finished jobs give their providers back.
+    assert loop.run_until_complete(finish_elsewhere()) == [None, None]
+
+
+def test_scrape_job_stops_when_another_replica_takes_over_its_lease(client, monkeypatch):
+    from sqlalchemy import update
+
+    from backend import crud, models
+    from backend.database import AsyncSessionLocal
+    from backend.scrapers.runner import SCRAPER_REGISTRY
+    from backend.scrapers.txu import TXUScraper
+
+    finished = []
+
+    class SlowTXUScraper(TXUScraper):
+        async def scrape(self):
+            await asyncio.sleep(1.0)
+            finished.append(True)
+            return await super().scrape()
+
+    monkeypatch.setitem(SCRAPER_REGISTRY, "txu", SlowTXUScraper)
+    monkeypatch.setattr(get_settings(), "scrape_job_lease_seconds", 0.3)
+    submitted = client.post(
+        "/scrape", headers={"x-api-key": "test-key"}, json={"providers": ["txu"]}
+    ).json()
+
+    async def take_over():
+        async with AsyncSessionLocal() as session:
+            await session.execute(
+                update(models.Lease)
+                .where(models.Lease.name == crud.job_lease_name(submitted["job_id"]))
+                .values(holder="other-replica")
+            )
+            await session.commit()
+        await asyncio.sleep(1.5)  # past the point where the scrape would have finished
+        async with AsyncSessionLocal() as session:
+            provider = await crud.get_lease(session, crud.provider_job_lease_name("txu"))
+            job = await crud.get_scrape_job(session, submitted["job_id"])
+            job.status = "failed"  # let later tests claim txu again
+            await session.commit()
+        return provider
+
+    provider_lease = client.portal.call(take_over)
+
+    assert not finished
+    assert provider_lease is not None and provider_lease.holder == submitted["job_id"]
+
+
+def test_scheduled_scrape_respects_other_replicas_lease():
+    from datetime import datetime, timedelta
+
+    from backend import crud
+    from backend.database import AsyncSessionLocal
+    from backend.scheduler import scrape_provider_on_schedule
+
+    settings = get_settings()
+
+    async def scenario():
+        async with AsyncSessionLocal() as session:
+            await crud.acquire_lease(
+                session, crud.provider_lease_name("reliant"), "other-replica", 3600
+            )
+            await session.commit()
+        waited = await scrape_provider_on_schedule("reliant")
+        scraped = await scrape_provider_on_schedule("gexa")
+        async with AsyncSessionLocal() as session:
+            lease = await crud.get_lease(session, crud.provider_lease_name("gexa"))
+        return waited, scraped, lease
+
+    waited, scraped, lease = asyncio.get_event_loop().run_until_complete(scenario())
+
+    assert 3500 < waited < 3600 + settings.scrape_min_interval_minutes * 60
+    interval = lease.interval_minutes
+    assert abs(scraped - interval * 60) <= interval * 60 * settings.scrape_jitter_fraction
+    assert lease.holder == settings.instance_id
+    assert lease.expires_at > datetime.utcnow() + timedelta(minutes=interval - 1)
+
+
+def test_scheduled_scrape_continues_the_interval_recorded_on_the_lease():
+    from datetime import datetime, timedelta
+
+    from sqlalchemy import update
+
+    from backend import crud, models
+    from backend.database import AsyncSessionLocal
+    from backend.scheduler import scrape_provider_on_schedule
+
+    lease_name = crud.provider_lease_name("direct_energy")
+
+    async def scenario():
+        await scrape_provider_on_schedule("direct_energy")
+        # Another replica backed off to 100 minutes, then went away.
+        async with AsyncSessionLocal() as session:
+            await session.execute(
+                update(models.Lease)
+                .where(models.Lease.name == lease_name)
+                .values(
+                    holder="other-replica",
+                    expires_at=datetime.utcnow() - timedelta(seconds=1),
+                    interval_minutes=100,
+                )
+            )
+            await session.commit()
+        # Plans are unchanged since the first scrape, so the interval backs off.
+        await scrape_provider_on_schedule("direct_energy")
+        async with AsyncSessionLocal() as session:
+            return await crud.get_lease(session, lease_name)
+
+    lease = asyncio.get_event_loop().run_until_complete(scenario())
+
+    assert lease.holder == get_settings().instance_id
+    assert lease.interval_minutes == 100 * get_settings().scrape_backoff_factor
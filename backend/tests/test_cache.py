@@ -0,0 +1,44 @@
+import asyncio
+
+from backend.cache import ResponseCache
+
+
+def test_concurrent_misses_share_one_build():
+    cache = ResponseCache(max_entries=8, max_bytes=1024)
+    builds = []
+
+    async def build():
+        builds.append(1)
+        await asyncio.sleep(0.01)
+        return b"[]", {}
+
+    async def scenario():
+        return await asyncio.gather(*(cache.get_or_build(1, "plans", build) for _ in range(5)))
+
+    entries = asyncio.run(scenario())
+    assert len(builds) == 1
+    assert len({entry.etag for entry in entries}) == 1
+
+
+def test_lru_eviction_and_generation_invalidation():
+    cache = ResponseCache(max_entries=2, max_bytes=1024)
+
+    def builder(body: bytes):
+        async def build():
+            return body, {}
+
+        return build
+
+    async def scenario():
+        await cache.get_or_build(1, "a", builder(b"a"))
+        await cache.get_or_build(1, "b", builder(b"b"))
+        await cache.get_or_build(1, "a", builder(b"a"))
+        await cache.get_or_build(1, "c", builder(b"c"))
+        evicted = await cache.get_or_build(1, "b", builder(b"b2"))
+        refreshed = await cache.get_or_build(2, "a", builder(b"a2"))
+        return evicted, refreshed
+
+    evicted, refreshed = asyncio.run(scenario())
+    assert evicted.body == b"b2"
+    assert refreshed.body == b"a2"
+    assert len(cache) == 1
@@ -0,0 +1,26 @@
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from backend import costs
+
+
+def test_crossover_points_match_analytic_intersections():
+    rows = [
+        SimpleNamespace(id=1, provider_id=1, rate_cents_kwh=15.0, base_fee=0.0),
+        SimpleNamespace(id=2, provider_id=2, rate_cents_kwh=10.0, base_fee=30.0),
+        SimpleNamespace(id=3, provider_id=2, rate_cents_kwh=20.0, base_fee=None),
+    ]
+    arrays = costs.PlanArrays.from_rows(rows)
+    usage = costs.usage_grid(0, 1000, 50)
+    matrix = costs.cost_matrix(arrays, usage)
+    benchmark = costs.lower_envelope(matrix, np.array([True, False, False]))
+
+    crossings = costs.crossover_points(matrix, benchmark, usage)
+
+    # 30 + 0.10u == 0.15u at u = 600; plan 3 is always dearer except at zero usage.
+    assert crossings[0].size == 0
+    assert crossings[1].tolist() == pytest.approx([600.0])
+    assert crossings[2].size == 0
+    assert matrix.shape == (3, 21)
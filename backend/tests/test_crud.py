@@ -0,0 +1,245 @@
+import asyncio
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from backend import crud, models, schemas
+
+
+@pytest.fixture()
+def session_factory(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'crud.db'}")
+
+    async def create_schema():
+        async with engine.begin() as conn:
+            await conn.run_sync(models.Base.metadata.create_all)
+
+    asyncio.run(create_schema())
+    yield sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    asyncio.run(engine.dispose())
+
+
+def make_plan(name: str, rate: float, term: int | None = 12) -> schemas.PlanCreate:
+    return schemas.PlanCreate(
+        provider_id=0,
+        name=name,
+        term_months=term,
+        rate_cents_kwh=rate,
+        base_fee=4.95,
+    )
+
+
+def test_upsert_plans_merges_by_natural_key(session_factory):
+    async def scenario():
+        async with session_factory() as session:
+            provider = await crud.upsert_provider(
+                session, schemas.ProviderCreate(name="Acme", slug="acme")
+            )
+            first = await crud.upsert_plans(
+                session,
+                provider,
+                [make_plan("Keep", 10.0), make_plan("Change", 11.0), make_plan("Drop", 12.0)],
+            )
+            await session.commit()
+            ids = dict(
+                (await session.execute(select(models.Plan.name, models.Plan.id))).all()
+            )
+
+            second = await crud.upsert_plans(
+                session,
+                provider,
+                [make_plan("Keep", 10.0), make_plan("Change", 9.5), make_plan("New", 8.0)],
+            )
+            await session.commit()
+            plans = await crud.list_plans(session)
+            return first, second, ids, [(plan.name, plan.id, plan.rate_cents_kwh) for plan in plans]
+
+    first, second, ids, rows = asyncio.run(scenario())
+
+    assert len(first.inserted) == 3
+    assert [row["name"] for row in second.inserted] == ["New"]
+    assert [row["name"] for row in second.updated] == ["Change"]
+    assert second.deleted == [ids["Drop"]]
+    assert second.unchanged == 1
+    assert (first.generation, second.generation) == (1, 2)
+
+    by_name = {name: (plan_id, rate) for name, plan_id, rate in rows}
+    assert set(by_name) == {"Keep", "Change", "New"}
+    assert by_name["Keep"][0] == ids["Keep"]
+    assert by_name["Change"][1] == 9.5
+
+
+def test_plan_generations_switch_atomically_and_roll_back(session_factory):
+    async def current_rates(session):
+        return sorted(plan.rate_cents_kwh for plan in await crud.list_plans(session))
+
+    async def scenario():
+        async with session_factory() as session:
+            provider = await crud.upsert_provider(
+                session, schemas.ProviderCreate(name="Acme", slug="acme")
+            )
+            for rate in (10.0, 11.0, 12.0):
+                await crud.upsert_plans(
+                    session, provider, [make_plan("Saver", rate)], retain_generations=1
+                )
+            await session.commit()
+            latest = await current_rates(session)
+
+            await crud.activate_generation(session, provider, 2, retain_generations=1)
+            rolled_back = await current_rates(session)
+
+            with pytest.raises(ValueError):
+                await crud.activate_generation(session, provider, 1, retain_generations=1)
+
+            await crud.upsert_plans(
+                session, provider, [make_plan("Saver", 13.0)], retain_generations=1
+            )
+            await session.commit()
+            stored = (await session.execute(select(models.Plan.rate_cents_kwh))).scalars().all()
+            return latest, rolled_back, provider.current_generation, sorted(stored), await current_rates(session)
+
+    latest, rolled_back, generation, stored, after = asyncio.run(scenario())
+    assert latest == [12.0]
+    assert rolled_back == [11.0]
+    # The abandoned generation 3 is discarded and generation 1 falls out of retention.
+    assert generation == 3
+    assert stored == [11.0, 13.0]
+    assert after == [13.0]
+
+
+def test_upsert_plans_updates_plans_without_term(session_factory):
+    async def scenario():
+        async with session_factory() as session:
+            provider = await crud.upsert_provider(
+                session, schemas.ProviderCreate(name="Acme", slug="acme")
+            )
+            await crud.upsert_plans(session, provider, [make_plan("Variable", 14.0, term=None)])
+            await crud.upsert_plans(session, provider, [make_plan("Variable", 15.0, term=None)])
+            await session.commit()
+            return [plan.rate_cents_kwh for plan in await crud.list_plans(session)]
+
+    assert asyncio.run(scenario()) == [15.0]
+
+
+def test_keyset_pages_cover_null_keys_and_seek_the_sort_index(session_factory):
+    rates = [9.0, None, 11.0, 9.0, None, 10.0, 11.0]
+    terms = [12, 24, None, None, 12, 12, 12]
+
+    async def scenario():
+        async with session_factory() as session:
+            provider = await crud.upsert_provider(
+                session, schemas.ProviderCreate(name="Acme", slug="acme")
+            )
+            await crud.upsert_plans(
+                session,
+                provider,
+                [
+                    make_plan(f"Plan {index}", rate, term=term)
+                    for index, (rate, term) in enumerate(zip(rates, terms))
+                ],
+            )
+            await session.commit()
+
+            outcomes = {}
+            for sort in crud.PLAN_SORT_COLUMNS:
+                for descending in (False, True):
+                    everything = await crud.list_plan_rows(session, sort=sort, descending=descending)
+                    paged, after = [], None
+                    while True:
+                        page = await crud.list_plan_rows(
+                            session, sort=sort, descending=descending, after=after, limit=2
+                        )
+                        paged += page
+                        if len(page) < 2:
+                            break
+                        after = crud.plan_sort_values(page[-1], sort)
+
+                    stmt = crud._plan_listing(
+                        select(models.Plan.id), None, sort, descending, after, 101
+                    )
+                    compiled = stmt.compile(
+                        dialect=session.bind.dialect, compile_kwargs={"literal_binds": True}
+                    )
+                    connection = await session.connection()
+                    plan = await connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {compiled}")
+                    outcomes[sort, descending] = (
+                        [crud.plan_sort_values(row, sort) for row in everything],
+                        [crud.plan_sort_values(row, sort) for row in paged],
+                        " | ".join(row[-1] for row in plan),
+                    )
+            return outcomes
+
+    for (sort, descending), (everything, paged, plan) in asyncio.run(scenario()).items():
+        assert paged == everything, (sort, descending)
+        assert len(everything) == len(rates)
+        # NULLs come last in either direction.
+        leading = [values[0] for values in everything]
+        known = [value for value in leading if value is not None]
+        assert leading == known + [None] * (len(leading) - len(known))
+        assert known == sorted(known, reverse=descending)
+        # Later pages seek the sort index instead of sorting the rest of the table.
+        assert "SEARCH plans USING INDEX ix_plans_" in plan, plan
+        assert "TEMP B-TREE" not in plan, plan
+
+
+def test_upsert_plans_records_history_only_on_price_change(session_factory):
+    async def scenario():
+        async with session_factory() as session:
+            provider = await crud.upsert_provider(
+                session, schemas.ProviderCreate(name="Acme", slug="acme")
+            )
+            for rate in (10.0, 10.0, 10.0, 9.0):
+                await crud.upsert_plans(session, provider, [make_plan("Saver", rate)])
+            await session.commit()
+
+            plan = (await crud.list_plans(session))[0]
+            rows = await crud.stream_price_history(session, plan)
+            return [entry.rate_cents_kwh async for entry in rows]
+
+    assert asyncio.run(scenario()) == [10.0, 9.0]
+
+
+def test_provider_leases_spread_scheduled_work_across_replicas(session_factory):
+    from datetime import datetime, timedelta
+
+    async def claim(slugs, holder):
+        async with session_factory() as session:
+            claimed = [
+                slug
+                for slug in slugs
+                if await crud.acquire_lease(session, crud.provider_lease_name(slug), holder, 3600)
+            ]
+            await session.commit()
+        return claimed
+
+    async def scenario():
+        now = datetime(2024, 1, 1, 12, 0, 0)
+        first = await claim(["txu", "gexa"], "replica-a")
+        second = await claim(["txu", "gexa", "reliant"], "replica-b")
+        async with session_factory() as session:
+            renewed = await crud.acquire_lease(session, "scrape:txu", "replica-a", 3600)
+            later = datetime.utcnow() + timedelta(hours=2)
+            taken_over = await crud.acquire_lease(
+                session, "scrape:gexa", "replica-b", 3600, now=later
+            )
+            await crud.release_lease(session, "scrape:reliant", "replica-b")
+            freed = await crud.acquire_lease(session, "scrape:reliant", "replica-a", 60, now=now)
+            await session.commit()
+            holders = dict(
+                (await session.execute(select(models.Lease.name, models.Lease.holder))).all()
+            )
+        return first, second, renewed, taken_over, freed, holders
+
+    first, second, renewed, taken_over, freed, holders = asyncio.run(scenario())
+    assert first == ["txu", "gexa"]
+    assert second == ["reliant"]
+    assert renewed is True
+    assert taken_over is True
+    assert freed is True
+    assert holders == {
+        "scrape:txu": "replica-a",
+        "scrape:gexa": "replica-b",
+        "scrape:reliant": "replica-a",
+    }
@@ -0,0 +1,24 @@
+from backend.metrics import Registry
+
+
+def test_histogram_renders_cumulative_buckets():
+    registry = Registry()
+    histogram = registry.histogram("op_seconds", "Operation time.", ["op"], buckets=(0.1, 1.0))
+    histogram.observe(0.05, "read")
+    histogram.observe(0.5, "read")
+    histogram.observe(5.0, "read")
+
+    lines = registry.render().splitlines()
+    assert lines[:2] == ["# HELP op_seconds Operation time.", "# TYPE op_seconds histogram"]
+    assert 'op_seconds_bucket{op="read",le="0.1"} 1' in lines
+    assert 'op_seconds_bucket{op="read",le="1.0"} 2' in lines
+    assert 'op_seconds_bucket{op="read",le="+Inf"} 3' in lines
+    assert 'op_seconds_sum{op="read"} 5.55' in lines
+    assert 'op_seconds_count{op="read"} 3' in lines
+
+
+def test_counter_escapes_label_values():
+    registry = Registry()
+    counter = registry.counter("events_total", "Events.", ["name"])
+    counter.inc('say "hi"', amount=2)
+    assert 'events_total{name="say \\"hi\\""} 2' in registry.render()
@@ -0,0 +1,48 @@
+import asyncio
+import random
+
+from backend import scheduler as scheduler_module
+from backend.config import get_settings
+from backend.scheduler import ProviderSchedule, jittered_seconds, schedule_jobs, shutdown_scheduler
+
+
+def test_schedule_backs_off_while_unchanged_and_resets_on_change():
+    schedule = ProviderSchedule(
+        slug="txu", interval_minutes=60, min_interval_minutes=30, max_interval_minutes=300
+    )
+
+    assert [schedule.record("unchanged") for _ in range(4)] == [120, 240, 300, 300]
+    assert schedule.record("error") == 300
+    assert schedule.record("ok") == 30
+    assert schedule.record("unchanged") == 60
+
+
+def test_configured_interval_is_clamped_into_bounds():
+    schedule = ProviderSchedule(
+        slug="gexa", interval_minutes=5, min_interval_minutes=30, max_interval_minutes=300
+    )
+    assert schedule.record(None) == 30
+
+
+def test_jitter_stays_within_fraction():
+    rng = random.Random(3)
+    delays = [jittered_seconds(60, 0.1, rng) for _ in range(500)]
+    assert min(delays) >= 3240 and max(delays) <= 3960
+    assert max(delays) - min(delays) > 300
+
+
+def test_scheduler_periodically_resumes_orphaned_scrape_jobs(monkeypatch):
+    settings = get_settings()
+    monkeypatch.setattr(settings, "scheduler_enabled", True)
+    monkeypatch.setattr(settings, "scrape_providers", [])
+
+    async def scenario():
+        await schedule_jobs()
+        try:
+            job = scheduler_module.scheduler.get_job("resume-scrape-jobs")
+            return job.trigger.interval.total_seconds()
+        finally:
+            await shutdown_scheduler()
+
+    interval = asyncio.new_event_loop().run_until_complete(scenario())
+    assert interval == settings.scrape_job_lease_seconds
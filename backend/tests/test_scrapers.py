@@ -1,7 +1,10 @@
+import asyncio
+
 import pytest
 
 from backend.scrapers.direct_energy import DirectEnergyScraper
 from backend.scrapers.gexa import GexaScraper
+from backend.scrapers.parsers import available_backends, resolve_backend
 from backend.scrapers.reliant import ReliantScraper
 from backend.scrapers.txu import TXUScraper
 
@@ -18,3 +21,362 @@ def test_scraper_returns_plans(scraper_cls):
     for plan in result.plans:
         assert plan.name
         assert plan.rate_cents_kwh is not None
+
+
+@pytest.mark.parametrize(
+    "scraper_cls",
+    [TXUScraper, ReliantScraper, GexaScraper, DirectEnergyScraper],
+)
+def test_scraper_parses_synthetic_benchmark_page(scraper_cls):
+    from backend.benchmarks.synthetic import render_provider_page
+
+    page = render_provider_page(scraper_cls.provider_slug, 25)
+    result = scraper_cls().parse(page)
+    assert len(result.plans) == 25
+    assert len({plan.name for plan in result.plans}) == 25
+
+
+@pytest.mark.parametrize("backend", available_backends())
+@pytest.mark.parametrize(
+    "scraper_cls",
+    [TXUScraper, ReliantScraper, GexaScraper, DirectEnergyScraper],
+)
+def test_parser_backends_extract_identical_plans(scraper_cls, backend):
+    from backend.benchmarks.synthetic import render_provider_page
+
+    page = render_provider_page(scraper_cls.provider_slug, 10)
+    for html in (None, page):
+        expected = scraper_cls(parser_backend="bs4").parse(html)
+        assert scraper_cls(parser_backend=backend).parse(html) == expected
+
+
+def test_unknown_parser_backend_is_rejected():
+    assert resolve_backend("auto") == available_backends()[0]
+    with pytest.raises(ValueError, match="not available"):
+        resolve_backend("html5lib-turbo")
+
+
+def test_scrape_skips_parse_when_page_not_modified(monkeypatch):
+    import asyncio
+    import threading
+    from concurrent.futures import ThreadPoolExecutor
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    from backend.scrapers import executor
+    from backend.scrapers.fetch import HttpFetcher
+
+    # StubScraper counts parse calls on its class, so parse in this process.
+    pool = ThreadPoolExecutor(max_workers=1)
+    monkeypatch.setattr(executor, "_executor", pool)
+
+    requests_seen = []
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            requests_seen.append(self.headers.get("If-None-Match"))
+            if self.headers.get("If-None-Match") == '"v1"':
+                self.send_response(304)
+                self.send_header("ETag", '"v1"')
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            body = b"<html></html>"
+            self.send_response(200)
+            self.send_header("ETag", '"v1"')
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    class StubScraper(TXUScraper):
+        source_url = f"http://127.0.0.1:{server.server_address[1]}/rates"
+        parse_calls = 0
+
+        def parse(self, html=None):
+            StubScraper.parse_calls += 1
+            return super().parse()
+
+    async def scrape_three_times():
+        fetcher = HttpFetcher()
+        try:
+            scraper = StubScraper(fetcher)
+            first = await scraper.scrape()
+            # Not stored yet (e.g. the persist failed): fetch the full page again.
+            second = await scraper.scrape()
+            scraper.confirm_fetch()
+            return first, second, await scraper.scrape()
+        finally:
+            await fetcher.aclose()
+
+    try:
+        first, second, third = asyncio.run(scrape_three_times())
+    finally:
+        server.shutdown()
+        pool.shutdown()
+
+    assert first is not None and first.plans
+    assert second is not None and second.plans
+    assert third is None
+    assert StubScraper.parse_calls == 2
+    assert requests_seen == [None, None, '"v1"']
+
+
+def test_configured_source_url_routes_a_builtin_scraper_through_the_fetcher(monkeypatch):
+    import threading
+    from concurrent.futures import ThreadPoolExecutor
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    from backend.config import get_settings
+    from backend.scrapers import executor, txu
+    from backend.scrapers.fetch import HttpFetcher
+
+    monkeypatch.setattr(executor, "_executor", ThreadPoolExecutor(max_workers=1))
+    page = txu._SAMPLE_HTML.replace("Smart Edge 12", "Live Edge 12").encode()
+    paths = []
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            paths.append(self.path)
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(page)))
+            self.end_headers()
+            self.wfile.write(page)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/rates"
+    monkeypatch.setattr(get_settings(), "scrape_source_urls", {"txu": url})
+
+    async def scrape():
+        fetcher = HttpFetcher()
+        try:
+            return await TXUScraper(fetcher).scrape()
+        finally:
+            await fetcher.aclose()
+
+    try:
+        result = asyncio.run(scrape())
+    finally:
+        server.shutdown()
+        executor._executor.shutdown()
+
+    assert TXUScraper.page_url() == url and ReliantScraper.page_url() is None
+    assert paths == ["/rates"]
+    assert [plan.name for plan in result.plans] == ["Live Edge 12", "Flex Saver 24"]
+
+
+@pytest.mark.parametrize(
+    "scraper_cls",
+    [TXUScraper, ReliantScraper, GexaScraper, DirectEnergyScraper],
+)
+def test_empty_page_is_not_replaced_by_sample_markup(scraper_cls):
+    assert scraper_cls().parse("").plans == []
+
+
+def test_process_pool_parsing_keeps_event_loop_responsive(monkeypatch):
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+
+    from backend.benchmarks.synthetic import render_provider_page
+    from backend.scrapers import executor
+
+    pool = ProcessPoolExecutor(max_workers=2, mp_context=multiprocessing.get_context("spawn"))
+    monkeypatch.setattr(executor, "_executor", pool)
+    page = render_provider_page("txu", 1500)
+
+    async def scenario():
+        ticks = 0
+        done = asyncio.Event()
+
+        async def ticker():
+            nonlocal ticks
+            while not done.is_set():
+                ticks += 1
+                await asyncio.sleep(0.001)
+
+        tick_task = asyncio.create_task(ticker())
+        try:
+            result = await TXUScraper(parser_backend="bs4").parse_off_loop(page)
+        finally:
+            done.set()
+            await tick_task
+        return result, ticks
+
+    try:
+        result, ticks = asyncio.run(scenario())
+    finally:
+        pool.shutdown()
+
+    assert result == TXUScraper(parser_backend="bs4").parse(page)
+    assert ticks > 10
+
+
+@pytest.fixture
+def fast_fetch_policy(monkeypatch):
+    from backend.config import get_settings
+
+    monkeypatch.setenv("HTTP_MIN_REQUEST_INTERVAL_SECONDS", "0")
+    monkeypatch.setenv("HTTP_BACKOFF_BASE_SECONDS", "0")
+    monkeypatch.setenv("HTTP_MAX_RETRIES", "2")
+    monkeypatch.setenv("HTTP_BREAKER_FAILURE_THRESHOLD", "3")
+    get_settings.cache_clear()  # type: ignore[attr-defined]
+    yield
+    get_settings.cache_clear()  # type: ignore[attr-defined]
+
+
+def test_fetch_retries_server_errors(fast_fetch_policy):
+    import httpx
+
+    from backend.scrapers.fetch import HttpFetcher
+
+    statuses = [503, 502, 200]
+
+    def handler(request):
+        return httpx.Response(statuses.pop(0), text="<html></html>")
+
+    async def fetch():
+        fetcher = HttpFetcher(transport=httpx.MockTransport(handler))
+        try:
+            response = await fetcher.fetch("http://provider.test/rates")
+            return response, fetcher.breaker_state("http://provider.test/rates")
+        finally:
+            await fetcher.aclose()
+
+    response, state = asyncio.run(fetch())
+    assert response.status_code == 200
+    assert statuses == []
+    assert state == "closed"
+
+
+def test_circuit_opens_after_repeated_failures(fast_fetch_policy):
+    import httpx
+
+    from backend.scrapers.fetch import HttpFetcher
+    from backend.scrapers.policy import CircuitOpenError
+
+    calls = 0
+
+    def handler(request):
+        nonlocal calls
+        calls += 1
+        raise httpx.ConnectError("connection refused", request=request)
+
+    async def fetch_twice():
+        fetcher = HttpFetcher(transport=httpx.MockTransport(handler))
+        try:
+            with pytest.raises(httpx.ConnectError):
+                await fetcher.fetch("http://down.test/rates")
+            with pytest.raises(CircuitOpenError):
+                await fetcher.fetch("http://down.test/rates")
+            return fetcher.breaker_state("http://down.test/other")
+        finally:
+            await fetcher.aclose()
+
+    assert asyncio.run(fetch_twice()) == "open"
+    # Three attempts open the breaker; the second fetch never reaches the network.
+    assert calls == 3
+
+
+def test_host_policy_spaces_requests():
+    import time
+
+    from backend.scrapers.policy import CircuitBreaker, HostPolicy
+
+    policy = HostPolicy(
+        max_concurrency=4,
+        min_interval_seconds=0.05,
+        breaker=CircuitBreaker(failure_threshold=1, cooldown_seconds=1),
+    )
+    entered = []
+
+    async def request():
+        async with policy:
+            entered.append(time.monotonic())
+
+    async def burst():
+        await asyncio.gather(*(request() for _ in range(4)))
+
+    asyncio.run(burst())
+    gaps = [later - earlier for earlier, later in zip(entered, entered[1:])]
+    assert all(gap >= 0.04 for gap in gaps)
+
+
+def test_scraper_registry_imports_scrapers_on_first_use():
+    import subprocess
+    import sys
+
+    script = (
+        "import sys\n"
+        "from backend.scrapers.runner import SCRAPER_REGISTRY\n"
+        "assert 'txu' in SCRAPER_REGISTRY and not SCRAPER_REGISTRY.is_loaded('txu')\n"
+        "assert 'backend.scrapers.txu' not in sys.modules and 'bs4' not in sys.modules\n"
+        "assert SCRAPER_REGISTRY['txu'].provider_slug == 'txu'\n"
+        "assert SCRAPER_REGISTRY.is_loaded('txu') and 'backend.scrapers.txu' in sys.modules\n"
+    )
+    subprocess.run([sys.executable, "-c", script], check=True)
+
+
+def test_scraper_registry_loads_string_references():
+    from backend.scrapers.registry import ScraperRegistry
+
+    registry = ScraperRegistry({"gexa": "backend.scrapers.gexa:GexaScraper"}, group=None)
+    registry["txu"] = "backend.scrapers.txu:TXUScraper"
+    assert sorted(registry) == ["gexa", "txu"]
+    assert registry["txu"] is TXUScraper
+    assert registry.get("missing") is None
+
+
+def test_cancelled_trial_request_reopens_the_circuit(fast_fetch_policy, monkeypatch):
+    import httpx
+
+    from backend.config import get_settings
+    from backend.scrapers.fetch import HttpFetcher
+
+    monkeypatch.setenv("HTTP_BREAKER_FAILURE_THRESHOLD", "1")
+    monkeypatch.setenv("HTTP_BREAKER_COOLDOWN_SECONDS", "0.05")
+    monkeypatch.setenv("HTTP_MAX_RETRIES", "0")
+    get_settings.cache_clear()  # type: ignore[attr-defined]
+    responses = ["error", "hang", "ok"]
+
+    async def handler(request):
+        outcome = responses.pop(0)
+        if outcome == "error":
+            return httpx.Response(503)
+        if outcome == "hang":
+            await asyncio.sleep(10)
+        return httpx.Response(200, text="<html></html>")
+
+    async def scenario():
+        url = "http://flaky.test/rates"
+        fetcher = HttpFetcher(transport=httpx.MockTransport(handler))
+        try:
+            with pytest.raises(httpx.HTTPStatusError):
+                await fetcher.fetch(url)
+            await asyncio.sleep(0.06)
+            assert fetcher.breaker_state(url) == "half_open"
+            with pytest.raises(asyncio.TimeoutError):
+                await asyncio.wait_for(fetcher.fetch(url), 0.05)
+            states = [fetcher.breaker_state(url)]
+            await asyncio.sleep(0.06)
+            response = await fetcher.fetch(url)
+            return states + [fetcher.breaker_state(url)], response.status_code
+        finally:
+            await fetcher.aclose()
+
+    states, status_code = asyncio.run(scenario())
+    assert states == ["open", "closed"]
+    assert status_code == 200
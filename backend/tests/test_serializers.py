@@ -0,0 +1,40 @@
+from datetime import datetime
+
+from backend import models, serializers
+from backend.routes import plans as plan_routes
+
+
+def test_fast_plan_serializer_matches_pydantic_path_byte_for_byte(monkeypatch):
+    plans = [
+        models.Plan(
+            id=1,
+            provider_id=1,
+            name="Saver 12",
+            term_months=12,
+            rate_cents_kwh=1240.0,
+            base_fee=9.95,
+            cancellation_fee=150.0,
+            renewable_percentage=25,
+            features="Free nights",
+            url="https://example.com",
+            last_scraped_at=datetime(2024, 5, 1, 12, 30, 15, 123456),
+        ),
+        models.Plan(
+            id=2,
+            provider_id=2,
+            name="Énergie inconnue",
+            last_scraped_at=datetime(2024, 5, 1),
+        ),
+    ]
+
+    for encoder in (serializers.orjson, None):
+        monkeypatch.setattr(serializers, "orjson", encoder)
+        for benchmark in ("txu", "gexa"):
+            expected = b"[%s]" % b",".join(
+                plan_routes._with_savings(plan, benchmark, 1000, 130.0).model_dump_json().encode()
+                for plan in plans
+            )
+            rendered = serializers.render_plans(
+                plans, benchmark=benchmark, usage_kwh=1000, benchmark_cost=130.0
+            )
+            assert rendered == expected
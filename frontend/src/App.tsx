@@ -38,6 +38,9 @@ export const App = () => {
     selectedPlans,
     setSelectedPlans,
     loading,
+    loadingMore,
+    hasMore,
+    loadMore,
   } = usePlans();
   const plans = useMemo(
     () =>
@@ -155,6 +158,14 @@ export const App = () => {
             loading={loading}
           />
 
+          {hasMore && !loading && (
+            <Box display="flex" justifyContent="center">
+              <Button variant="outlined" onClick={loadMore} disabled={loadingMore}>
+                {loadingMore ? 'Loading…' : 'Load more plans'}
+              </Button>
+            </Box>
+          )}
+
           {!!plans.length && <RateChart plans={plans.slice(0, 5)} benchmarkRate={benchmarkRate} />}
         </Box>
       </Container>
@@ -1,9 +1,11 @@
-import { useCallback, useEffect, useMemo, useState } from 'react';
+import { useCallback, useEffect, useRef, useState } from 'react';
 import axios from 'axios';
 
 import { Plan, Provider } from '../types';
 
 const API_BASE = import.meta.env.VITE_API_BASE ?? 'http://localhost:8000';
+const PAGE_SIZE = 100;
+const FILTER_DEBOUNCE_MS = 300;
 
 export interface Filters {
   providerIds: number[];
@@ -12,6 +14,20 @@ export interface Filters {
   maxRate?: number;
 }
 
+const planParams = (filters: Filters) => {
+  const params = new URLSearchParams();
+  filters.providerIds.forEach((id) => params.append('provider_id', String(id)));
+  filters.terms.forEach((term) => params.append('term', String(term)));
+  if (filters.renewableOnly) {
+    params.set('min_renewable', '50');
+  }
+  if (filters.maxRate) {
+    params.set('max_rate', String(filters.maxRate));
+  }
+  params.set('limit', String(PAGE_SIZE));
+  return params;
+};
+
 export const usePlans = () => {
   const [plans, setPlans] = useState<Plan[]>([]);
   const [providers, setProviders] = useState<Provider[]>([]);
@@ -22,51 +38,95 @@ export const usePlans = () => {
   });
   const [selectedPlans, setSelectedPlans] = useState<number[]>([]);
   const [loading, setLoading] = useState(false);
+  const [loadingMore, setLoadingMore] = useState(false);
+  const [nextCursor, setNextCursor] = useState<string | undefined>();
+  const [reloads, setReloads] = useState(0);
+  // Aborting this controller cancels every request made for the current filters.
+  const requestRef = useRef<AbortController | null>(null);
 
-  const loadData = useCallback(async () => {
-    setLoading(true);
-    try {
-      const [plansRes, providersRes] = await Promise.all([
-        axios.get<Plan[]>(`${API_BASE}/plans`),
-        axios.get<Provider[]>(`${API_BASE}/providers`),
-      ]);
-      setPlans(plansRes.data);
-      setProviders(providersRes.data);
-    } finally {
-      setLoading(false);
-    }
-  }, []);
+  const fetchPage = useCallback(
+    async (cursor: string | undefined, signal: AbortSignal) => {
+      const params = planParams(filters);
+      if (cursor) {
+        params.set('cursor', cursor);
+      }
+      const response = await axios.get<Plan[]>(`${API_BASE}/plans`, { params, signal });
+      return { page: response.data, cursor: response.headers['x-next-cursor'] as string | undefined };
+    },
+    [filters]
+  );
 
   useEffect(() => {
-    loadData();
-  }, [loadData]);
+    const controller = new AbortController();
+    axios
+      .get<Provider[]>(`${API_BASE}/providers`, { signal: controller.signal })
+      .then((response) => setProviders(response.data))
+      .catch((error) => {
+        if (!axios.isCancel(error)) {
+          throw error;
+        }
+      });
+    return () => controller.abort();
+  }, []);
 
-  const filteredPlans = useMemo(() => {
-    return plans.filter((plan) => {
-      if (filters.providerIds.length && !filters.providerIds.includes(plan.provider_id)) {
-        return false;
-      }
-      if (filters.terms.length && plan.term_months && !filters.terms.includes(plan.term_months)) {
-        return false;
-      }
-      if (filters.renewableOnly && (plan.renewable_percentage ?? 0) < 50) {
-        return false;
+  useEffect(() => {
+    const controller = new AbortController();
+    requestRef.current = controller;
+    setLoading(true);
+    // Wait for the filters to settle so typing a rate does not fire a request per keystroke.
+    const timer = setTimeout(async () => {
+      try {
+        const { page, cursor } = await fetchPage(undefined, controller.signal);
+        setPlans(page);
+        setNextCursor(cursor);
+      } catch (error) {
+        if (!axios.isCancel(error)) {
+          throw error;
+        }
+      } finally {
+        if (!controller.signal.aborted) {
+          setLoading(false);
+        }
       }
-      if (filters.maxRate && plan.rate_cents_kwh && plan.rate_cents_kwh > filters.maxRate) {
-        return false;
+    }, FILTER_DEBOUNCE_MS);
+    return () => {
+      clearTimeout(timer);
+      controller.abort();
+    };
+  }, [fetchPage, reloads]);
+
+  const loadMore = useCallback(async () => {
+    const controller = requestRef.current;
+    if (!controller || !nextCursor || loadingMore) {
+      return;
+    }
+    setLoadingMore(true);
+    try {
+      const { page, cursor } = await fetchPage(nextCursor, controller.signal);
+      setPlans((current) => [...current, ...page]);
+      setNextCursor(cursor);
+    } catch (error) {
+      if (!axios.isCancel(error)) {
+        throw error;
       }
-      return true;
-    });
-  }, [plans, filters]);
+    } finally {
+      setLoadingMore(false);
+    }
+  }, [fetchPage, nextCursor, loadingMore]);
+
+  const reload = useCallback(() => setReloads((count) => count + 1), []);
 
   return {
-    plans: filteredPlans,
+    plans,
     providers,
     filters,
     setFilters,
     selectedPlans,
     setSelectedPlans,
     loading,
-    reload: loadData,
+    loadingMore,
+    hasMore: nextCursor !== undefined,
+    loadMore,
+    reload,
   };
 };
@@ -1,12 +1,27 @@
-"""Run a query in Snowflake, export the results to CSV, and load them into SQL Server.
+"""Run a query in Snowflake, export the results to Parquet or CSV, and load them into SQL Server.
 
 Edit the connection details for Snowflake and SQL Server before running.
+
+Results are streamed: batches are fetched from Snowflake on a background
+thread and handed to the file and SQL Server sinks through a small bounded
+queue, so memory stays at a few batches however large the extract is.
 """
 
+import datetime
+import decimal
 import os
+import queue
+import threading
+from typing import Iterable, Iterator, List
+
 import pandas as pd
-import snowflake.connector
-import pyodbc
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.parquet as pq
+except ImportError:  # CSV exports and row batches work without pyarrow
+    pa = None
 
 # Snowflake connection information - replace with your credentials
 SNOWFLAKE_ACCOUNT = 'YOUR_ACCOUNT'
@@ -24,21 +39,50 @@ SQL_SERVER_CONNECTION_STRING = (
     'Trusted_Connection=yes;'
 )
 
-# Path to save the CSV file
+# Directory for the exported files
 CSV_PATH = (
     r"C:\Users\mp311723\OneDrive - Vistra Corp\SQL SSMS\DGL_Repository"
 )
 
+# 'parquet' writes a partitioned, compressed dataset; 'csv' one flat file per run
+EXPORT_FORMAT = 'parquet'
+# Parquet files are partitioned by the month of this date column
+PARQUET_PARTITION_COLUMN = 'CALL_DT'
+PARQUET_COMPRESSION = 'zstd'
+PARQUET_ROW_GROUP_SIZE = 100_000
+
+# Rows per batch when the connector cannot return Arrow batches itself.
+BATCH_SIZE = 50_000
+# Batches fetched ahead of the sinks; bounds how far fetching can run ahead.
+QUEUE_DEPTH = 2
+
 SNOWFLAKE_QUERY = (
     "SELECT *\n"
     "FROM RETAIL_PRD.USERDB_RESMKT.CALL_CENTER_REPORT_AUTO\n"
     "WHERE CALL_DT > '2024-01-01'"
 )
+SNOWFLAKE_INCREMENTAL_QUERY = (
+    "SELECT *\n"
+    "FROM RETAIL_PRD.USERDB_RESMKT.CALL_CENTER_REPORT_AUTO\n"
+    "WHERE CALL_DT >= %(watermark)s"
+)
+
+# SQL Server target table in the Skywalker database (dbo schema)
+TARGET_TABLE = 'MP_SnowflakeData'
+# 'incremental' extracts rows past the stored high-water mark and merges them;
+# 'full' reloads everything into a shadow table and swaps it in
+LOAD_MODE = 'incremental'
+WATERMARK_COLUMN = 'CALL_DT'
+# Columns identifying a row for MERGE; leave empty to replace the extracted
+# CALL_DT window instead
+MERGE_KEY_COLUMNS: List[str] = []
+
 
+def connect_to_snowflake():
+    """Open a Snowflake connection with the configured credentials."""
+    import snowflake.connector
 
-def fetch_from_snowflake() -> pd.DataFrame:
-    """Retrieve data from Snowflake and return it as a DataFrame."""
-    conn = snowflake.connector.connect(
+    return snowflake.connector.connect(
         user=SNOWFLAKE_USER,
         password=SNOWFLAKE_PASSWORD,
         account=SNOWFLAKE_ACCOUNT,
@@ -46,22 +90,499 @@ def fetch_from_snowflake() -> pd.DataFrame:
         database=SNOWFLAKE_DATABASE,
         schema=SNOWFLAKE_SCHEMA,
     )
+
+
+def fetch_from_snowflake(conn, batch_size: int = BATCH_SIZE, since: str | None = None) -> Iterator:
+    """Run the query and yield the result as a sequence of batches.
+
+    With a ``since`` watermark only rows at or after it are extracted; rows at
+    the watermark itself are fetched again so late arrivals are not missed.
+
+    Batches are Arrow tables when pyarrow is installed, and DataFrames
+    otherwise. Arrow batches all share one schema taken from the result's
+    column metadata, so nullable integers, dates and timestamps keep their
+    Snowflake types even when a batch holds only NULLs in a column or the
+    connector picks a narrower integer width for one chunk. An integer column
+    only becomes decimal once one of its values overflows int64 (see
+    :func:`conform`).
+    """
+    from snowflake.connector.errors import NotSupportedError
+
+    cursor = conn.cursor()
     try:
-        df = pd.read_sql(SNOWFLAKE_QUERY, conn)
+        if since is None:
+            cursor.execute(SNOWFLAKE_QUERY)
+        else:
+            cursor.execute(SNOWFLAKE_INCREMENTAL_QUERY, {'watermark': since})
+        try:
+            # Arrow result chunks straight from the connector (needs pyarrow).
+            batches = cursor.fetch_arrow_batches()
+        except (ImportError, NotSupportedError):
+            batches = None
+        schema = arrow_schema(cursor.description) if pa is not None else None
+        if batches is not None:
+            for batch in batches:
+                table, schema = conform(batch, schema)
+                yield table
+            return
+
+        columns = [column[0] for column in cursor.description]
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                return
+            frame = pd.DataFrame.from_records(rows, columns=columns)
+            if schema is None:
+                yield frame
+            else:
+                table, schema = conform(frame, schema)
+                yield table
     finally:
-        conn.close()
-    return df
+        cursor.close()
 
 
-def save_to_csv(df: pd.DataFrame) -> str:
-    """Save the DataFrame to a CSV file and return the path."""
-    os.makedirs(CSV_PATH, exist_ok=True)
-    csv_file = os.path.join(
-        CSV_PATH,
-        f"snowflake_export_{pd.Timestamp.now().strftime('%Y%m%d')}.csv",
+# Snowflake result type codes (snowflake.connector.constants.FIELD_TYPES)
+_TIMESTAMP_UNITS = {0: 's', 3: 'ms', 6: 'us', 9: 'ns'}
+
+
+def arrow_type(type_code: int, precision: int | None, scale: int | None) -> "pa.DataType":
+    """Arrow type for one Snowflake result column.
+
+    Snowflake reports every integer column as NUMBER(38,0), so scale-0 numbers
+    are read as int64; :func:`conform` widens a column that overflows it.
+    """
+    if type_code == 0:  # FIXED
+        if not scale:
+            return pa.int64()
+        return pa.decimal128(precision, scale)
+    if type_code == 1:  # REAL
+        return pa.float64()
+    if type_code == 3:  # DATE
+        return pa.date32()
+    if type_code in (4, 8):  # TIMESTAMP, TIMESTAMP_NTZ
+        return pa.timestamp(_TIMESTAMP_UNITS.get(scale, 'ns'))
+    if type_code in (6, 7):  # TIMESTAMP_LTZ, TIMESTAMP_TZ
+        return pa.timestamp(_TIMESTAMP_UNITS.get(scale, 'ns'), tz='UTC')
+    if type_code == 11:  # BINARY
+        return pa.large_binary()
+    if type_code == 12:  # TIME
+        return pa.time64('ns')
+    if type_code == 13:  # BOOLEAN
+        return pa.bool_()
+    return pa.large_string()  # TEXT, VARIANT, OBJECT, ARRAY
+
+
+def arrow_schema(description) -> "pa.Schema":
+    """Arrow schema for a Snowflake cursor ``description``."""
+    return pa.schema(
+        pa.field(column.name, arrow_type(column.type_code, column.precision, column.scale))
+        for column in description
+    )
+
+
+def _to_arrow(batch, schema: "pa.Schema") -> "pa.Table":
+    if isinstance(batch, pd.DataFrame):
+        return pa.Table.from_pandas(batch, schema=schema, preserve_index=False)
+    return batch.cast(schema)
+
+
+def _fits_int64(column) -> bool:
+    try:
+        if isinstance(column, pd.Series):
+            pa.array(column, type=pa.int64(), from_pandas=True)
+        else:
+            pc.cast(column, pa.int64())
+    except (pa.ArrowInvalid, OverflowError):
+        return False
+    return True
+
+
+def conform(batch, schema: "pa.Schema"):
+    """Convert ``batch`` to ``schema`` and return it with the schema for later batches.
+
+    An int64 column holding a value outside the int64 range switches to
+    decimal128(38, 0) instead of failing; the widened schema is returned so
+    the rest of the run keeps it.
+    """
+    try:
+        return _to_arrow(batch, schema), schema
+    except (pa.ArrowInvalid, OverflowError):
+        pass
+    widened = pa.schema(
+        field.with_type(pa.decimal128(38, 0))
+        if pa.types.is_int64(field.type) and not _fits_int64(batch[field.name])
+        else field
+        for field in schema
+    )
+    return _to_arrow(batch, widened), widened
+
+
+_NULLABLE_INTEGERS = {8: pd.Int8Dtype(), 16: pd.Int16Dtype(), 32: pd.Int32Dtype(), 64: pd.Int64Dtype()}
+
+
+def nullable_integers(data_type):
+    """``types_mapper`` that keeps integer columns with NULLs from turning into floats."""
+    if pa.types.is_signed_integer(data_type):
+        return _NULLABLE_INTEGERS[data_type.bit_width]
+    return None
+
+
+_DONE = object()
+
+
+def _put(out: queue.Queue, item, stop: threading.Event) -> bool:
+    """Put ``item`` on ``out`` unless the consumer has stopped; return whether it was put."""
+    while not stop.is_set():
+        try:
+            out.put(item, timeout=0.5)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def _produce(batches: Iterable, out: queue.Queue, stop: threading.Event) -> None:
+    try:
+        for batch in batches:
+            if not _put(out, batch, stop):
+                return
+    except BaseException as exc:  # re-raised in the consuming thread
+        _put(out, exc, stop)
+        return
+    _put(out, _DONE, stop)
+
+
+def prefetch(batches: Iterable, depth: int = QUEUE_DEPTH) -> Iterator:
+    """Iterate ``batches`` on a background thread, keeping at most ``depth`` ready.
+
+    Fetching the next batch overlaps with writing the current one, while the
+    bounded queue keeps the fetcher from running ahead of slow sinks.
+    """
+    out: queue.Queue = queue.Queue(maxsize=depth)
+    stop = threading.Event()
+    worker = threading.Thread(
+        target=_produce, args=(batches, out, stop), name="snowflake-fetch", daemon=True
+    )
+    worker.start()
+    try:
+        while True:
+            item = out.get()
+            if item is _DONE:
+                return
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+    finally:
+        stop.set()
+        worker.join()
+
+
+def as_frame(batch) -> pd.DataFrame:
+    """Return ``batch`` as a DataFrame, converting Arrow tables."""
+    return batch if isinstance(batch, pd.DataFrame) else batch.to_pandas()
+
+
+def as_table(batch) -> "pa.Table":
+    """Return ``batch`` as an Arrow table, converting DataFrames."""
+    if isinstance(batch, pd.DataFrame):
+        return pa.Table.from_pandas(batch, preserve_index=False)
+    return batch
+
+
+def sql_frame(batch) -> pd.DataFrame:
+    """Return ``batch`` as a DataFrame whose dtypes map to numeric SQL columns.
+
+    Decimal values (NUMBER columns with a scale, or integers past int64) become
+    floats and integer columns with NULLs stay integers, so the load table gets
+    INT/FLOAT columns instead of NVARCHAR(MAX).
+    """
+    if isinstance(batch, pd.DataFrame):
+        decimals = {}
+        for name in batch.columns:
+            column = batch[name]
+            first = column.first_valid_index()
+            if column.dtype == object and first is not None and isinstance(column[first], decimal.Decimal):
+                decimals[name] = column.astype('float64')
+        return batch.assign(**decimals) if decimals else batch
+    columns = [
+        pc.cast(column, pa.float64()) if pa.types.is_decimal(column.type) else column
+        for column in batch.columns
+    ]
+    table = pa.table(columns, names=batch.column_names)
+    return table.to_pandas(types_mapper=nullable_integers)
+
+
+class CsvSink:
+    """Append batches to one CSV file, writing the header with the first batch.
+
+    Rows go to ``<path>.partial`` first; :meth:`close` moves the finished file
+    into place and :meth:`abort` deletes it, so a failed run leaves any
+    earlier export at ``path`` untouched.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.partial_path = f"{path}.partial"
+        self.started = False
+        self.rows = 0
+
+    def write(self, batch) -> None:
+        batch = as_frame(batch)
+        batch.to_csv(self.partial_path, mode="a" if self.started else "w", header=not self.started, index=False)
+        self.started = True
+        self.rows += len(batch)
+
+    def close(self) -> None:
+        if self.started:
+            os.replace(self.partial_path, self.path)
+
+    def abort(self) -> None:
+        if self.started and os.path.exists(self.partial_path):
+            os.remove(self.partial_path)
+
+
+NULL_PARTITION = '__HIVE_DEFAULT_PARTITION__'
+
+
+class ParquetSink:
+    """Write batches to a Hive-partitioned Parquet dataset under ``path``.
+
+    Rows go to ``<column>_MONTH=YYYY-MM/part-<run>.parquet`` by the month of
+    ``partition_column``. Every partition keeps one open writer, and each batch
+    is appended to it as new row groups, so no partition is held in memory.
+
+    With ``replace=True`` (full loads) the finished run replaces the whole
+    dataset. Otherwise (incremental loads) its files are added next to earlier
+    runs, and :func:`read_parquet_export` de-duplicates the overlap. Files are
+    written under a hidden ``.`` name and only renamed into the dataset by
+    :meth:`close`. :meth:`abort` removes them, so nothing is deleted or
+    published until a run succeeds.
+
+    Every file shares one schema. It is ``schema`` when given, otherwise the
+    first batch's schema with integers widened to int64, floats to float64 and
+    strings to large_string. Later batches are cast to it, and a batch whose
+    types cannot be widened into it raises ``ValueError`` instead of being
+    truncated. The one exception is an int64 column that overflowed into
+    decimal (see :func:`conform`): the run's files so far are rewritten with
+    the decimal column and later rows go to new files.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        partition_column: str = PARQUET_PARTITION_COLUMN,
+        compression: str = PARQUET_COMPRESSION,
+        row_group_size: int = PARQUET_ROW_GROUP_SIZE,
+        schema: "pa.Schema | None" = None,
+        replace: bool = True,
+        run_id: str | None = None,
+    ):
+        if pa is None:
+            raise RuntimeError("Parquet exports need pyarrow: pip install pyarrow")
+        self.path = path
+        self.replace = replace
+        # Sorts chronologically; read_parquet_export lets later runs win.
+        self.run_id = run_id or pd.Timestamp.now().strftime('%Y%m%dT%H%M%S%f')
+        self.partition_column = partition_column
+        self.partition_key = f"{partition_column}_MONTH"
+        self.compression = compression
+        self.row_group_size = row_group_size
+        self.schema = schema
+        self.writers = {}
+        self.files = []
+        self.rows = 0
+        # Bumped when the schema is widened mid-run; later rows go to new files.
+        self.generation = 0
+
+    def _partition_keys(self, table: "pa.Table") -> "pa.Array":
+        column = table[self.partition_column]
+        if not pa.types.is_timestamp(column.type):
+            column = pc.cast(column, pa.timestamp('s'))
+        return pc.strftime(column, format='%Y-%m')
+
+    def _writer(self, month: str):
+        writer = self.writers.get(month)
+        if writer is None:
+            directory = os.path.join(self.path, f"{self.partition_key}={month}")
+            os.makedirs(directory, exist_ok=True)
+            suffix = f"-{self.generation}" if self.generation else ""
+            file_name = os.path.join(directory, f"part-{self.run_id}{suffix}.parquet")
+            self.files.append(file_name)
+            writer = self.writers[month] = pq.ParquetWriter(
+                self._hidden(file_name),
+                self.schema,
+                compression=self.compression,
+            )
+        return writer
+
+    @staticmethod
+    def _hidden(file_name: str) -> str:
+        directory, name = os.path.split(file_name)
+        return os.path.join(directory, f".{name}")
+
+    @staticmethod
+    def _widen(schema: "pa.Schema") -> "pa.Schema":
+        def widen(data_type):
+            if pa.types.is_integer(data_type):
+                return pa.int64()
+            if pa.types.is_floating(data_type):
+                return pa.float64()
+            if pa.types.is_string(data_type):
+                return pa.large_string()
+            return data_type
+
+        return pa.schema(pa.field(f.name, widen(f.type)) for f in schema)
+
+    def _overflows_only(self, schema: "pa.Schema") -> bool:
+        """Whether ``schema`` only turns int64 columns of the current schema into decimals."""
+        if schema.names != self.schema.names:
+            return False
+        return all(
+            old.type == new.type or (pa.types.is_int64(old.type) and pa.types.is_decimal(new.type))
+            for old, new in zip(self.schema, schema)
+        )
+
+    def _rewrite(self, schema: "pa.Schema") -> None:
+        """Switch the run to ``schema``, rewriting the files written so far."""
+        self._close_writers()
+        for file_name in self.files:
+            hidden = self._hidden(file_name)
+            rewritten = f"{hidden}.rewrite"
+            source = pq.ParquetFile(hidden)
+            with pq.ParquetWriter(rewritten, schema, compression=self.compression) as writer:
+                for index in range(source.num_row_groups):
+                    writer.write_table(source.read_row_group(index).cast(schema))
+            os.replace(rewritten, hidden)
+        self.schema = schema
+        self.generation += 1
+
+    def write(self, batch) -> None:
+        table = as_table(batch)
+        if self.schema is None:
+            self.schema = self._widen(table.schema)
+        if table.schema != self.schema:
+            unified = pa.unify_schemas([self.schema, table.schema], promote_options='permissive')
+            if unified != self.schema:
+                if not self._overflows_only(unified):
+                    raise ValueError(
+                        f"Batch schema {table.schema} does not fit the export schema {self.schema}; "
+                        "pass an explicit schema (see arrow_schema)"
+                    )
+                self._rewrite(unified)
+            table = table.cast(self.schema)
+        keys = self._partition_keys(table)
+        for month in pc.unique(keys).to_pylist():
+            mask = pc.is_null(keys) if month is None else pc.equal(keys, month)
+            self._writer(month or NULL_PARTITION).write_table(
+                table.filter(mask), row_group_size=self.row_group_size
+            )
+        self.rows += table.num_rows
+
+    def _close_writers(self) -> None:
+        for writer in self.writers.values():
+            writer.close()
+        self.writers.clear()
+
+    def close(self) -> None:
+        self._close_writers()
+        if not self.files:
+            return  # nothing extracted; keep the existing dataset
+        if self.replace:
+            keep = set(self.files)
+            for root, _, names in os.walk(self.path):
+                for name in names:
+                    file_name = os.path.join(root, name)
+                    if not name.startswith('.') and file_name not in keep:
+                        os.remove(file_name)
+        for file_name in self.files:
+            os.replace(self._hidden(file_name), file_name)
+
+    def abort(self) -> None:
+        self._close_writers()
+        for file_name in self.files:
+            if os.path.exists(self._hidden(file_name)):
+                os.remove(self._hidden(file_name))
+
+
+def read_parquet_export(
+    path: str,
+    months: List[str] | None = None,
+    columns: List[str] | None = None,
+    partition_column: str = PARQUET_PARTITION_COLUMN,
+    key_columns: List[str] = MERGE_KEY_COLUMNS,
+) -> pd.DataFrame:
+    """Load an exported dataset, reading only the given months and columns.
+
+    ``months`` are ``'YYYY-MM'`` strings; partitions of other months are
+    skipped without being opened. Rows with a NULL partition column come back
+    with a NULL month.
+
+    Incremental runs re-extract the rows at the watermark, so runs overlap.
+    The newest run's version of a row wins: rows are matched on
+    ``key_columns``, or on all columns when no key is configured. Without a
+    key, only identical copies are dropped. A row that changed at the
+    watermark then appears in both versions.
+    """
+    import pyarrow.dataset as ds
+
+    partition_key = f"{partition_column}_MONTH"
+    # A plain string key: the inferred dictionary type cannot hold the NULL partition.
+    partitioning = ds.partitioning(pa.schema([(partition_key, pa.string())]), flavor='hive')
+    dataset = ds.dataset(path, format='parquet', partitioning=partitioning)
+    fragments = list(dataset.get_fragments(filter=ds.field(partition_key).isin(months) if months else None))
+    # Runs may differ where an integer column overflowed into decimal; read every file as the widest.
+    schema = pa.unify_schemas(
+        [dataset.schema, *(fragment.physical_schema for fragment in fragments)],
+        promote_options='permissive',
+    )
+    data_columns = [name for name in schema.names if name != partition_key]
+    if columns is None:
+        read_columns = schema.names
+    elif key_columns:
+        read_columns = list(dict.fromkeys([*columns, *key_columns]))
+    else:
+        read_columns = list(dict.fromkeys([*columns, *data_columns]))
+    tables = []
+    for fragment in fragments:
+        fragment_table = fragment.to_table(schema=schema, columns=read_columns)
+        run = pa.array([os.path.basename(fragment.path)] * fragment_table.num_rows, pa.string())
+        tables.append(fragment_table.append_column('__run', run))
+    if not tables:
+        return pd.DataFrame(columns=columns or schema.names)
+    table = pa.concat_tables(tables)
+    frame = table.to_pandas(types_mapper=nullable_integers, date_as_object=False)
+    frame = frame.sort_values('__run', kind='stable').drop_duplicates(
+        subset=key_columns or data_columns, keep='last'
     )
-    df.to_csv(csv_file, index=False)
-    return csv_file
+    frame = frame.drop(columns='__run')
+    if columns is not None:
+        frame = frame[columns]
+    return frame.reset_index(drop=True)
+
+
+def export_path(export_format: str = EXPORT_FORMAT) -> str:
+    """Create the export directory and return the dataset or today's CSV path.
+
+    The Parquet dataset is cumulative (incremental runs add to it), so its
+    name carries no date; each CSV holds one run's rows.
+    """
+    os.makedirs(CSV_PATH, exist_ok=True)
+    if export_format == 'parquet':
+        return os.path.join(CSV_PATH, 'snowflake_export')
+    return os.path.join(CSV_PATH, f"snowflake_export_{pd.Timestamp.now().strftime('%Y%m%d')}.csv")
+
+
+def export_sink(export_format: str = EXPORT_FORMAT, load_mode: str = 'full'):
+    """Return the file sink for ``export_format`` ('parquet' or 'csv').
+
+    For an incremental ``load_mode`` the Parquet sink adds the run's rows to
+    the dataset instead of replacing it.
+    """
+    if export_format == 'parquet':
+        return ParquetSink(export_path(export_format), replace=load_mode == 'full')
+    if export_format == 'csv':
+        return CsvSink(export_path(export_format))
+    raise ValueError(f"Unknown export format {export_format!r}; expected 'parquet' or 'csv'")
 
 
 def map_dtype_to_sql(dtype) -> str:
@@ -75,51 +596,307 @@ def map_dtype_to_sql(dtype) -> str:
     return 'NVARCHAR(MAX)'
 
 
-def create_sql_table(cursor, df: pd.DataFrame):
-    """Create Skywalker.dbo.MP_SnowflakeData with columns from the DataFrame."""
-    cursor.execute(
-        """
-        IF OBJECT_ID('Skywalker.dbo.MP_SnowflakeData', 'U') IS NOT NULL
-            DROP TABLE Skywalker.dbo.MP_SnowflakeData;
-        """
-    )
+class SqlServerDialect:
+    """SQL Server statements used by :class:`SqlServerSink`."""
 
-    columns = [
-        f"[{col}] {map_dtype_to_sql(dtype)}"
-        for col, dtype in zip(df.columns, df.dtypes)
-    ]
-    create_stmt = (
-        "CREATE TABLE Skywalker.dbo.MP_SnowflakeData (" +
-        ", ".join(columns) +
-        ")"
-    )
-    cursor.execute(create_stmt)
+    schema = 'dbo'
+
+    def qualify(self, table: str) -> str:
+        return f"{self.schema}.[{table}]"
+
+    def quote(self, column: str) -> str:
+        return f"[{column}]"
+
+    def column_type(self, dtype) -> str:
+        return map_dtype_to_sql(dtype)
+
+    def text_type(self) -> str:
+        return 'NVARCHAR(128)'
+
+    def table_exists(self, cursor, table: str) -> bool:
+        cursor.execute("SELECT OBJECT_ID(?, 'U')", (f"{self.schema}.{table}",))
+        return cursor.fetchone()[0] is not None
+
+    def begin(self, cursor) -> None:
+        """Start a transaction that also covers DDL (pyodbc already has one open)."""
+
+    def rename(self, cursor, table: str, new_name: str) -> None:
+        cursor.execute("EXEC sp_rename ?, ?", (f"{self.schema}.{table}", new_name))
 
+    def merge(self, target: str, staging: str, columns: List[str], keys: List[str]) -> List[str]:
+        q = self.quote
+        on = " AND ".join(f"target.{q(k)} = source.{q(k)}" for k in keys)
+        updates = ", ".join(f"target.{q(c)} = source.{q(c)}" for c in columns if c not in keys)
+        insert_columns = ", ".join(q(c) for c in columns)
+        source_columns = ", ".join(f"source.{q(c)}" for c in columns)
+        return [
+            f"MERGE {self.qualify(target)} AS target USING {self.qualify(staging)} AS source ON {on} "
+            + (f"WHEN MATCHED THEN UPDATE SET {updates} " if updates else "")
+            + f"WHEN NOT MATCHED BY TARGET THEN INSERT ({insert_columns}) VALUES ({source_columns});"
+        ]
 
-def insert_into_sql_server(df: pd.DataFrame):
-    """Insert DataFrame rows into the SQL Server table."""
-    with pyodbc.connect(SQL_SERVER_CONNECTION_STRING) as conn:
-        cursor = conn.cursor()
-        create_sql_table(cursor, df)
-        conn.commit()
 
-        insert_stmt = (
-            "INSERT INTO Skywalker.dbo.MP_SnowflakeData (" +
-            ", ".join(f"[{c}]" for c in df.columns) +
-            ") VALUES (" + ", ".join('?' for _ in df.columns) + ")"
+class SqliteDialect(SqlServerDialect):
+    """SQLite stand-in for SQL Server, used to exercise the sink locally."""
+
+    def qualify(self, table: str) -> str:
+        return f'"{table}"'
+
+    def quote(self, column: str) -> str:
+        return f'"{column}"'
+
+    def column_type(self, dtype) -> str:
+        if pd.api.types.is_integer_dtype(dtype):
+            return 'INTEGER'
+        if pd.api.types.is_float_dtype(dtype):
+            return 'REAL'
+        return 'TEXT'
+
+    def text_type(self) -> str:
+        return 'TEXT'
+
+    def table_exists(self, cursor, table: str) -> bool:
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (table,))
+        return cursor.fetchone() is not None
+
+    def begin(self, cursor) -> None:
+        # sqlite3 runs DDL outside transactions unless one is opened explicitly.
+        if not cursor.connection.in_transaction:
+            cursor.execute("BEGIN")
+
+    def rename(self, cursor, table: str, new_name: str) -> None:
+        cursor.execute(f"ALTER TABLE {self.qualify(table)} RENAME TO {self.qualify(new_name)}")
+
+    def merge(self, target: str, staging: str, columns: List[str], keys: List[str]) -> List[str]:
+        q = self.quote
+        match = " AND ".join(f"{self.qualify(target)}.{q(k)} = source.{q(k)}" for k in keys)
+        updates = ", ".join(f"{q(c)} = source.{q(c)}" for c in columns if c not in keys)
+        insert_columns = ", ".join(q(c) for c in columns)
+        statements = []
+        if updates:
+            statements.append(
+                f"UPDATE {self.qualify(target)} SET {updates} FROM {self.qualify(staging)} AS source WHERE {match}"
+            )
+        statements.append(
+            f"INSERT INTO {self.qualify(target)} ({insert_columns}) "
+            f"SELECT {insert_columns} FROM {self.qualify(staging)} AS source "
+            f"WHERE NOT EXISTS (SELECT 1 FROM {self.qualify(target)} WHERE {match})"
+        )
+        return statements
+
+
+def to_sql_rows(batch: pd.DataFrame):
+    """Rows of ``batch`` as tuples with missing values as ``None`` for pyodbc."""
+    return batch.astype(object).where(batch.notna(), None).itertuples(index=False, name=None)
+
+
+def watermark_value(value) -> str:
+    """Render a CALL_DT-style value the way it is stored and sent back to Snowflake."""
+    if isinstance(value, pd.Timestamp):
+        value = value.to_pydatetime()
+    if isinstance(value, datetime.datetime):
+        return value.isoformat(sep=' ')
+    if isinstance(value, datetime.date):
+        return value.isoformat()
+    return str(value)
+
+
+class SqlServerSink:
+    """Load batches into Skywalker.dbo.MP_SnowflakeData without readers seeing a gap.
+
+    ``mode='full'`` builds the data in a shadow table and swaps it in with
+    renames in one transaction. ``mode='incremental'`` inserts into a staging
+    table and merges it into the target on ``key_columns``. Without key columns
+    the staged window (rows at or after the oldest staged watermark value)
+    replaces the same window in the target. Either way the new high-water
+    mark of ``watermark_column`` is saved in the same transaction. An
+    incremental load with no target or watermark yet falls back to a full load.
+
+    Each batch is committed into the staging or shadow table as it arrives,
+    so the transaction log and locks never hold the whole extract; only the
+    final swap or merge and the watermark update share one short transaction.
+    """
+
+    def __init__(
+        self,
+        conn,
+        mode: str = LOAD_MODE,
+        dialect: SqlServerDialect | None = None,
+        table: str = TARGET_TABLE,
+        watermark_column: str = WATERMARK_COLUMN,
+        key_columns: List[str] = MERGE_KEY_COLUMNS,
+    ):
+        if mode not in ('full', 'incremental'):
+            raise ValueError(f"Unknown load mode {mode!r}; expected 'full' or 'incremental'")
+        self.conn = conn
+        self.dialect = dialect or SqlServerDialect()
+        self.table = table
+        self.watermark_table = f"{table}_watermark"
+        self.watermark_column = watermark_column
+        self.key_columns = list(key_columns)
+        self.cursor = conn.cursor()
+        if hasattr(self.cursor, 'fast_executemany'):  # pyodbc
+            self.cursor.fast_executemany = True
+        self.insert_stmt = None
+        self.columns: List[str] = []
+        self.rows = 0
+        self.high_water_mark = None
+
+        self.watermark = self._load_watermark() if mode == 'incremental' else None
+        self.mode = 'incremental' if self.watermark is not None else 'full'
+        self.load_table = f"{table}_staging" if self.mode == 'incremental' else f"{table}_shadow"
+
+    def _load_watermark(self) -> str | None:
+        d = self.dialect
+        if not (d.table_exists(self.cursor, self.table) and d.table_exists(self.cursor, self.watermark_table)):
+            return None
+        self.cursor.execute(
+            f"SELECT high_water_mark FROM {d.qualify(self.watermark_table)} WHERE table_name = ?",
+            (self.table,),
+        )
+        row = self.cursor.fetchone()
+        return row[0] if row else None
+
+    def _drop(self, table: str) -> None:
+        if self.dialect.table_exists(self.cursor, table):
+            self.cursor.execute(f"DROP TABLE {self.dialect.qualify(table)}")
+
+    def _create_load_table(self, batch: pd.DataFrame) -> None:
+        d = self.dialect
+        self._drop(self.load_table)
+        columns = [f"{d.quote(col)} {d.column_type(dtype)}" for col, dtype in zip(batch.columns, batch.dtypes)]
+        self.cursor.execute(f"CREATE TABLE {d.qualify(self.load_table)} ({', '.join(columns)})")
+        self.conn.commit()
+        self.columns = list(batch.columns)
+        self.insert_stmt = (
+            f"INSERT INTO {d.qualify(self.load_table)} (" +
+            ", ".join(d.quote(c) for c in self.columns) +
+            ") VALUES (" + ", ".join('?' for _ in self.columns) + ")"
         )
-        cursor.fast_executemany = True
-        cursor.executemany(insert_stmt, df.itertuples(index=False, name=None))
-        conn.commit()
+
+    def write(self, batch) -> None:
+        batch = sql_frame(batch)
+        if self.insert_stmt is None:
+            self._create_load_table(batch)
+        self.cursor.executemany(self.insert_stmt, list(to_sql_rows(batch)))
+        self.conn.commit()
+        self.rows += len(batch)
+        batch_max = batch[self.watermark_column].max()
+        if not pd.isna(batch_max) and (self.high_water_mark is None or batch_max > self.high_water_mark):
+            self.high_water_mark = batch_max
+
+    def _save_watermark(self) -> None:
+        if self.high_water_mark is None:
+            return
+        d = self.dialect
+        if not d.table_exists(self.cursor, self.watermark_table):
+            self.cursor.execute(
+                f"CREATE TABLE {d.qualify(self.watermark_table)} ("
+                f"table_name {d.text_type()} NOT NULL PRIMARY KEY, "
+                f"high_water_mark {d.text_type()} NOT NULL)"
+            )
+        value = watermark_value(self.high_water_mark)
+        self.cursor.execute(
+            f"UPDATE {d.qualify(self.watermark_table)} SET high_water_mark = ? WHERE table_name = ?",
+            (value, self.table),
+        )
+        if self.cursor.rowcount == 0:
+            self.cursor.execute(
+                f"INSERT INTO {d.qualify(self.watermark_table)} (table_name, high_water_mark) VALUES (?, ?)",
+                (self.table, value),
+            )
+
+    def _swap_in(self) -> None:
+        d = self.dialect
+        retired = f"{self.table}_old"
+        self._drop(retired)
+        if d.table_exists(self.cursor, self.table):
+            d.rename(self.cursor, self.table, retired)
+        d.rename(self.cursor, self.load_table, self.table)
+        self._drop(retired)
+
+    def _merge(self) -> None:
+        d = self.dialect
+        if self.key_columns:
+            statements = d.merge(self.table, self.load_table, self.columns, self.key_columns)
+        else:
+            column = d.quote(self.watermark_column)
+            insert_columns = ", ".join(d.quote(c) for c in self.columns)
+            statements = [
+                f"DELETE FROM {d.qualify(self.table)} WHERE {column} >= "
+                f"(SELECT MIN({column}) FROM {d.qualify(self.load_table)})",
+                f"INSERT INTO {d.qualify(self.table)} ({insert_columns}) "
+                f"SELECT {insert_columns} FROM {d.qualify(self.load_table)}",
+            ]
+        for statement in statements:
+            self.cursor.execute(statement)
+        self._drop(self.load_table)
+
+    def close(self) -> None:
+        if self.insert_stmt is None:
+            return  # nothing extracted; leave the target as it is
+        # Publish the data and the new watermark together, or not at all.
+        self.dialect.begin(self.cursor)
+        try:
+            if self.mode == 'full':
+                self._swap_in()
+            else:
+                self._merge()
+            self._save_watermark()
+        except Exception:
+            self.conn.rollback()
+            raise
+        self.conn.commit()
+
+    def abort(self) -> None:
+        # The target and its watermark were never touched; drop the batches
+        # already committed to the staging or shadow table.
+        self.conn.rollback()
+        if self.insert_stmt is not None:
+            self._drop(self.load_table)
+            self.conn.commit()
+
+
+def load(batches: Iterable, sinks: List) -> int:
+    """Write every batch to every sink as it arrives and return the row count.
+
+    Sinks are closed (published) only when every batch arrived. If fetching or
+    writing fails, every sink is aborted so that files are closed and partial
+    data is discarded.
+    """
+    rows = 0
+    try:
+        for batch in prefetch(batches):
+            for sink in sinks:
+                sink.write(batch)
+            rows += len(batch)
+    except BaseException:
+        for sink in sinks:
+            try:
+                sink.abort()
+            except Exception as exc:  # keep the original error
+                print(f"Could not abort {type(sink).__name__}: {exc}")
+        raise
+    for sink in sinks:
+        sink.close()
+    return rows
 
 
 def main() -> None:
-    df = fetch_from_snowflake()
-    csv_file = save_to_csv(df)
-    print(f"Saved Snowflake results to {csv_file}")
+    import pyodbc
 
-    insert_into_sql_server(df)
-    print("Data loaded into SQL Server table Skywalker.dbo.MP_SnowflakeData")
+    with pyodbc.connect(SQL_SERVER_CONNECTION_STRING) as sql_conn:
+        sql_sink = SqlServerSink(sql_conn)
+        # The export follows the load: a delta for incremental runs, a snapshot for full ones.
+        file_sink = export_sink(load_mode=sql_sink.mode)
+        with connect_to_snowflake() as snowflake_conn:
+            rows = load(fetch_from_snowflake(snowflake_conn, since=sql_sink.watermark), [file_sink, sql_sink])
+
+    print(f"Saved {rows} Snowflake rows to {file_sink.path}")
+    print(
+        f"{sql_sink.mode.capitalize()} load of {sql_sink.rows} rows into Skywalker.dbo.{TARGET_TABLE}; "
+        f"high-water mark {sql_sink.high_water_mark or sql_sink.watermark}"
+    )
 
 
 if __name__ == '__main__':
@@ -0,0 +1,348 @@
+import sqlite3
+
+import pytest
+
+pd = pytest.importorskip("pandas")
+
+import snowflake_to_sqlserver as etl  # noqa: E402
+
+
+@pytest.fixture
+def conn(tmp_path):
+    connection = sqlite3.connect(tmp_path / "target.db")
+    yield connection
+    connection.close()
+
+
+def frame(rows):
+    return pd.DataFrame(rows, columns=["CALL_ID", "CALL_DT", "CALLS"])
+
+
+def run_load(conn, batches, mode="incremental", keys=("CALL_ID",)):
+    sink = etl.SqlServerSink(conn, mode=mode, dialect=etl.SqliteDialect(), key_columns=list(keys))
+    etl.load(batches, [sink])
+    return sink
+
+
+def target_rows(conn):
+    return conn.execute(
+        'SELECT "CALL_ID", "CALL_DT", "CALLS" FROM "MP_SnowflakeData" ORDER BY "CALL_ID"'
+    ).fetchall()
+
+
+def test_first_incremental_run_is_a_full_load(conn):
+    sink = run_load(conn, [frame([(1, "2024-01-02", 5)]), frame([(2, "2024-01-03", 7)])])
+
+    assert sink.mode == "full"
+    assert target_rows(conn) == [(1, "2024-01-02", 5), (2, "2024-01-03", 7)]
+    tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    assert tables == {"MP_SnowflakeData", "MP_SnowflakeData_watermark"}
+    assert etl.SqlServerSink(conn, dialect=etl.SqliteDialect()).watermark == "2024-01-03"
+
+
+def test_incremental_run_merges_rows_past_the_watermark(conn):
+    run_load(conn, [frame([(1, "2024-01-02", 5), (2, "2024-01-03", 7)])])
+
+    sink = run_load(conn, [frame([(2, "2024-01-03", 8), (3, "2024-01-04", 1)])])
+
+    assert sink.mode == "incremental"
+    assert sink.watermark == "2024-01-03"
+    assert target_rows(conn) == [(1, "2024-01-02", 5), (2, "2024-01-03", 8), (3, "2024-01-04", 1)]
+    assert etl.SqlServerSink(conn, dialect=etl.SqliteDialect()).watermark == "2024-01-04"
+    assert not etl.SqliteDialect().table_exists(conn.cursor(), "MP_SnowflakeData_staging")
+
+
+def test_incremental_run_without_keys_replaces_the_extracted_window(conn):
+    run_load(conn, [frame([(1, "2024-01-02", 5), (2, "2024-01-03", 7)])], keys=())
+
+    run_load(conn, [frame([(2, "2024-01-03", 9), (4, "2024-01-03", 2)])], keys=())
+
+    assert target_rows(conn) == [(1, "2024-01-02", 5), (2, "2024-01-03", 9), (4, "2024-01-03", 2)]
+
+
+def test_failed_full_reload_leaves_the_published_table_untouched(conn):
+    run_load(conn, [frame([(1, "2024-01-02", 5)])])
+
+    def failing_batches():
+        yield frame([(9, "2024-02-01", 1)])
+        raise RuntimeError("extract failed")
+
+    with pytest.raises(RuntimeError):
+        run_load(conn, failing_batches(), mode="full")
+
+    assert target_rows(conn) == [(1, "2024-01-02", 5)]
+    assert etl.SqlServerSink(conn, dialect=etl.SqliteDialect()).watermark == "2024-01-02"
+
+
+def test_staged_batches_are_committed_as_they_arrive(tmp_path, conn):
+    run_load(conn, [frame([(1, "2024-01-02", 5)])])
+    sink = etl.SqlServerSink(conn, dialect=etl.SqliteDialect(), key_columns=["CALL_ID"])
+    sink.write(frame([(2, "2024-01-03", 7)]))
+    sink.write(frame([(3, "2024-01-04", 1)]))
+
+    assert not conn.in_transaction
+    # Another connection already sees the staged rows, but not yet in the target.
+    reader = sqlite3.connect(tmp_path / "target.db")
+    assert reader.execute('SELECT COUNT(*) FROM "MP_SnowflakeData_staging"').fetchone() == (2,)
+    reader.close()
+    assert target_rows(conn) == [(1, "2024-01-02", 5)]
+
+    sink.close()
+    assert target_rows(conn) == [(1, "2024-01-02", 5), (2, "2024-01-03", 7), (3, "2024-01-04", 1)]
+
+
+def test_full_reload_swaps_in_the_shadow_table(conn):
+    run_load(conn, [frame([(1, "2024-01-02", 5), (2, "2024-01-03", 7)])])
+
+    sink = run_load(conn, [frame([(3, "2024-01-05", 4)])], mode="full")
+
+    assert sink.mode == "full"
+    assert target_rows(conn) == [(3, "2024-01-05", 4)]
+    tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    assert tables == {"MP_SnowflakeData", "MP_SnowflakeData_watermark"}
+
+
+def test_prefetch_yields_batches_in_order_and_reraises_errors():
+    assert list(etl.prefetch(iter(range(10)), depth=2)) == list(range(10))
+
+    def failing():
+        yield 1
+        raise RuntimeError("extract failed")
+
+    with pytest.raises(RuntimeError, match="extract failed"):
+        list(etl.prefetch(failing()))
+
+
+def test_prefetch_stops_the_fetcher_when_the_consumer_stops():
+    import threading
+
+    produced = []
+
+    def batches():
+        for index in range(1000):
+            produced.append(index)
+            yield index
+
+    stream = etl.prefetch(batches(), depth=1)
+    assert next(stream) == 0
+    stream.close()
+    assert not any(thread.name == "snowflake-fetch" for thread in threading.enumerate())
+    assert len(produced) < 10
+
+
+def test_csv_sink_writes_the_header_once(tmp_path):
+    sink = etl.CsvSink(str(tmp_path / "export.csv"))
+    sink.write(frame([(1, "2024-01-02", 5)]))
+    sink.write(frame([(2, "2024-01-03", None)]))
+    sink.close()
+
+    assert (tmp_path / "export.csv").read_text().splitlines() == [
+        "CALL_ID,CALL_DT,CALLS",
+        "1,2024-01-02,5",
+        "2,2024-01-03,",
+    ]
+
+
+def arrow_batch(call_ids, dates, calls, calls_type):
+    import datetime
+
+    pa = pytest.importorskip("pyarrow")
+    return pa.table(
+        {
+            "CALL_ID": pa.array(call_ids, pa.int64()),
+            "CALL_DT": pa.array(
+                [datetime.date.fromisoformat(d) if d else None for d in dates], pa.date32()
+            ),
+            "CALLS": pa.array(calls, calls_type),
+        }
+    )
+
+
+def test_parquet_sink_partitions_by_month_and_reads_back_one_month(tmp_path):
+    pa = pytest.importorskip("pyarrow")
+    path = str(tmp_path / "export")
+    sink = etl.ParquetSink(path)
+    # Connector chunks may use a narrower integer width than later ones.
+    sink.write(arrow_batch([1, 2], ["2024-01-31", None], [5, None], pa.int8()))
+    sink.write(arrow_batch([3, 4], ["2024-02-01", "2024-02-29"], [100_000, 7], pa.int64()))
+    sink.close()
+
+    partitions = sorted(p.name for p in (tmp_path / "export").iterdir())
+    assert partitions == [
+        "CALL_DT_MONTH=2024-01",
+        "CALL_DT_MONTH=2024-02",
+        f"CALL_DT_MONTH={etl.NULL_PARTITION}",
+    ]
+
+    february = etl.read_parquet_export(path, months=["2024-02"], columns=["CALL_ID", "CALLS"])
+    assert february["CALL_ID"].tolist() == [3, 4]
+    assert february["CALLS"].tolist() == [100_000, 7]
+    assert str(february["CALLS"].dtype) == "Int64"
+
+    everything = etl.read_parquet_export(path)
+    assert sorted(everything["CALL_ID"].tolist()) == [1, 2, 3, 4]
+    assert everything["CALLS"].isna().sum() == 1
+    assert str(everything["CALL_DT"].dtype).startswith("datetime64")
+
+
+def test_parquet_sink_rejects_batches_that_do_not_fit_the_schema(tmp_path):
+    pytest.importorskip("pyarrow")
+    sink = etl.ParquetSink(str(tmp_path / "export"))
+    sink.write(frame([(1, "2024-01-02", None)]).assign(CALL_DT=pd.Timestamp("2024-01-02")))
+
+    with pytest.raises(ValueError, match="does not fit"):
+        sink.write(frame([(2, "2024-01-03", "seven")]).assign(CALL_DT=pd.Timestamp("2024-01-03")))
+    sink.close()
+
+
+def test_arrow_schema_types_all_null_fallback_batches():
+    from collections import namedtuple
+
+    pa = pytest.importorskip("pyarrow")
+    Column = namedtuple("Column", "name type_code precision scale")
+    schema = etl.arrow_schema(
+        [
+            Column("CALL_ID", 0, 38, 0),
+            Column("RATE", 0, 10, 2),
+            Column("CALL_DT", 3, None, None),
+            Column("STARTED_AT", 8, None, 9),
+            Column("AGENT", 2, None, None),
+        ]
+    )
+    assert schema.types == [
+        pa.int64(),
+        pa.decimal128(10, 2),
+        pa.date32(),
+        pa.timestamp("ns"),
+        pa.large_string(),
+    ]
+
+    # fetchmany batches are converted with this schema, so an all-NULL column
+    # in the first batch no longer fixes the export to the null type.
+    first = pd.DataFrame({"AGENT": [None, None]})
+    table = pa.Table.from_pandas(first, schema=pa.schema([schema.field("AGENT")]), preserve_index=False)
+    assert table.schema.field("AGENT").type == pa.large_string()
+
+
+def test_integer_columns_become_decimal_only_when_they_overflow_int64():
+    pa = pytest.importorskip("pyarrow")
+    schema = pa.schema([("CALL_ID", pa.int64()), ("CALLS", pa.int64())])
+    fitting = pa.table(
+        {"CALL_ID": pa.array([1, 2], pa.decimal128(38, 0)), "CALLS": pa.array([5, None], pa.int8())}
+    )
+    table, same = etl.conform(fitting, schema)
+    assert same == schema and table.schema == schema
+
+    huge = 2**70
+    overflowing = pd.DataFrame({"CALL_ID": [3, huge], "CALLS": [1, 2]})
+    table, widened = etl.conform(overflowing, schema)
+    assert widened.types == [pa.decimal128(38, 0), pa.int64()]
+    assert table["CALL_ID"].to_pylist() == [3, huge]
+
+    with pytest.raises(pa.ArrowInvalid):
+        etl.conform(pa.table({"CALL_ID": ["x"], "CALLS": [1]}), schema)
+
+
+def test_parquet_run_widens_an_overflowing_integer_column(tmp_path):
+    import decimal
+
+    pa = pytest.importorskip("pyarrow")
+    path = str(tmp_path / "export")
+    etl.load([arrow_batch([1], ["2024-01-02"], [5], pa.int64())], [etl.ParquetSink(path, run_id="1")])
+
+    huge = 2**70
+    overflowed = arrow_batch([3], ["2024-02-02"], [huge], pa.decimal128(38, 0))
+    sink = etl.ParquetSink(path, replace=False, run_id="2")
+    etl.load([arrow_batch([2], ["2024-01-03"], [7], pa.int64()), overflowed], [sink])
+
+    assert sink.schema.field("CALLS").type == pa.decimal128(38, 0)
+    export = etl.read_parquet_export(path).sort_values("CALL_ID")
+    assert export["CALL_ID"].tolist() == [1, 2, 3]
+    assert export["CALLS"].tolist() == [5, 7, decimal.Decimal(huge)]
+    # Runs without overflow keep their integers.
+    assert str(etl.read_parquet_export(path, months=["2024-01"])["CALL_ID"].dtype) == "Int64"
+
+
+def test_sql_sink_creates_numeric_columns_for_decimal_batches(conn):
+    import decimal
+
+    pa = pytest.importorskip("pyarrow")
+    arrow = pa.table(
+        {
+            "CALL_ID": pa.array([1, 2], pa.int64()),
+            "CALL_DT": pa.array(["2024-01-02", "2024-01-03"]),
+            "CALLS": pa.array([5, None], pa.int64()),
+            "RATE": pa.array([decimal.Decimal("1.25"), None], pa.decimal128(10, 2)),
+        }
+    )
+    rows = pd.DataFrame(
+        {
+            "CALL_ID": [3],
+            "CALL_DT": ["2024-01-04"],
+            "CALLS": [2],
+            "RATE": [decimal.Decimal("2.50")],
+        }
+    )
+    run_load(conn, [arrow, rows], mode="full")
+
+    types = {row[1]: row[2] for row in conn.execute('PRAGMA table_info("MP_SnowflakeData")')}
+    assert types == {"CALL_ID": "INTEGER", "CALL_DT": "TEXT", "CALLS": "INTEGER", "RATE": "REAL"}
+    assert conn.execute('SELECT "CALLS", "RATE" FROM "MP_SnowflakeData" ORDER BY "CALL_ID"').fetchall() == [
+        (5, 1.25),
+        (None, None),
+        (2, 2.5),
+    ]
+
+
+def test_incremental_parquet_runs_accumulate_and_read_back_deduplicated(tmp_path):
+    pa = pytest.importorskip("pyarrow")
+    path = str(tmp_path / "export")
+    first = etl.ParquetSink(path, run_id="20240105T000000")
+    etl.load([arrow_batch([1, 2], ["2024-01-02", "2024-01-03"], [5, 7], pa.int64())], [first])
+    # The next run re-extracts the watermark day: CALL_ID 2 again (updated) plus a new row.
+    delta = etl.ParquetSink(path, replace=False, run_id="20240106T000000")
+    etl.load([arrow_batch([2, 3], ["2024-01-03", "2024-01-04"], [8, 1], pa.int64())], [delta])
+
+    month = etl.read_parquet_export(path, months=["2024-01"], key_columns=["CALL_ID"])
+    assert sorted(zip(month["CALL_ID"], month["CALLS"])) == [(1, 5), (2, 8), (3, 1)]
+    assert month["CALL_DT_MONTH"].tolist() == ["2024-01"] * 3
+
+    # Without a key only identical re-extracted rows collapse.
+    unkeyed = etl.read_parquet_export(path, columns=["CALL_ID"], key_columns=[])
+    assert sorted(unkeyed["CALL_ID"]) == [1, 2, 2, 3]
+
+
+def test_full_parquet_run_replaces_the_dataset_only_when_it_succeeds(tmp_path):
+    pa = pytest.importorskip("pyarrow")
+    path = str(tmp_path / "export")
+    etl.load([arrow_batch([1], ["2024-01-02"], [5], pa.int64())], [etl.ParquetSink(path, run_id="1")])
+
+    def failing():
+        yield arrow_batch([9], ["2024-03-01"], [1], pa.int64())
+        raise RuntimeError("extract failed")
+
+    with pytest.raises(RuntimeError):
+        etl.load(failing(), [etl.ParquetSink(path, run_id="2")])
+    assert etl.read_parquet_export(path)["CALL_ID"].tolist() == [1]
+    assert not [p for p in (tmp_path / "export").rglob(".*")]
+
+    etl.load([arrow_batch([3], ["2024-02-02"], [4], pa.int64())], [etl.ParquetSink(path, run_id="3")])
+    assert etl.read_parquet_export(path)["CALL_ID"].tolist() == [3]
+    assert sorted(p.parent.name for p in (tmp_path / "export").rglob("*.parquet")) == ["CALL_DT_MONTH=2024-02"]
+
+
+def test_failed_load_aborts_every_sink(tmp_path, conn):
+    csv_path = tmp_path / "export.csv"
+    csv_path.write_text("previous export\n")
+    sql_sink = etl.SqlServerSink(conn, dialect=etl.SqliteDialect(), key_columns=["CALL_ID"])
+
+    def failing():
+        yield frame([(1, "2024-01-02", 5)])
+        raise RuntimeError("extract failed")
+
+    with pytest.raises(RuntimeError):
+        etl.load(failing(), [etl.CsvSink(str(csv_path)), sql_sink])
+
+    assert csv_path.read_text() == "previous export\n"
+    assert not (tmp_path / "export.csv.partial").exists()
+    assert not etl.SqliteDialect().table_exists(conn.cursor(), "MP_SnowflakeData")